@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+from typing import List, Optional
+import yaml
+from pydantic import BaseModel
+
+LLM_ROUTING_CONFIG = os.getenv('LLM_ROUTING_CONFIG', str(Path(__file__).with_name('llm_routing.yaml')))
+
+class BackendConfig(BaseModel):
+    """An OpenAI-compatible completion server"""
+    name: str
+    base_url: Optional[str] = None  # Defaults to MODEL_CONFIG.base_url
+    weight: float = 1.0
+    health_path: str = "/models"
+
+class RouteConfig(BaseModel):
+    """Sends matching requests to a model on a set of backends"""
+    services: List[str] = []        # Empty matches every service
+    thinking_types: List[str] = []  # Empty matches every thinking type
+    model: str
+    backends: List[str] = []        # Empty allows every backend
+
+    def matches(self, service: str, thinking_type: Optional[str]) -> bool:
+        return (
+            (not self.services or service in self.services)
+            and (not self.thinking_types or thinking_type in self.thinking_types)
+        )
+
+    def model_for(self, slot: Optional[int]) -> str:
+        return self.model.replace("{slot}", "" if slot is None else str(slot))
+
+class RoutingConfig(BaseModel):
+    """LLM backends and the rules routing requests to them"""
+    backends: List[BackendConfig]
+    routes: List[RouteConfig]
+    health_check_interval: float = 30.0
+
+    @classmethod
+    def load(cls, path: str = LLM_ROUTING_CONFIG) -> 'RoutingConfig':
+        with open(path) as f:
+            return cls.model_validate(yaml.safe_load(f))
@@ -57,10 +57,21 @@ class ModelConfig(BaseModel):
             models=models
         )
 
-# Create global model configuration
-MODEL_CONFIG = ModelConfig.from_env()
+_model_config: Optional[ModelConfig] = None
 
-# Add debug print
-print("MODEL_CONFIG initialized with:")
-for service, params in MODEL_CONFIG.models.items():
-    print(f"{service}: slot={params.slot}, temp={params.temperature}")
\ No newline at end of file
+def model_config() -> ModelConfig:
+    """Model configuration, read from the environment on first use"""
+    global _model_config
+    if _model_config is None:
+        from core.utils.logging import setup_logger
+        _model_config = ModelConfig.from_env()
+        setup_logger("config").debug("Model configuration: " + ", ".join(
+            f"{service} slot={params.slot} temp={params.temperature}" for service, params in _model_config.models.items()
+        ))
+    return _model_config
+
+def __getattr__(name: str):
+    # MODEL_CONFIG is built on first access rather than at import
+    if name == "MODEL_CONFIG":
+        return model_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
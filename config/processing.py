@@ -1,5 +1,6 @@
 from typing import List, Dict
 from pydantic import BaseModel
+from config.settings import SYSTEM_CONFIG
 
 class ProcessComponent(BaseModel):
     """Represents a processing component"""
@@ -12,6 +13,14 @@ class ProcessPattern(BaseModel):
     iterations: int = 1
     wait_for_responses: bool = True
 
+class ReflectionBounds(BaseModel):
+    """Depth bounds for a service's refinement steps (reflect, critique, re-analyze)"""
+    adaptive: bool = SYSTEM_CONFIG['adaptive_reflection']
+    min_depth: int = 1
+    max_depth: int = SYSTEM_CONFIG['reflection_depth']
+    # Stop once a step's output is less novel than this compared to its input
+    novelty_threshold: float = SYSTEM_CONFIG['reflection_novelty_threshold']
+
 # Basic processing components
 PROCESS_COMPONENTS = {
     "analyze": ProcessComponent(
@@ -29,6 +38,14 @@ PROCESS_COMPONENTS = {
     "delegate": ProcessComponent(
         description="Send to specialized processing",
         required_capabilities=["routing", "coordination"]
+    ),
+    "integrate": ProcessComponent(
+        description="Merge findings into a single perspective",
+        required_capabilities=["integration"]
+    ),
+    "respond": ProcessComponent(
+        description="Return the result to the requesting service",
+        required_capabilities=["routing"]
     )
 }
 
@@ -43,5 +60,8 @@ PROCESS_PATTERNS = {
     "iterative": ProcessPattern(
         steps=["analyze", "delegate", "synthesize", "reflect"],
         iterations=2
+    ),
+    "leaf": ProcessPattern(
+        steps=["analyze", "reflect", "analyze", "integrate", "respond"]
     )
 }
\ No newline at end of file
@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional, List
 from core.templates import ServiceTemplate, ModelConfig, MessagingConfig, ServiceConfig
 from core.types import ServiceType, ServiceCapability
+from config.processing import ReflectionBounds
+from config.settings import SYSTEM_CONFIG
 
 # Base configurations that can be extended
 base_model_config = ModelConfig(
@@ -22,7 +24,8 @@ def create_messaging_config(service_name: str) -> MessagingConfig:
         exchange="ai_services",
         queue_prefix="ai_service_",
         queue_name=f"{service_name}_queue",
-        parent_queue="atlas_queue"  # Atlas is the parent for all services
+        parent_queue="atlas_queue",  # Atlas is the parent for all services
+        routing_key=f"ai_service_{service_name}"
     )
 
 def create_service_config(
@@ -106,7 +109,9 @@ SERVICE_TEMPLATES = {
         ),
         llm_config=base_model_config,
         messaging_config=create_messaging_config("echo"),
-        capabilities=["pattern_recognition", "sequence_analysis", "trend_detection"]
+        capabilities=["pattern_recognition", "sequence_analysis", "trend_detection"],
+        pattern="leaf",
+        fused_thinking="echo" in SYSTEM_CONFIG['fused_thinking_services']
     ),
     "pixel": ServiceTemplate(
         description="Visual analysis service",
@@ -121,7 +126,9 @@ SERVICE_TEMPLATES = {
         ),
         llm_config=base_model_config,
         messaging_config=create_messaging_config("pixel"),
-        capabilities=["visual_analysis", "image_processing", "spatial_reasoning"]
+        capabilities=["visual_analysis", "image_processing", "spatial_reasoning"],
+        pattern="leaf",
+        fused_thinking="pixel" in SYSTEM_CONFIG['fused_thinking_services']
     ),
     "quantum": ServiceTemplate(
         description="Probabilistic reasoning service",
@@ -136,7 +143,11 @@ SERVICE_TEMPLATES = {
         ),
         llm_config=base_model_config,
         messaging_config=create_messaging_config("quantum"),
-        capabilities=["probabilistic_reasoning", "uncertainty_analysis", "quantum_simulation"]
+        capabilities=["probabilistic_reasoning", "uncertainty_analysis", "quantum_simulation"],
+        pattern="leaf",
+        fused_thinking="quantum" in SYSTEM_CONFIG['fused_thinking_services'],
+        # Probabilistic reasoning keeps refining until the output is nearly unchanged
+        reflection=ReflectionBounds(novelty_threshold=0.2)
     )
 }
 
@@ -1,10 +1,12 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load .env file
+# Load .env file; SYSTEM_CONFIG below is read from the environment, so this
+# cannot wait until first use, but python-dotenv is only imported when there is one
 env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(env_path)
+if env_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(env_path)
 
 # Database settings
 DATABASE_URL = f"{os.getenv('DB_TYPE', 'postgresql')}+asyncpg://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
@@ -35,9 +37,64 @@ SYSTEM_CONFIG = {
     'log_file_path': os.getenv('LOG_FILE_PATH', 'logs/ai_orchestrator.log'),
     'request_timeout': int(os.getenv('REQUEST_TIMEOUT', 240)),
     'reflection_depth': int(os.getenv('REFLECTION_DEPTH', 2)),
+    'adaptive_reflection': os.getenv('ADAPTIVE_REFLECTION', 'true').lower() == 'true',
+    'reflection_novelty_threshold': float(os.getenv('REFLECTION_NOVELTY_THRESHOLD', 0.35)),
+    'fused_thinking_services': [s.strip() for s in os.getenv('FUSED_THINKING_SERVICES', '').split(',') if s.strip()],
     'max_retries': int(os.getenv('MAX_RETRIES', 3)),
+    'retry_delays': [int(d) for d in os.getenv('RETRY_DELAYS', '10,30,120').split(',') if d.strip()],
+    'max_redeliveries': int(os.getenv('MAX_REDELIVERIES', 2)),
+    'consumer_prefetch': int(os.getenv('CONSUMER_PREFETCH', 10)),
+    'service_start_timeout': float(os.getenv('SERVICE_START_TIMEOUT', 60)),
+    'startup_check_timeout': float(os.getenv('STARTUP_CHECK_TIMEOUT', 10)),
+    'supervisor_port': int(os.getenv('SUPERVISOR_PORT', 8900)),
+    'restart_backoff_base': float(os.getenv('RESTART_BACKOFF_BASE', 1)),
+    'restart_backoff_max': float(os.getenv('RESTART_BACKOFF_MAX', 60)),
+    'restart_max_failures': int(os.getenv('RESTART_MAX_FAILURES', 10)),
+    'restart_stable_seconds': float(os.getenv('RESTART_STABLE_SECONDS', 120)),
+    'memory_limit_mb': float(os.getenv('MEMORY_LIMIT_MB', 2048)),
+    'telemetry_interval': float(os.getenv('TELEMETRY_INTERVAL', 5)),
+    'telemetry_samples': int(os.getenv('TELEMETRY_SAMPLES', 720)),
+    'leak_restart': os.getenv('LEAK_RESTART', 'false').lower() == 'true',
+    'leak_growth_mb_per_hour': float(os.getenv('LEAK_GROWTH_MB_PER_HOUR', 100)),
+    'leak_window_minutes': float(os.getenv('LEAK_WINDOW_MINUTES', 30)),
+    'drain_timeout': float(os.getenv('DRAIN_TIMEOUT', 600)),
+    'query_poll_timeout': float(os.getenv('QUERY_POLL_TIMEOUT', 60)),
+    'query_result_ttl': float(os.getenv('QUERY_RESULT_TTL', 3600)),
+    'status_events': os.getenv('STATUS_EVENTS', 'true').lower() == 'true',
+    'status_content_chars': int(os.getenv('STATUS_CONTENT_CHARS', 500)),
+    'event_buffer_size': int(os.getenv('EVENT_BUFFER_SIZE', 100)),
+    'batch_concurrency': int(os.getenv('BATCH_CONCURRENCY', 4)),
+    'batch_rate': float(os.getenv('BATCH_RATE', 0)),
+    'batch_query_timeout': float(os.getenv('BATCH_QUERY_TIMEOUT', 1800)),
+    'batch_dir': os.getenv('BATCH_DIR', 'state/batches'),
+    'result_cache': os.getenv('RESULT_CACHE', 'true').lower() == 'true',
+    'result_cache_ttl': float(os.getenv('RESULT_CACHE_TTL', 86400)),
+    'result_cache_size': int(os.getenv('RESULT_CACHE_SIZE', 1000)),
+    'result_cache_path': os.getenv('RESULT_CACHE_PATH', ''),
+    'semantic_cache': os.getenv('SEMANTIC_CACHE', 'true').lower() == 'true',
+    'semantic_cache_dir': os.getenv('SEMANTIC_CACHE_DIR', 'state/semantic_cache'),
+    'semantic_seed_threshold': float(os.getenv('SEMANTIC_SEED_THRESHOLD', 0.6)),
     'enable_metrics': os.getenv('ENABLE_METRICS', 'true').lower() == 'true',
-    'metrics_port': int(os.getenv('METRICS_PORT', 9090))
+    'metrics_batch_size': int(os.getenv('METRICS_BATCH_SIZE', 50)),
+    'metrics_flush_interval': float(os.getenv('METRICS_FLUSH_INTERVAL', 5)),
+    'metrics_port': int(os.getenv('METRICS_PORT', 9090)),
+    'measure_prompt_prefix': os.getenv('MEASURE_PROMPT_PREFIX', 'false').lower() == 'true',
+    'message_retention_months': int(os.getenv('MESSAGE_RETENTION_MONTHS', 3)),
+    'message_archive_dir': os.getenv('MESSAGE_ARCHIVE_DIR', 'archive/message_logs'),
+    'llm_concurrency': int(os.getenv('LLM_CONCURRENCY', 2)),
+    'llm_batch_mode': os.getenv('LLM_BATCH_MODE', 'off'),
+    'llm_batch_window_ms': float(os.getenv('LLM_BATCH_WINDOW_MS', 20)),
+    'llm_batch_max_size': int(os.getenv('LLM_BATCH_MAX_SIZE', 8)),
+    'llm_hedging': os.getenv('LLM_HEDGING', 'false').lower() == 'true',
+    'llm_hedge_percentile': float(os.getenv('LLM_HEDGE_PERCENTILE', 95)),
+    'llm_hedge_min_samples': int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20)),
+    'request_coalescing': os.getenv('REQUEST_COALESCING', 'true').lower() == 'true',
+    'llm_breaker_failure_rate': float(os.getenv('LLM_BREAKER_FAILURE_RATE', 0.5)),
+    'llm_breaker_min_calls': int(os.getenv('LLM_BREAKER_MIN_CALLS', 5)),
+    'llm_breaker_window': float(os.getenv('LLM_BREAKER_WINDOW', 60)),
+    'llm_breaker_open_seconds': float(os.getenv('LLM_BREAKER_OPEN_SECONDS', 30)),
+    'pipeline_state_dir': os.getenv('PIPELINE_STATE_DIR', 'state/pipelines'),
+    'message_state_dir': os.getenv('MESSAGE_STATE_DIR', 'state/messages')
 }
 
 # Service ports
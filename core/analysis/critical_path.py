@@ -0,0 +1,230 @@
+# core/analysis/critical_path.py
+"""
+Reconstructs the execution DAG of a completed conversation from its
+message_logs and processing_metrics rows and reports where the time went.
+
+Every logged message is a node. A node that has processing metrics spans
+the measured thinking operation; other nodes (delegations, responses) are
+instants. Edges connect:
+- consecutive nodes of the same service
+- a message addressed to a service and that service's next node
+- a parent's latest node and a child's first node when the delegation itself
+  was not logged
+
+Time between nodes on the critical path is split into queueing (waiting on
+another service or the broker) and idle time (the service waiting on itself,
+e.g. hard-coded sleeps). Time inside a node is split into model time and
+in-operation idle time.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from config.hierarchy import SYSTEM_HIERARCHY
+
+# Destinations that do not refer to another service
+LOCAL_DESTINATIONS = {"self", "internal", "system", "user"}
+
+def service_parents() -> Dict[str, str]:
+    """Map every service to its parent in the system hierarchy"""
+    parents = {}
+    for branch in SYSTEM_HIERARCHY.branches.values():
+        parents[branch.coordinator] = SYSTEM_HIERARCHY.coordinator
+        for level in branch.levels:
+            for service in level.services:
+                parents[service] = branch.coordinator
+    return parents
+
+class StageNode:
+    """A logged message with the time span it covers"""
+
+    def __init__(self, message: Dict[str, Any], metrics: List[Dict[str, Any]]):
+        self.id = message["id"]
+        self.service = message["source"]
+        self.destination = message["destination"]
+        self.message_type = message["message_type"]
+        self.logged_at: datetime = message["timestamp"]
+        self.model_time = sum(m.get("processing_time") or 0.0 for m in metrics)
+        self.tokens = sum(m.get("tokens_used") or 0 for m in metrics)
+
+        if metrics:
+            self.start: datetime = min(m["timestamp"] for m in metrics)
+            wall_time = max(
+                (m["timestamp"] - self.start).total_seconds() + (m.get("wall_time") or 0.0)
+                for m in metrics
+            )
+            self.end = max(self.logged_at, self.start + timedelta(seconds=wall_time))
+        else:
+            self.start = self.logged_at
+            self.end = self.logged_at
+
+        self.predecessors: List["StageNode"] = []
+        self.critical_predecessor: Optional["StageNode"] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end - self.start).total_seconds()
+
+    @property
+    def operation_idle(self) -> float:
+        return max(self.duration - self.model_time, 0.0)
+
+    def label(self) -> str:
+        return f"{self.service}.{self.message_type}"
+
+def build_dag(
+    messages: List[Dict[str, Any]],
+    metrics: List[Dict[str, Any]],
+    parents: Optional[Dict[str, str]] = None
+) -> List[StageNode]:
+    """Build stage nodes with predecessor edges, ordered by log time"""
+    parents = parents if parents is not None else service_parents()
+
+    metrics_by_message: Dict[int, List[Dict[str, Any]]] = {}
+    for metric in metrics:
+        if metric.get("message_id") is not None:
+            metrics_by_message.setdefault(metric["message_id"], []).append(metric)
+
+    nodes = sorted(
+        (StageNode(m, metrics_by_message.get(m["id"], [])) for m in messages),
+        key=lambda n: (n.logged_at, n.id)
+    )
+
+    last_by_service: Dict[str, StageNode] = {}
+    # Latest message addressed to a service that it has not picked up yet
+    pending_inbound: Dict[str, StageNode] = {}
+
+    for node in nodes:
+        previous = last_by_service.get(node.service)
+        if previous is not None:
+            node.predecessors.append(previous)
+
+        inbound = pending_inbound.pop(node.service, None)
+        if inbound is not None:
+            node.predecessors.append(inbound)
+        elif previous is None:
+            parent = parents.get(node.service)
+            if parent in last_by_service:
+                node.predecessors.append(last_by_service[parent])
+
+        if node.destination not in LOCAL_DESTINATIONS and node.destination != node.service:
+            pending_inbound[node.destination] = node
+
+        last_by_service[node.service] = node
+
+    for node in nodes:
+        if node.predecessors:
+            node.critical_predecessor = max(node.predecessors, key=lambda p: (p.end, p.id))
+
+    return nodes
+
+def analyze_conversation(
+    messages: List[Dict[str, Any]],
+    metrics: List[Dict[str, Any]],
+    parents: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Report the critical path and time breakdown of a conversation"""
+    nodes = build_dag(messages, metrics, parents)
+    if not nodes:
+        return {"stages": [], "critical_path": [], "total_seconds": 0.0}
+
+    started = min(n.start for n in nodes)
+    finished = max(n.end for n in nodes)
+    total = (finished - started).total_seconds()
+
+    # Walk back from the node that finished last
+    path = []
+    node = max(nodes, key=lambda n: (n.end, n.id))
+    while node is not None:
+        path.append(node)
+        node = node.critical_predecessor
+    path.reverse()
+
+    breakdown = {"model": 0.0, "operation_idle": 0.0, "idle": 0.0, "queueing": 0.0}
+    critical_path = []
+    for node in path:
+        gap = 0.0
+        gap_kind = None
+        predecessor = node.critical_predecessor
+        if predecessor is not None:
+            gap = max((node.start - predecessor.end).total_seconds(), 0.0)
+            gap_kind = "idle" if predecessor.service == node.service else "queueing"
+            breakdown[gap_kind] += gap
+        breakdown["model"] += node.model_time
+        breakdown["operation_idle"] += node.operation_idle
+        critical_path.append({
+            "message_id": node.id,
+            "stage": node.label(),
+            "start_offset": (node.start - started).total_seconds(),
+            "duration": node.duration,
+            "model_seconds": node.model_time,
+            "operation_idle_seconds": node.operation_idle,
+            "wait_before_seconds": gap,
+            "wait_kind": gap_kind
+        })
+
+    busy = sum(n.duration for n in nodes)
+    model = sum(n.model_time for n in nodes)
+
+    return {
+        "total_seconds": total,
+        "critical_path": critical_path,
+        "critical_path_breakdown": breakdown,
+        "parallelism": {
+            "average_busy_operations": busy / total if total else 0.0,
+            "average_model_calls": model / total if total else 0.0,
+            "model_seconds": model
+        },
+        "stages": [
+            {
+                "message_id": n.id,
+                "stage": n.label(),
+                "destination": n.destination,
+                "start_offset": (n.start - started).total_seconds(),
+                "duration": n.duration,
+                "model_seconds": n.model_time,
+                "tokens": n.tokens,
+                "on_critical_path": n in path
+            }
+            for n in nodes
+        ]
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render an analysis report as plain text"""
+    lines = [f"Total elapsed: {report['total_seconds']:.1f}s"]
+    if not report.get("critical_path"):
+        return "\n".join(lines)
+
+    breakdown = report["critical_path_breakdown"]
+    lines.append(
+        "Critical path: "
+        f"model {breakdown['model']:.1f}s, "
+        f"idle inside operations {breakdown['operation_idle']:.1f}s, "
+        f"idle between operations {breakdown['idle']:.1f}s, "
+        f"queueing {breakdown['queueing']:.1f}s"
+    )
+    parallelism = report["parallelism"]
+    lines.append(
+        f"Parallelism: {parallelism['average_busy_operations']:.2f} operations, "
+        f"{parallelism['average_model_calls']:.2f} model calls on average"
+    )
+    lines.append("")
+    lines.append(f"{'offset':>8} {'wait':>8} {'dur':>8} {'model':>8}  stage")
+    for stage in report["critical_path"]:
+        wait = f"{stage['wait_before_seconds']:.1f}"
+        if stage["wait_kind"]:
+            wait += "q" if stage["wait_kind"] == "queueing" else "i"
+        lines.append(
+            f"{stage['start_offset']:>8.1f} {wait:>8} {stage['duration']:>8.1f} "
+            f"{stage['model_seconds']:>8.1f}  {stage['stage']}"
+        )
+    return "\n".join(lines)
+
+async def critical_path_report(conversation_id: int) -> Dict[str, Any]:
+    """Load a conversation from the database and analyze it"""
+    from database.logger import DatabaseLogger
+
+    messages = await DatabaseLogger.get_conversation_timeline(conversation_id)
+    metrics = await DatabaseLogger.get_conversation_processing_metrics(conversation_id)
+    report = analyze_conversation(messages, metrics)
+    report["conversation_id"] = conversation_id
+    return report
@@ -0,0 +1,42 @@
+# core/analysis/prefix_cache.py
+"""
+Shared-prefix report for a conversation.
+
+With MEASURE_PROMPT_PREFIX=true every LLM call records an estimate of how
+many of its prompt tokens match the previous prompt sent to the same model
+slot (see core/prompts/layout.py). Those tokens can be served from the
+backend's KV cache instead of being prefilled again.
+"""
+from typing import Dict, Any, List
+
+def summarize_prefix_reuse(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shared-prefix token ratio overall and per service"""
+    totals = {"prompt_tokens": 0, "shared_prefix_tokens": 0, "operations": 0}
+    services: Dict[str, Dict[str, int]] = {}
+
+    for metric in metrics:
+        shared = (metric.get("model_parameters") or {}).get("shared_prefix_tokens")
+        if shared is None:
+            continue
+        service = services.setdefault(
+            metric["service"], {"prompt_tokens": 0, "shared_prefix_tokens": 0, "operations": 0}
+        )
+        for bucket in (totals, service):
+            bucket["prompt_tokens"] += metric.get("prompt_tokens") or 0
+            bucket["shared_prefix_tokens"] += shared
+            bucket["operations"] += 1
+
+    for bucket in [totals, *services.values()]:
+        prompt_tokens = bucket["prompt_tokens"]
+        bucket["shared_prefix_ratio"] = bucket["shared_prefix_tokens"] / prompt_tokens if prompt_tokens else 0.0
+
+    return {**totals, "services": services}
+
+async def prefix_cache_report(conversation_id: int) -> Dict[str, Any]:
+    """Load a conversation's processing metrics and summarize prefix reuse"""
+    from database.logger import DatabaseLogger
+
+    metrics = await DatabaseLogger.get_conversation_processing_metrics(conversation_id)
+    report = summarize_prefix_reuse(metrics)
+    report["conversation_id"] = conversation_id
+    return report
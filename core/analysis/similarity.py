@@ -0,0 +1,68 @@
+# core/analysis/similarity.py
+"""
+Cheap local text similarity.
+
+Used to decide whether another thinking step is still adding anything
+without asking the LLM: TF-IDF cosine for two texts, and shingled MinHash
+signatures for comparing many texts against each other. Character shingles
+suit short texts such as queries, where word n-grams are too few.
+"""
+import re
+import zlib
+from collections import Counter
+from typing import List, Set
+import numpy as np
+
+WORD = re.compile(r"\w+")
+
+# Mersenne prime for the MinHash permutations; keeps a * hash below 2**63
+MINHASH_PRIME = (1 << 31) - 1
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    return WORD.findall((text or "").lower())
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word n-grams of the text (the whole text when it is shorter than size)"""
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def char_shingles(text: str, size: int = 5) -> Set[str]:
+    """Character n-grams of the lowercased, whitespace-folded text"""
+    folded = " ".join(tokenize(text))
+    if len(folded) <= size:
+        return {folded} if folded else set()
+    return {folded[i:i + size] for i in range(len(folded) - size + 1)}
+
+def minhash_signature(shingle_set: Set[str], num_perm: int = 128, seed: int = 1) -> np.ndarray:
+    """MinHash signature of a shingle set; equal seeds give comparable signatures"""
+    if not shingle_set:
+        return np.full(num_perm, MINHASH_PRIME, dtype=np.uint64)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MINHASH_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MINHASH_PRIME, num_perm, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    return ((np.outer(hashes, a) + b) % MINHASH_PRIME).min(axis=0)
+
+def minhash_similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(signature_a == signature_b))
+
+def tfidf_cosine(text_a: str, text_b: str) -> float:
+    """Cosine similarity of the TF-IDF vectors of two texts"""
+    counts_a, counts_b = Counter(tokenize(text_a)), Counter(tokenize(text_b))
+    if not counts_a or not counts_b:
+        return 1.0 if counts_a == counts_b else 0.0
+    vocabulary = sorted(counts_a.keys() | counts_b.keys())
+    tf = np.array([[counts_a[t] for t in vocabulary], [counts_b[t] for t in vocabulary]], dtype=float)
+    # Smoothed IDF over the two documents: terms only one text uses weigh more
+    df = (tf > 0).sum(axis=0)
+    weights = tf * (np.log(3 / (1 + df)) + 1)
+    norms = np.linalg.norm(weights, axis=1)
+    return float(weights[0] @ weights[1] / (norms[0] * norms[1]))
+
+def novelty(previous: str, current: str) -> float:
+    """Share of the current output that is new relative to the previous one (0 to 1)"""
+    return max(0.0, 1.0 - tfidf_cosine(previous, current))
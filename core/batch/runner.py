@@ -0,0 +1,227 @@
+# core/batch/runner.py
+"""
+Batch runner for JSONL query workloads.
+
+Reads one query per line, submits them at batch priority with at most
+`concurrency` queries in flight and at most `rate` submissions per second,
+and appends each finished query (final synthesis and timing) to an output
+JSONL file. The output file plus a checkpoint of the correlation ids of
+submitted queries let an interrupted run resume: finished queries are
+skipped and queries still running are waited on instead of resubmitted.
+"""
+import asyncio
+import json
+import time
+import httpx
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from config.settings import SYSTEM_CONFIG
+from core.utils.logging import setup_logger
+
+logger = setup_logger("batch")
+
+# Fields tried in order for the query text of an input line
+QUERY_FIELDS = ("content", "query", "prompt", "body")
+ID_FIELDS = ("id", "request_id")
+
+FINISHED_STATUSES = {"complete", "failed"}
+
+# submit(content) -> correlation id; fetch(correlation id, wait seconds) -> query state or None
+Submit = Callable[[str], Awaitable[str]]
+Fetch = Callable[[str, float], Awaitable[Optional[Dict[str, Any]]]]
+
+def atlas_client(base_url: str, client: httpx.AsyncClient, priority: str = "batch"):
+    """submit and fetch functions that talk to a running Atlas over HTTP"""
+    async def submit(content: str) -> str:
+        response = await client.post(f"{base_url}/query", json={"content": content, "priority": priority})
+        response.raise_for_status()
+        return response.json()["correlation_id"]
+
+    async def fetch(correlation_id: str, wait: float) -> Optional[Dict[str, Any]]:
+        response = await client.get(f"{base_url}/query/{correlation_id}", params={"wait": wait}, timeout=wait + 30)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    return submit, fetch
+
+def resolve_batch_path(path: str, batch_dir: str) -> Path:
+    """path inside batch_dir; raises ValueError for absolute paths, '..' or anything escaping it"""
+    relative = Path(path)
+    if not path or relative.is_absolute() or ".." in relative.parts:
+        raise ValueError(f"Batch paths must be relative to the batch directory: {path!r}")
+    base = Path(batch_dir).resolve()
+    resolved = (base / relative).resolve()
+    # Also catches symlinks pointing out of the directory
+    if resolved == base or base not in resolved.parents:
+        raise ValueError(f"Batch path outside the batch directory: {path!r}")
+    return resolved
+
+class BatchItem:
+    """One query of a batch"""
+
+    def __init__(self, item_id: str, content: str):
+        self.id = item_id
+        self.content = content
+
+def read_items(path: str, field: Optional[str] = None) -> Iterator[BatchItem]:
+    """Queries of a JSONL file; plain-text lines are taken as the query itself"""
+    with open(path, encoding="utf-8") as fh:
+        for number, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = line
+            if not isinstance(record, dict):
+                yield BatchItem(str(number), str(record))
+                continue
+            fields = (field,) if field else QUERY_FIELDS
+            content = next((record[name] for name in fields if record.get(name)), None)
+            if content is None:
+                logger.warning(f"Skipping line {number} of {path}: no {' or '.join(fields)} field")
+                continue
+            item_id = next((str(record[name]) for name in ID_FIELDS if record.get(name) is not None), str(number))
+            yield BatchItem(item_id, content)
+
+class Checkpoint:
+    """Correlation ids of submitted queries, so a resumed run waits on them instead of resubmitting"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.submitted: Dict[str, str] = json.loads(path.read_text()) if path.exists() else {}
+
+    def record(self, item_id: str, correlation_id: str) -> None:
+        self.submitted[item_id] = correlation_id
+        self._save()
+
+    def forget(self, item_id: str) -> None:
+        if self.submitted.pop(item_id, None) is not None:
+            self._save()
+
+    def _save(self) -> None:
+        # Write then rename so a crash never leaves a half-written checkpoint
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.submitted))
+        temporary.replace(self.path)
+
+def finished_ids(output_path: Path) -> set:
+    """Items already written to the output with a successful result"""
+    done = set()
+    if output_path.exists():
+        with open(output_path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line of a crashed run
+                if record.get("status") == "complete":
+                    done.add(record["id"])
+    return done
+
+class BatchRunner:
+    """Runs a JSONL file of queries through Atlas"""
+
+    def __init__(self, submit: Submit, fetch: Fetch, concurrency: Optional[int] = None, rate: Optional[float] = None,
+                 query_timeout: Optional[float] = None, poll_interval: float = 60):
+        self.submit = submit
+        self.fetch = fetch
+        self.concurrency = concurrency or SYSTEM_CONFIG['batch_concurrency']
+        self.rate = SYSTEM_CONFIG['batch_rate'] if rate is None else rate
+        self.query_timeout = query_timeout or SYSTEM_CONFIG['batch_query_timeout']
+        self.poll_interval = poll_interval
+        self.progress = {"total": 0, "skipped": 0, "submitted": 0, "complete": 0, "failed": 0, "running": 0}
+        self._next_submit = 0.0
+        self._rate_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def _throttle(self) -> None:
+        """Space submissions at most rate per second apart"""
+        if not self.rate:
+            return
+        async with self._rate_lock:
+            now = time.monotonic()
+            if self._next_submit > now:
+                await asyncio.sleep(self._next_submit - now)
+            self._next_submit = max(now, self._next_submit) + 1 / self.rate
+
+    async def _wait(self, correlation_id: str, deadline: float) -> Optional[Dict[str, Any]]:
+        state = None
+        while time.monotonic() < deadline:
+            state = await self.fetch(correlation_id, min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+            if state is None or state.get("status") in FINISHED_STATUSES:
+                return state
+        return state
+
+    async def _run_item(self, item: BatchItem, checkpoint: Checkpoint, output, slots: asyncio.Semaphore) -> None:
+        async with slots:
+            started = time.monotonic()
+            submitted_at = datetime.utcnow().isoformat()
+            correlation_id = checkpoint.submitted.get(item.id)
+            state = None
+            try:
+                if correlation_id:
+                    # Resumed: the query may still be running or long finished
+                    state = await self.fetch(correlation_id, 0)
+                if state is None or state.get("status") == "failed":
+                    await self._throttle()
+                    correlation_id = await self.submit(item.content)
+                    checkpoint.record(item.id, correlation_id)
+                    self.progress["submitted"] += 1
+                self.progress["running"] += 1
+                try:
+                    state = await self._wait(correlation_id, started + self.query_timeout)
+                finally:
+                    self.progress["running"] -= 1
+                error = None if state else "Query not found"
+                if state and state.get("status") not in FINISHED_STATUSES:
+                    error = f"Timed out after {self.query_timeout:.0f}s"
+            except Exception as e:
+                error = str(e)
+
+            state = state or {}
+            status = "complete" if state.get("status") == "complete" and not error else "failed"
+            record = {
+                "id": item.id,
+                "correlation_id": correlation_id,
+                "conversation_id": state.get("conversation_id"),
+                "status": status,
+                "query": item.content,
+                "final_response": state.get("final_response"),
+                "error": error or state.get("error"),
+                "submitted_at": submitted_at,
+                "elapsed": round(time.monotonic() - started, 3),
+                "query_elapsed": state.get("elapsed")
+            }
+            async with self._write_lock:
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                if status == "complete":
+                    checkpoint.forget(item.id)
+            self.progress[status] += 1
+            logger.info(f"Batch item {item.id}: {status} in {record['elapsed']}s")
+
+    async def run(self, input_path: str, output_path: str, field: Optional[str] = None) -> Dict[str, int]:
+        """Run every query of input_path not yet completed in output_path"""
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = Checkpoint(output.with_name(output.name + ".checkpoint"))
+        done = finished_ids(output)
+        items: List[BatchItem] = []
+        for item in read_items(input_path, field):
+            self.progress["total"] += 1
+            if item.id in done:
+                self.progress["skipped"] += 1
+            else:
+                items.append(item)
+        if self.progress["skipped"]:
+            logger.info(f"Resuming batch: {self.progress['skipped']} of {self.progress['total']} queries already done")
+
+        slots = asyncio.Semaphore(self.concurrency)
+        with open(output, "a", encoding="utf-8") as fh:
+            await asyncio.gather(*(self._run_item(item, checkpoint, fh, slots) for item in items))
+        return dict(self.progress)
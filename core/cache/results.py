@@ -0,0 +1,157 @@
+# core/cache/results.py
+"""
+Whole-query result cache for Atlas.
+
+A repeated question is answered with the final synthesis of the earlier
+run instead of the full tree. Entries are keyed by the normalized query
+(case, whitespace and punctuation folded) plus a fingerprint of everything
+that shapes the answer: model parameters, LLM routing, prompt sources and
+the service hierarchy. Changing any of them misses the cache instead of
+serving answers from the old setup. Entries expire after a TTL, the least
+recently used are evicted beyond a size bound, and the cache can be
+persisted to a JSON file so it survives restarts.
+"""
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config.settings import SYSTEM_CONFIG
+from core.utils.logging import setup_logger
+
+logger = setup_logger("result_cache")
+
+# Cache-Control directives honoured on /query
+NO_CACHE = "no-cache"  # skip the lookup, store the new result
+NO_STORE = "no-store"  # skip the lookup and do not store
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+def normalize_query(query: str) -> str:
+    """Query text with case, punctuation and runs of whitespace folded"""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def cache_directives(value: Optional[str]) -> set:
+    """Directives of a Cache-Control style value"""
+    return {part.strip().lower() for part in (value or "").split(",") if part.strip()}
+
+_fingerprint: Optional[str] = None
+
+def config_fingerprint() -> str:
+    """Hash of the configuration a final synthesis depends on"""
+    global _fingerprint
+    if _fingerprint is None:
+        from config.models import model_config
+        from config.llm_routing import LLM_ROUTING_CONFIG
+        from config.processing import PROCESS_PATTERNS
+        from config.services import SERVICE_TEMPLATES
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps(model_config().model_dump(mode="json"), sort_keys=True).encode())
+        routing = Path(LLM_ROUTING_CONFIG)
+        if routing.exists():
+            digest.update(routing.read_bytes())
+        for source in sorted([*ROOT.glob("core/prompts/*.py"), *ROOT.glob("services/*/prompts.py")]):
+            digest.update(source.relative_to(ROOT).as_posix().encode())
+            digest.update(source.read_bytes())
+        hierarchy = {
+            name: template.model_dump(mode="json", include={"branch_services", "pattern", "reflection", "fused_thinking"})
+            for name, template in SERVICE_TEMPLATES.items()
+        }
+        digest.update(json.dumps(hierarchy, sort_keys=True).encode())
+        digest.update(json.dumps({k: v.model_dump(mode="json") for k, v in PROCESS_PATTERNS.items()}, sort_keys=True).encode())
+        _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+class ResultCache:
+    """LRU cache of final syntheses with a TTL and optional JSON persistence"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None, path: Optional[str] = None,
+                 fingerprint: Optional[str] = None):
+        self.max_entries = max_entries or SYSTEM_CONFIG['result_cache_size']
+        self.ttl = ttl or SYSTEM_CONFIG['result_cache_ttl']
+        self.path = Path(path) if path else None
+        self._fingerprint = fingerprint
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_llm_seconds = 0.0
+        self._load()
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = config_fingerprint()
+        return self._fingerprint
+
+    def key(self, query: str) -> str:
+        return hashlib.sha256(f"{self.fingerprint}\n{normalize_query(query)}".encode()).hexdigest()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """The cached result for query, or None"""
+        key = self.key(query)
+        entry = self.entries.get(key)
+        if entry is not None and time.time() - entry["created_at"] > self.ttl:
+            del self.entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_llm_seconds += entry.get("llm_seconds") or 0
+        return entry
+
+    def put(self, query: str, result: Dict[str, Any]) -> None:
+        key = self.key(query)
+        self.entries[key] = {**result, "query": query, "created_at": time.time()}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._save()
+
+    def clear(self) -> int:
+        count = len(self.entries)
+        self.entries.clear()
+        self._save()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_llm_seconds": round(self.saved_llm_seconds, 3),
+            "fingerprint": self.fingerprint
+        }
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable result cache {self.path}: {e}")
+            return
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry.get("created_at", 0) <= self.ttl:
+                self.entries[key] = entry
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crash never leaves a half-written cache file
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.entries))
+        temporary.replace(self.path)
@@ -0,0 +1,167 @@
+# core/cache/semantic.py
+"""
+Approximate (paraphrase) cache over past queries.
+
+Each answered query is stored as a MinHash signature of its character
+shingles. Signatures are split into LSH bands; queries sharing any band
+hash are candidates, and candidates are ranked by their estimated Jaccard
+similarity. Everything runs locally with NumPy: no embedding service.
+
+Signatures live in a memory-mapped .npy file that grows by doubling, and
+the answers in a JSON Lines file next to it, so the index survives restarts
+without being rebuilt from the database.
+"""
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.analysis.similarity import char_shingles, minhash_signature
+from core.utils.logging import setup_logger
+
+logger = setup_logger("semantic_cache")
+
+SIGNATURES_FILE = "signatures.npy"
+ENTRIES_FILE = "entries.jsonl"
+
+class SemanticIndex:
+    """MinHash/LSH index of answered queries"""
+
+    def __init__(self, directory: Optional[str] = None, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 5, initial_capacity: int = 1024, fingerprint: Optional[str] = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.directory = Path(directory) if directory else None
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self._fingerprint = fingerprint
+        self.entries: List[Dict[str, Any]] = []
+        self.buckets: Dict[Tuple[int, int], List[int]] = {}
+        # Random odd multipliers that fold each band's rows into one hash
+        self._band_mix = np.random.default_rng(7).integers(1, 1 << 62, num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self.signatures = self._open(initial_capacity)
+        self.lookups = 0
+        self.hits = 0
+        self._load()
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            from core.cache.results import config_fingerprint
+            self._fingerprint = config_fingerprint()
+        return self._fingerprint
+
+    def _open(self, capacity: int) -> np.ndarray:
+        if self.directory is None:
+            return np.zeros((capacity, self.num_perm), dtype=np.uint64)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / SIGNATURES_FILE
+        if path.exists():
+            return np.load(path, mmap_mode="r+")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.uint64, shape=(capacity, self.num_perm))
+
+    def _grow(self) -> None:
+        """Double the signature store, copying the rows in use"""
+        capacity = self.signatures.shape[0] * 2
+        if self.directory is None:
+            grown = np.zeros((capacity, self.num_perm), dtype=np.uint64)
+            grown[:len(self.entries)] = self.signatures[:len(self.entries)]
+            self.signatures = grown
+            return
+        path = self.directory / SIGNATURES_FILE
+        temporary = self.directory / f"{SIGNATURES_FILE}.tmp"
+        grown = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.uint64, shape=(capacity, self.num_perm))
+        grown[:len(self.entries)] = self.signatures[:len(self.entries)]
+        grown.flush()
+        del grown
+        self.signatures = None
+        temporary.replace(path)
+        self.signatures = np.load(path, mmap_mode="r+")
+
+    def signature(self, query: str) -> np.ndarray:
+        return minhash_signature(char_shingles(query, self.shingle_size), self.num_perm)
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One hash per band for each signature row (rows x bands)"""
+        banded = signatures.reshape(len(signatures), self.bands, -1)
+        # uint64 arithmetic wraps, which is all a hash needs
+        return (banded * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    def _index(self, rows: np.ndarray, start: int) -> None:
+        for offset, keys in enumerate(self.band_keys(rows)):
+            for band, key in enumerate(keys.tolist()):
+                self.buckets.setdefault((band, key), []).append(start + offset)
+
+    def _load(self) -> None:
+        if self.directory is None:
+            return
+        path = self.directory / ENTRIES_FILE
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    self.entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # torn last line; the signature row behind it is overwritten next
+        self.entries = self.entries[:self.signatures.shape[0]]
+        if self.entries:
+            self._index(np.asarray(self.signatures[:len(self.entries)]), 0)
+        logger.info(f"Loaded semantic cache with {len(self.entries)} queries from {self.directory}")
+
+    def add(self, query: str, result: Dict[str, Any]) -> None:
+        """Index an answered query"""
+        row = len(self.entries)
+        if row >= self.signatures.shape[0]:
+            self._grow()
+        signature = self.signature(query)
+        self.signatures[row] = signature
+        entry = {**result, "query": query, "fingerprint": self.fingerprint, "created_at": time.time()}
+        if self.directory is not None:
+            self.signatures.flush()
+            with open(self.directory / ENTRIES_FILE, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry) + "\n")
+        self.entries.append(entry)
+        self._index(signature[None, :], row)
+
+    def lookup(self, query: str, threshold: float, ttl: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Most similar live entry at or above threshold, with its estimated similarity"""
+        self.lookups += 1
+        signature = self.signature(query)
+        candidates = set()
+        for band, key in enumerate(self.band_keys(signature[None, :])[0].tolist()):
+            candidates.update(self.buckets.get((band, key), ()))
+        if not candidates:
+            return None
+        rows = np.fromiter(candidates, dtype=np.int64)
+        similarity = (np.asarray(self.signatures[rows]) == signature).mean(axis=1)
+        now = time.time()
+        for index in np.argsort(-similarity):
+            if similarity[index] < threshold:
+                break
+            entry = self.entries[rows[index]]
+            if entry.get("fingerprint") != self.fingerprint:
+                continue
+            if ttl is not None and now - entry["created_at"] > ttl:
+                continue
+            self.hits += 1
+            return entry, float(similarity[index])
+        return None
+
+    def clear(self) -> int:
+        """Forget every indexed query; the signature file is reused as is"""
+        count = len(self.entries)
+        self.entries = []
+        self.buckets = {}
+        if self.directory is not None:
+            (self.directory / ENTRIES_FILE).write_text("")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0
+        }
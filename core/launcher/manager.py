@@ -0,0 +1,234 @@
+# core/launcher/manager.py
+"""
+Dependency-aware launcher for the service processes.
+
+Each service hangs off its parent in SYSTEM_HIERARCHY and starts as soon as
+that parent is ready: Atlas first, then Nova and Sage together, then each
+leaf as soon as its own branch is up. Readiness comes from the services'
+"ready" events on the bus (core/messaging/readiness.py), confirmed by one
+/health request, instead of polling every service once a second. The
+infrastructure checks (PostgreSQL, RabbitMQ, the LLM API) run concurrently
+and never block the event loop, so a cold start takes about as long as the
+slowest chain of services rather than the sum of all of them.
+"""
+import asyncio
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+from config.hierarchy import SYSTEM_HIERARCHY, Hierarchy
+from config.services import SERVICE_TEMPLATES
+from config.settings import SYSTEM_CONFIG
+from core.messaging.readiness import ReadinessWatcher
+from core.utils.logging import setup_logger
+
+logger = setup_logger("launcher")
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+def service_dependencies(hierarchy: Hierarchy = SYSTEM_HIERARCHY) -> Dict[str, List[str]]:
+    """Services each service needs running first: its parent in the hierarchy"""
+    dependencies = {hierarchy.coordinator: []}
+    for branch in hierarchy.branches.values():
+        dependencies[branch.coordinator] = [hierarchy.coordinator]
+        for level in branch.levels:
+            for service in level.services:
+                dependencies[service] = [branch.coordinator]
+    return dependencies
+
+def startup_waves(dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """Services grouped by how many dependencies deep they are; raises on a cycle"""
+    waves, placed = [], set()
+    while len(placed) < len(dependencies):
+        wave = sorted(name for name, needs in dependencies.items() if name not in placed and set(needs) <= placed)
+        if not wave:
+            raise ValueError(f"Dependency cycle among {sorted(set(dependencies) - placed)}")
+        waves.append(wave)
+        placed.update(wave)
+    return waves
+
+def port_in_use(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # As uvicorn binds, so a just-restarted service's old connections do not count
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(('localhost', port))
+            return False
+        except OSError:
+            return True
+
+async def check_postgres() -> None:
+    import asyncpg
+    from config.settings import DATABASE_URL
+    connection = await asyncpg.connect(DATABASE_URL.replace("+asyncpg", ""))
+    await connection.close()
+
+async def check_llm_api() -> None:
+    from config.models import model_config
+    async with httpx.AsyncClient(timeout=SYSTEM_CONFIG['startup_check_timeout']) as client:
+        response = await client.get(f"{model_config().base_url}/models")
+        if response.status_code != 200:
+            raise Exception(f"LLM API responded with {response.status_code}")
+
+class ServiceManager:
+    """Starts the services in dependency order, independent ones concurrently"""
+
+    def __init__(self, dependencies: Optional[Dict[str, List[str]]] = None, watcher: Optional[ReadinessWatcher] = None,
+                 start_timeout: Optional[float] = None):
+        dependencies = dependencies or service_dependencies()
+        startup_waves(dependencies)  # fail early on a cycle
+        self.services = {
+            name: {'port': SERVICE_TEMPLATES[name].service_config.port, 'dependencies': needs}
+            for name, needs in dependencies.items()
+        }
+        messaging = SERVICE_TEMPLATES[SYSTEM_HIERARCHY.coordinator].messaging_config
+        self.watcher = watcher or ReadinessWatcher(messaging.broker_url, messaging.exchange)
+        self.start_timeout = start_timeout or SYSTEM_CONFIG['service_start_timeout']
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        self.startup_seconds: Dict[str, float] = {}
+
+    async def check_service_health(self, port: int) -> bool:
+        """Check if a service is healthy"""
+        try:
+            async with httpx.AsyncClient(timeout=2.0) as client:
+                response = await client.get(f"http://localhost:{port}/health")
+                return response.status_code == 200
+        except Exception:
+            return False
+
+    async def check_infrastructure(self) -> bool:
+        """Check PostgreSQL, RabbitMQ and the LLM API concurrently"""
+        checks = {
+            "PostgreSQL": check_postgres(),
+            # Also starts listening for ready events, so none are missed
+            "RabbitMQ": self.watcher.start(),
+            "LLM API": check_llm_api()
+        }
+        results = await asyncio.gather(
+            *(asyncio.wait_for(check, SYSTEM_CONFIG['startup_check_timeout']) for check in checks.values()),
+            return_exceptions=True
+        )
+        healthy = True
+        for name, result in zip(checks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"{name} check failed: {result!r}")
+                healthy = False
+            else:
+                logger.info(f"{name} is running")
+        return healthy
+
+    async def launch(self, name: str) -> asyncio.subprocess.Process:
+        """Start a service process"""
+        service_path = ROOT / 'services' / name / 'service.py'
+        return await asyncio.create_subprocess_exec(
+            sys.executable, str(service_path),
+            cwd=str(ROOT),
+            env={**os.environ, 'PYTHONPATH': str(ROOT)}
+        )
+
+    async def wait_ready(self, name: str, process: asyncio.subprocess.Process) -> bool:
+        """Wait for the service's ready event, failing fast if the process exits"""
+        ready = asyncio.ensure_future(self.watcher.wait(name, self.start_timeout))
+        exited = asyncio.ensure_future(process.wait())
+        try:
+            await asyncio.wait({ready, exited}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            exited.cancel()
+        if not ready.done():
+            ready.cancel()
+            logger.error(f"{name} exited with code {process.returncode} during startup")
+            return False
+        if not ready.result():
+            logger.error(f"{name} did not report ready within {self.start_timeout:.0f}s")
+            return False
+        # The ready event goes out as the HTTP server starts; it is listening moments later
+        port = self.services[name]['port']
+        for _ in range(50):
+            if await self.check_service_health(port):
+                return True
+            await asyncio.sleep(0.1)
+        logger.error(f"{name} reported ready but /health on port {port} does not answer")
+        return False
+
+    async def start_service(self, name: str) -> bool:
+        """Start a single service and wait until it is ready"""
+        port = self.services[name]['port']
+        if port_in_use(port):
+            logger.error(f"Port {port} is already in use!")
+            return False
+        logger.info(f"Starting {name} service on port {port}...")
+        started = time.perf_counter()
+        self.watcher.expect(name)
+        try:
+            process = await self.launch(name)
+        except Exception as e:
+            logger.error(f"Error starting {name}: {e}")
+            return False
+        self.processes[name] = process
+        if not await self.wait_ready(name, process):
+            return False
+        self.startup_seconds[name] = time.perf_counter() - started
+        logger.info(f"{name.upper()} started in {self.startup_seconds[name]:.1f}s")
+        return True
+
+    async def _start_after_dependencies(self, name: str, starts: Dict[str, asyncio.Task]) -> bool:
+        needs = self.services[name]['dependencies']
+        results = await asyncio.gather(*(starts[dependency] for dependency in needs))
+        if not all(results):
+            logger.warning(f"Not starting {name}: {', '.join(d for d, ok in zip(needs, results) if not ok)} failed")
+            return False
+        return await self.start_service(name)
+
+    async def start_all(self, check_infrastructure: bool = True) -> bool:
+        """Start every service as soon as its dependencies are ready"""
+        logger.info("Starting AI Orchestrator services...")
+        started = time.perf_counter()
+        if check_infrastructure:
+            if not await self.check_infrastructure():
+                logger.error("System dependency check failed")
+                await self.watcher.close()
+                return False
+        else:
+            await self.watcher.start()
+        logger.info("Startup plan: " + " -> ".join("+".join(wave) for wave in startup_waves(
+            {name: service['dependencies'] for name, service in self.services.items()}
+        )))
+
+        starts: Dict[str, asyncio.Task] = {}
+        for name in self.services:
+            starts[name] = asyncio.create_task(self._start_after_dependencies(name, starts))
+        results = dict(zip(starts, await asyncio.gather(*starts.values())))
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            logger.error(f"Failed to start {', '.join(failed)}, stopping all services")
+            await self.cleanup()
+            return False
+        logger.info(f"All services started in {time.perf_counter() - started:.1f}s")
+        return True
+
+    async def stop_process(self, name: str, grace: float = 10.0) -> None:
+        """Terminate a service process, killing it if it does not exit within grace seconds"""
+        process = self.processes.get(name)
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), timeout=grace)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} did not stop within {grace:.0f}s, killing it")
+            process.kill()
+            await process.wait()
+        logger.info(f"Stopped {name}")
+
+    async def cleanup(self, grace: float = 10.0):
+        """Stop all processes"""
+        logger.info("Stopping all services...")
+        await asyncio.gather(*(self.stop_process(name, grace) for name in list(self.processes)))
+        self.processes.clear()
+        await self.watcher.close()
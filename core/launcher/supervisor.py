@@ -0,0 +1,292 @@
+# core/launcher/supervisor.py
+"""
+Process supervisor for the services.
+
+Extends the launcher so that services stay up once started:
+
+- A service that exits is restarted after an exponential backoff
+  (RESTART_BACKOFF_BASE doubling up to RESTART_BACKOFF_MAX). The failure
+  count resets once it has stayed up RESTART_STABLE_SECONDS, and the
+  supervisor gives up after RESTART_MAX_FAILURES failures in a row.
+- CPU, RSS, open files and threads of every service are sampled with psutil
+  every TELEMETRY_INTERVAL seconds.
+- A service over its memory ceiling (MEMORY_LIMIT_MB, or
+  {SERVICE}_MEMORY_LIMIT_MB) is restarted at once.
+- With LEAK_RESTART, a service whose RSS keeps growing faster than
+  LEAK_GROWTH_MB_PER_HOUR over LEAK_WINDOW_MINUTES is drained first (no new
+  work, in-flight conversations finish) and then restarted. This catches the
+  conversation dicts that grow for as long as a process lives.
+
+The state of every service is served as JSON on SUPERVISOR_PORT.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import httpx
+import psutil
+from fastapi import FastAPI, HTTPException
+from config.settings import SYSTEM_CONFIG
+from core.launcher.manager import ServiceManager
+from core.utils.logging import setup_logger
+
+logger = setup_logger("supervisor")
+
+def restart_delay(failures: int) -> float:
+    """Backoff before restarting after the given number of consecutive failures"""
+    delay = SYSTEM_CONFIG['restart_backoff_base'] * 2 ** max(failures - 1, 0)
+    return min(delay, SYSTEM_CONFIG['restart_backoff_max'])
+
+def memory_limit_mb(service: str) -> float:
+    return float(os.getenv(f"{service.upper()}_MEMORY_LIMIT_MB", SYSTEM_CONFIG['memory_limit_mb']))
+
+def sample_process(process: psutil.Process) -> Dict[str, Any]:
+    """One telemetry sample of a process"""
+    with process.oneshot():
+        return {
+            "time": time.time(),
+            "cpu_percent": process.cpu_percent(None),
+            "rss_mb": round(process.memory_info().rss / 2 ** 20, 1),
+            "open_files": process.num_fds() if hasattr(process, "num_fds") else process.num_handles(),
+            "threads": process.num_threads()
+        }
+
+def rss_growth_mb_per_hour(samples: List[Dict[str, Any]]) -> Optional[float]:
+    """Least-squares slope of RSS over the samples, in MB per hour"""
+    if len(samples) < 2:
+        return None
+    mean_time = sum(sample["time"] for sample in samples) / len(samples)
+    mean_rss = sum(sample["rss_mb"] for sample in samples) / len(samples)
+    variance = sum((sample["time"] - mean_time) ** 2 for sample in samples)
+    if not variance:
+        return None
+    covariance = sum((sample["time"] - mean_time) * (sample["rss_mb"] - mean_rss) for sample in samples)
+    return covariance / variance * 3600
+
+class ServiceState:
+    """Supervision state of one service"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "stopped"
+        self.pid: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.failures = 0  # consecutive
+        self.last_exit_code: Optional[int] = None
+        self.last_restart_reason: Optional[str] = None
+        self.planned_restart: Optional[str] = None
+        self.process: Optional[psutil.Process] = None
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=SYSTEM_CONFIG['telemetry_samples'])
+
+    def window(self, minutes: float) -> List[Dict[str, Any]]:
+        """Samples of the last minutes, or none until that much has been sampled"""
+        if not self.samples or self.samples[-1]["time"] - self.samples[0]["time"] < minutes * 60:
+            return []
+        since = self.samples[-1]["time"] - minutes * 60
+        return [sample for sample in self.samples if sample["time"] >= since]
+
+    def to_dict(self) -> Dict[str, Any]:
+        growth = rss_growth_mb_per_hour(list(self.samples))
+        return {
+            "status": self.status,
+            "pid": self.pid,
+            "uptime": round(time.time() - self.started_at, 1) if self.started_at and self.status == "running" else None,
+            "restarts": self.restarts,
+            "consecutive_failures": self.failures,
+            "last_exit_code": self.last_exit_code,
+            "last_restart_reason": self.last_restart_reason,
+            "memory_limit_mb": memory_limit_mb(self.name),
+            "rss_growth_mb_per_hour": round(growth, 1) if growth is not None else None,
+            "latest": self.samples[-1] if self.samples else None
+        }
+
+class ServiceSupervisor(ServiceManager):
+    """Starts the services, then keeps them running within their resource limits"""
+
+    def __init__(self, *args, leak_restart: Optional[bool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.states = {name: ServiceState(name) for name in self.services}
+        self.leak_restart = SYSTEM_CONFIG['leak_restart'] if leak_restart is None else leak_restart
+        self.stopping = False
+        self.tasks: List[asyncio.Task] = []
+
+    async def start_service(self, name: str) -> bool:
+        state = self.states[name]
+        state.status = "starting"
+        started = await super().start_service(name)
+        if not started:
+            state.status = "failed"
+            return False
+        state.status = "running"
+        state.started_at = time.time()
+        state.samples.clear()
+        state.pid = self.processes[name].pid
+        try:
+            state.process = psutil.Process(state.pid)
+            state.process.cpu_percent(None)  # the first reading only sets the baseline
+        except psutil.Error:
+            state.process = None
+        return True
+
+    async def supervise(self, name: str) -> None:
+        """Restart the service whenever it exits, until the supervisor stops"""
+        state = self.states[name]
+        while not self.stopping:
+            process = self.processes.get(name)
+            code = await process.wait() if process is not None else None
+            if self.stopping:
+                return
+            state.last_exit_code = code
+            state.process = None
+            if state.planned_restart:
+                reason, state.planned_restart = state.planned_restart, None
+            else:
+                if state.started_at and time.time() - state.started_at >= SYSTEM_CONFIG['restart_stable_seconds']:
+                    state.failures = 0
+                state.failures += 1
+                reason = f"exited with code {code}"
+                max_failures = SYSTEM_CONFIG['restart_max_failures']
+                if max_failures and state.failures > max_failures:
+                    state.status = "failed"
+                    logger.error(f"{name} {reason}; giving up after {max_failures} failed restarts")
+                    return
+                delay = restart_delay(state.failures)
+                state.status = "backoff"
+                logger.warning(f"{name} {reason}; restarting in {delay:.0f}s (failure {state.failures})")
+                await asyncio.sleep(delay)
+            state.restarts += 1
+            state.last_restart_reason = reason
+            state.started_at = None
+            if not await self.start_service(name):
+                # Stop a process that never became ready before trying again
+                await self.stop_process(name)
+
+    def check_resources(self, name: str) -> Optional[Tuple[str, bool]]:
+        """Why the service should be restarted, and whether gracefully, or None"""
+        state = self.states[name]
+        if not state.samples:
+            return None
+        latest = state.samples[-1]
+        limit = memory_limit_mb(name)
+        if latest["rss_mb"] > limit:
+            return f"RSS {latest['rss_mb']:.0f} MB over its {limit:.0f} MB ceiling", False
+        if self.leak_restart:
+            growth = rss_growth_mb_per_hour(state.window(SYSTEM_CONFIG['leak_window_minutes']))
+            if growth is not None and growth > SYSTEM_CONFIG['leak_growth_mb_per_hour']:
+                return f"RSS growing {growth:.0f} MB/h for {SYSTEM_CONFIG['leak_window_minutes']:.0f} min", True
+        return None
+
+    async def monitor(self) -> None:
+        """Sample every running service and restart the ones over their limits"""
+        while not self.stopping:
+            for name, state in self.states.items():
+                if state.status != "running" or state.process is None:
+                    continue
+                try:
+                    state.samples.append(sample_process(state.process))
+                except psutil.Error:
+                    continue  # exited; supervise() handles it
+                verdict = self.check_resources(name)
+                if verdict:
+                    self._spawn(self.restart(name, *verdict))
+            await asyncio.sleep(SYSTEM_CONFIG['telemetry_interval'])
+
+    async def drain(self, name: str, poll_interval: float = 1.0) -> bool:
+        """Ask a service to stop taking work and wait until what it holds is done"""
+        port = self.services[name]['port']
+        deadline = time.monotonic() + SYSTEM_CONFIG['drain_timeout']
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                status = (await client.post(f"http://localhost:{port}/drain")).json()
+                while status["pending"] and time.monotonic() < deadline:
+                    await asyncio.sleep(poll_interval)
+                    status = (await client.get(f"http://localhost:{port}/drain")).json()
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning(f"Could not drain {name}: {e!r}")
+            return False
+        if status["pending"]:
+            logger.warning(f"{name} still held {status['pending']} pending after {SYSTEM_CONFIG['drain_timeout']:.0f}s")
+            return False
+        return True
+
+    async def restart(self, name: str, reason: str, graceful: bool = True) -> bool:
+        """Restart a running service, draining it first if graceful; False if one is already under way"""
+        state = self.states[name]
+        if state.status != "running" or state.planned_restart:
+            return False
+        state.planned_restart = reason
+        logger.warning(f"Restarting {name}: {reason}")
+        if graceful:
+            state.status = "draining"
+            await self.drain(name)
+        state.status = "restarting"
+        # supervise() sees the exit and starts it again without backoff
+        await self.stop_process(name)
+        return True
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self.tasks.append(task)
+        task.add_done_callback(lambda task: task in self.tasks and self.tasks.remove(task))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "leak_restart": self.leak_restart,
+            "services": {name: state.to_dict() for name, state in self.states.items()}
+        }
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="supervisor", description="Service supervisor status", version="1.0.0")
+
+        @app.get("/status")
+        async def status():
+            """State, restarts and latest resource sample of every service"""
+            return self.status()
+
+        @app.get("/status/{service}")
+        async def service_status(service: str, samples: int = 60):
+            """One service's state with its recent samples"""
+            state = self.states.get(service)
+            if state is None:
+                raise HTTPException(status_code=404, detail=f"Unknown service: {service}")
+            return {**state.to_dict(), "samples": list(state.samples)[-samples:]}
+
+        @app.post("/services/{service}/restart")
+        async def restart_service(service: str, graceful: bool = True):
+            """Restart a service, by default after draining it"""
+            if service not in self.states:
+                raise HTTPException(status_code=404, detail=f"Unknown service: {service}")
+            if self.states[service].status != "running":
+                raise HTTPException(status_code=409, detail=f"{service} is {self.states[service].status}")
+            self._spawn(self.restart(service, "requested through the API", graceful))
+            return {"service": service, "restarting": True, "graceful": graceful}
+
+        return app
+
+    async def serve_api(self) -> None:
+        import uvicorn
+        config = uvicorn.Config(self.build_app(), host="localhost", port=SYSTEM_CONFIG['supervisor_port'], log_level="warning")
+        await uvicorn.Server(config).serve()
+
+    async def run(self, check_infrastructure: bool = True, serve_api: bool = True) -> bool:
+        """Start everything, then supervise it in the background"""
+        if not await self.start_all(check_infrastructure):
+            return False
+        self.tasks = [asyncio.create_task(self.supervise(name)) for name in self.services]
+        self.tasks.append(asyncio.create_task(self.monitor()))
+        if serve_api:
+            self.tasks.append(asyncio.create_task(self.serve_api()))
+            logger.info(f"Supervisor status on http://localhost:{SYSTEM_CONFIG['supervisor_port']}/status")
+        return True
+
+    async def cleanup(self, grace: float = 10.0):
+        self.stopping = True
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+        await super().cleanup(grace)
+        for state in self.states.values():
+            state.status = "stopped"
@@ -0,0 +1,60 @@
+# core/llm/admission.py
+"""
+Priority-ordered admission to the LLM.
+
+A semaphore whose waiters are released highest priority first, and in
+arrival order within a priority, so an interactive query's steps overtake
+batch steps already queued for a slot instead of waiting behind them.
+"""
+import asyncio
+import heapq
+import itertools
+from typing import List, Optional, Tuple
+from core.messaging.priority import current_priority
+
+class PrioritySemaphore:
+    """Semaphore that wakes the highest-priority waiter first"""
+
+    def __init__(self, value: int):
+        if value < 1:
+            raise ValueError("PrioritySemaphore needs at least one slot")
+        self._free = value
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def locked(self) -> bool:
+        return self._free == 0
+
+    async def acquire(self, priority: Optional[int] = None) -> None:
+        if self._free > 0 and not self.waiting:
+            self._free -= 1
+            return
+        priority = current_priority() if priority is None else priority
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just as we were cancelled goes to the next waiter
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+    async def __aenter__(self) -> "PrioritySemaphore":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
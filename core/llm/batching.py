@@ -0,0 +1,199 @@
+# core/llm/batching.py
+"""
+Micro-batching in front of the LLM backend.
+
+Chat completion requests that arrive within LLM_BATCH_WINDOW_MS of each other
+are gathered and submitted together, then each caller gets its own result
+back. LLM_BATCH_MODE selects how a batch reaches the backend:
+
+- off: every request is posted on its own as soon as it arrives
+- concurrent: the batch is posted at once over one pooled connection, for
+  servers with parallel slots (llama.cpp -np) that batch decoding themselves
+- multi_prompt: requests with the same sampling parameters are sent as one
+  /completions call with a list of prompts, for servers that accept it
+"""
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
+from config.settings import SYSTEM_CONFIG
+from core.prompts.budget import estimate_messages_tokens, estimate_tokens
+from core.prompts.layout import render_messages
+from core.utils.logging import setup_logger
+
+logger = setup_logger("llm_batching")
+
+BATCH_MODES = ("off", "concurrent", "multi_prompt")
+
+# Requests can only share a multi-prompt call when these fields match
+SHARED_FIELDS = ("model", "temperature", "max_tokens", "top_p")
+
+class LLMRequestError(Exception):
+    """The backend answered a completion request with an error status"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"LLM request failed with status {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+class PendingRequest:
+    """A chat completion request waiting for its batch to be sent"""
+
+    def __init__(self, request_data: Dict[str, Any], future: asyncio.Future):
+        self.request_data = request_data
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+    @property
+    def shape(self) -> Tuple:
+        return tuple(self.request_data.get(field) for field in SHARED_FIELDS)
+
+def as_chat_completion(text: str, request_data: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+    """Wrap a multi-prompt completion choice as a chat completion result"""
+    return {
+        "object": "chat.completion",
+        "model": request_data.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": finish_reason
+        }],
+        # The backend reports usage for the whole batch; split it per request
+        "usage": {
+            "prompt_tokens": estimate_messages_tokens(request_data["messages"]),
+            "completion_tokens": estimate_tokens(text),
+            "estimated": True
+        }
+    }
+
+class LLMBatcher:
+    """Gathers concurrent chat completion requests into batches"""
+
+    def __init__(self, base_url: str, mode: str = "off", window: float = 0.02, max_batch: int = 8, timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown LLM batch mode: {mode}")
+        self.base_url = base_url
+        self.mode = mode
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.transport = transport
+        self._pending: List[PendingRequest] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.batches_sent = 0
+        self.requests_batched = 0
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+        return self._client
+
+    async def submit(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a chat completion request and return the backend's result"""
+        if self.mode == "off":
+            async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+                return await self._post_chat(client, request_data)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(PendingRequest(request_data, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches_sent += 1
+        self.requests_batched += len(batch)
+        logger.debug(f"Sending batch of {len(batch)} LLM requests ({self.mode})")
+        asyncio.get_running_loop().create_task(self._send(batch))
+
+    async def _send(self, batch: List[PendingRequest]) -> None:
+        if self.mode == "multi_prompt":
+            groups: Dict[Tuple, List[PendingRequest]] = {}
+            for pending in batch:
+                groups.setdefault(pending.shape, []).append(pending)
+            await asyncio.gather(*(self._send_multi_prompt(group) for group in groups.values()))
+        else:
+            await asyncio.gather(*(self._send_single(pending) for pending in batch))
+
+    async def _send_single(self, pending: PendingRequest) -> None:
+        try:
+            result = await self._post_chat(self._http_client(), pending.request_data)
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    async def _post_chat(self, client: httpx.AsyncClient, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        response = await client.post(
+            f"{self.base_url}/chat/completions",
+            json=request_data,
+            headers={"Content-Type": "application/json"}
+        )
+        if response.status_code != 200:
+            raise LLMRequestError(response.status_code, response.text)
+        return response.json()
+
+    async def _send_multi_prompt(self, group: List[PendingRequest]) -> None:
+        if len(group) == 1:
+            await self._send_single(group[0])
+            return
+        first = group[0].request_data
+        request_data = {field: first.get(field) for field in SHARED_FIELDS}
+        request_data.update({
+            "prompt": [render_messages(p.request_data["messages"]) + "<|assistant|>\n" for p in group],
+            "cache_prompt": first.get("cache_prompt", False),
+            "stream": False
+        })
+        try:
+            response = await self._http_client().post(
+                f"{self.base_url}/completions",
+                json=request_data,
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code != 200:
+                raise LLMRequestError(response.status_code, response.text)
+            choices = {choice.get("index", i): choice for i, choice in enumerate(response.json().get("choices", []))}
+        except Exception as e:
+            for pending in group:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for index, pending in enumerate(group):
+            if pending.future.done():
+                continue
+            choice = choices.get(index)
+            if choice is None:
+                pending.future.set_exception(LLMRequestError(502, f"No completion returned for prompt {index} of the batch"))
+            else:
+                pending.future.set_result(as_chat_completion(choice.get("text", ""), pending.request_data, choice.get("finish_reason")))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_batchers: Dict[str, LLMBatcher] = {}
+
+def llm_batcher(base_url: str) -> LLMBatcher:
+    """Process-wide batcher for an LLM backend"""
+    if base_url not in _batchers:
+        _batchers[base_url] = LLMBatcher(
+            base_url,
+            mode=SYSTEM_CONFIG['llm_batch_mode'],
+            window=SYSTEM_CONFIG['llm_batch_window_ms'] / 1000,
+            max_batch=SYSTEM_CONFIG['llm_batch_max_size']
+        )
+    return _batchers[base_url]
@@ -0,0 +1,88 @@
+# core/llm/circuit_breaker.py
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Tuple
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one LLM backend.
+
+    Closed: calls pass and outcomes from the last window_seconds are kept.
+    Once at least min_calls are recorded and failure_rate of them failed the
+    circuit opens and calls fail fast. After open_seconds a single probe call
+    is let through (half-open); its success closes the circuit, its failure
+    opens it again.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 5, window_seconds: float = 60.0,
+                 open_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+
+    def _trim(self) -> None:
+        cutoff = self.clock() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _refresh(self) -> None:
+        if self.state == CircuitState.OPEN and self.clock() - self.opened_at >= self.open_seconds:
+            self.state = CircuitState.HALF_OPEN
+            self.probe_in_flight = False
+
+    def available(self) -> bool:
+        """Whether a call could be let through now"""
+        self._refresh()
+        if self.state == CircuitState.OPEN:
+            return False
+        return self.state == CircuitState.CLOSED or not self.probe_in_flight
+
+    def acquire(self) -> None:
+        """Admit a call or raise CircuitOpenError"""
+        if not self.available():
+            raise CircuitOpenError(f"Circuit {self.state.value}")
+        if self.state == CircuitState.HALF_OPEN:
+            self.probe_in_flight = True
+
+    def release(self) -> None:
+        """Release an admitted call that finished without an outcome (e.g. cancelled)"""
+        self.probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            self._outcomes.clear()
+        self.probe_in_flight = False
+        self._outcomes.append((self.clock(), True))
+        self._trim()
+
+    def record_failure(self) -> None:
+        self.probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append((self.clock(), False))
+        self._trim()
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = self.clock()
+        self._outcomes.clear()
@@ -0,0 +1,82 @@
+# core/llm/coalescing.py
+"""
+Single-flight coalescing of identical concurrent requests.
+
+The first caller for a key starts the work in its own task; callers that
+arrive with the same key while it is running wait on that task instead of
+starting their own. Everyone gets the same result or the same error. A
+caller that is cancelled only stops waiting; the shared task is cancelled
+once the last of its callers has gone away, so nobody is left paying for
+work no one will read.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+from core.utils.logging import setup_logger
+
+logger = setup_logger("llm_coalescing")
+
+T = TypeVar("T")
+
+def request_key(*parts: Any) -> str:
+    """Stable key for a request made of JSON-serializable parts"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+class _Flight:
+    """A running call and the number of callers waiting on it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Result of call(), shared with any identical call already running"""
+        self.calls += 1
+        if not self.enabled:
+            return await call()
+        flight = self._flights.get(key)
+        if flight is None:
+            # Runs in a copy of the first caller's context, like any task
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._land(key, flight))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joined in-flight call with {flight.waiters} other waiters")
+        flight.waiters += 1
+        try:
+            # Shielded so one caller's cancellation does not cancel everyone's result
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has gone away
+                self.abandoned += 1
+                flight.task.cancel()
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights)
+        }
@@ -0,0 +1,129 @@
+# core/llm/hedging.py
+"""
+Hedged LLM requests.
+
+When a request has been running longer than LLM_HEDGE_PERCENTILE of the
+recent latencies for the same service and thinking type, a duplicate is
+sent to another backend (or another slot of the same one) and whichever
+completes first is used; the other is cancelled.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+from config.settings import SYSTEM_CONFIG
+from core.utils.logging import setup_logger
+
+logger = setup_logger("llm_hedging")
+
+T = TypeVar("T")
+
+class LatencyTracker:
+    """Recent request latencies per key"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, elapsed: float) -> None:
+        self._samples.setdefault(key, deque(maxlen=self.window)).append(elapsed)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """Latency percentile for key, or None until enough samples are recorded"""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        import numpy as np  # loaded once enough latencies are recorded
+        return float(np.percentile(samples, q))
+
+    def expected_remaining(self, key: str, elapsed: float) -> float:
+        """Expected further wait for a request already running for elapsed seconds"""
+        slower = [sample for sample in self._samples.get(key, ()) if sample > elapsed]
+        return sum(slower) / len(slower) - elapsed if slower else 0.0
+
+class HedgeStats:
+    """Counters for tuning the hedging threshold"""
+
+    def __init__(self):
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        # Estimated from the latency history: how much longer the cancelled
+        # primary requests would probably have run
+        self.latency_saved = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "estimated_latency_saved": round(self.latency_saved, 3)
+        }
+
+async def _first_success(tasks: list) -> Tuple[asyncio.Task, Any]:
+    """Wait for the first task to succeed; raise the last error if all fail"""
+    pending = set(tasks)
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task, task.result()
+            error = task.exception()
+    raise error
+
+class Hedger:
+    """Runs requests with an optional hedge after a latency percentile"""
+
+    def __init__(self, enabled: bool = False, percentile: float = 95.0, min_samples: int = 20):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.tracker = LatencyTracker(min_samples=min_samples)
+        self.stats = HedgeStats()
+
+    async def run(self, key: str, primary: Callable[[], Awaitable[T]], hedge: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Result of the first request to complete, and whether it was the hedge"""
+        self.stats.requests += 1
+        started = time.perf_counter()
+        delay = self.tracker.percentile(key, self.percentile) if self.enabled else None
+
+        primary_task = asyncio.ensure_future(primary())
+        tasks = [primary_task]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary_task}, timeout=delay)
+                if not done:
+                    logger.info(f"Hedging {key} after {delay:.2f}s")
+                    self.stats.hedged += 1
+                    tasks.append(asyncio.ensure_future(hedge()))
+            winner, result = await _first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        elapsed = time.perf_counter() - started
+        hedge_won = winner is not primary_task
+        if hedge_won:
+            self.stats.hedge_wins += 1
+            self.stats.latency_saved += self.tracker.expected_remaining(key, elapsed)
+        # A beaten primary would have taken at least elapsed; recording that
+        # lower bound keeps the slow tail in the history, or the threshold
+        # would drift down with every hedge and the hedge rate keep rising
+        self.tracker.record(key, elapsed)
+        return result, hedge_won
+
+_hedger: Optional[Hedger] = None
+
+def llm_hedger() -> Hedger:
+    """Process-wide hedger for LLM requests"""
+    global _hedger
+    if _hedger is None:
+        _hedger = Hedger(
+            enabled=SYSTEM_CONFIG['llm_hedging'],
+            percentile=SYSTEM_CONFIG['llm_hedge_percentile'],
+            min_samples=SYSTEM_CONFIG['llm_hedge_min_samples']
+        )
+    return _hedger
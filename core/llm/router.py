@@ -0,0 +1,214 @@
+# core/llm/router.py
+"""
+Routes LLM requests to a model and backend.
+
+Rules in config/llm_routing.yaml pick the model by service and thinking
+type (taken from the operation being measured, see core/logging/metrics.py).
+Among the route's healthy backends the one with the lowest
+(in-flight requests + 1) * average latency / weight is used. Backends are
+probed periodically and marked down when requests to them fail. The config
+file is re-read when it changes.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
+from config.llm_routing import BackendConfig, RouteConfig, RoutingConfig, LLM_ROUTING_CONFIG
+from config.settings import SYSTEM_CONFIG
+from core.llm.batching import LLMRequestError
+from core.llm.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.utils.logging import setup_logger
+
+logger = setup_logger("llm_router")
+
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.2
+# How often the config file's modification time is checked
+RELOAD_CHECK_INTERVAL = 1.0
+
+class BackendState:
+    """Live load and health of one backend"""
+
+    def __init__(self, config: BackendConfig, default_base_url: str):
+        self.config = config
+        self.base_url = (config.base_url or default_base_url).rstrip("/")
+        self.in_flight = 0
+        self.latency = 1.0  # Seconds; optimistic until measured
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.requests = 0
+        self.breaker = CircuitBreaker(
+            failure_rate=SYSTEM_CONFIG['llm_breaker_failure_rate'],
+            min_calls=SYSTEM_CONFIG['llm_breaker_min_calls'],
+            window_seconds=SYSTEM_CONFIG['llm_breaker_window'],
+            open_seconds=SYSTEM_CONFIG['llm_breaker_open_seconds']
+        )
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def score(self) -> float:
+        return (self.in_flight + 1) * self.latency / max(self.config.weight, 1e-6)
+
+    def record_latency(self, elapsed: float) -> None:
+        self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "circuit": self.breaker.state.value,
+            "in_flight": self.in_flight,
+            "latency": round(self.latency, 3),
+            "requests": self.requests,
+            "last_error": self.last_error
+        }
+
+class LLMRouter:
+    """Chooses the model and backend for each LLM request"""
+
+    def __init__(self, config_path: str = LLM_ROUTING_CONFIG, default_base_url: Optional[str] = None):
+        self.config_path = config_path
+        self.default_base_url = default_base_url
+        self.backends: Dict[str, BackendState] = {}
+        self.routes: List[RouteConfig] = []
+        self.health_check_interval = 30.0
+        self._mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+        self._health_task: Optional[asyncio.Task] = None
+        self.reload()
+
+    def reload(self) -> None:
+        """Load the routing config, keeping the live state of unchanged backends"""
+        mtime = os.path.getmtime(self.config_path)
+        config = RoutingConfig.load(self.config_path)
+        backends = {}
+        for backend in config.backends:
+            state = self.backends.get(backend.name)
+            if state is None or state.config != backend:
+                state = BackendState(backend, self.default_base_url)
+            backends[backend.name] = state
+        self.backends = backends
+        self.routes = config.routes
+        self.health_check_interval = config.health_check_interval
+        self._mtime = mtime
+        logger.info(f"Loaded LLM routing: {len(self.backends)} backends, {len(self.routes)} routes")
+
+    def reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._last_reload_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_reload_check = now
+        try:
+            if os.path.getmtime(self.config_path) != self._mtime:
+                self.reload()
+        except Exception as e:
+            # A half-written or invalid file must not take the services down
+            logger.error(f"Keeping previous LLM routing, reload failed: {str(e)}")
+
+    def select(self, service: str, thinking_type: Optional[str], slot: Optional[int] = None, exclude: Optional[str] = None) -> Tuple[BackendState, str]:
+        """Backend and model name for a request, avoiding the excluded backend when possible"""
+        self.reload_if_changed()
+        self._ensure_health_checks()
+        route = next((r for r in self.routes if r.matches(service, thinking_type)), None)
+        if route is None:
+            raise ValueError(f"No LLM route for service {service} ({thinking_type})")
+
+        candidates = [self.backends[name] for name in route.backends if name in self.backends] if route.backends else list(self.backends.values())
+        if not candidates:
+            raise ValueError(f"LLM route for {service} names no configured backend")
+        candidates = [backend for backend in candidates if backend.name != exclude] or candidates
+        # Open circuits fail fast; the caller retries later from the broker
+        candidates = [backend for backend in candidates if backend.breaker.available()]
+        if not candidates:
+            raise CircuitOpenError(f"Every LLM backend for {service} ({thinking_type}) has an open circuit")
+        # With every candidate down, trying one beats failing outright
+        healthy = [backend for backend in candidates if backend.healthy] or candidates
+        return min(healthy, key=lambda backend: backend.score()), route.model_for(slot)
+
+    @asynccontextmanager
+    async def dispatch(self, backend: BackendState):
+        """Track a request to a backend for load balancing, health and its circuit breaker"""
+        try:
+            backend.breaker.acquire()
+        except CircuitOpenError:
+            raise CircuitOpenError(f"LLM backend {backend.name} has an open circuit")
+        backend.in_flight += 1
+        backend.requests += 1
+        started = time.perf_counter()
+        try:
+            yield
+        except httpx.TransportError as e:
+            backend.healthy = False
+            backend.last_error = str(e) or type(e).__name__
+            backend.breaker.record_failure()
+            logger.warning(f"LLM backend {backend.name} marked down: {backend.last_error}")
+            raise
+        except LLMRequestError as e:
+            # Client errors mean the backend is up and answering
+            if e.status_code >= 500:
+                backend.breaker.record_failure()
+            else:
+                backend.breaker.record_success()
+            raise
+        except BaseException:
+            backend.breaker.release()
+            raise
+        else:
+            backend.breaker.record_success()
+            backend.record_latency(time.perf_counter() - started)
+        finally:
+            backend.in_flight -= 1
+
+    async def check_health(self) -> None:
+        """Probe every backend once"""
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            for backend in list(self.backends.values()):
+                try:
+                    response = await client.get(f"{backend.base_url}{backend.config.health_path}")
+                    healthy = response.status_code < 500
+                    backend.last_error = None if healthy else f"status {response.status_code}"
+                except httpx.HTTPError as e:
+                    healthy = False
+                    backend.last_error = str(e) or type(e).__name__
+                if healthy != backend.healthy:
+                    logger.info(f"LLM backend {backend.name} is {'up' if healthy else 'down'}")
+                backend.healthy = healthy
+
+    def _ensure_health_checks(self) -> None:
+        if self._health_task is not None and not self._health_task.done():
+            return
+        try:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+        except RuntimeError:
+            pass  # No running loop; checks start with the first request made from one
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                self.reload_if_changed()
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"LLM health check failed: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "config": self.config_path,
+            "backends": [backend.status() for backend in self.backends.values()],
+            "routes": [route.model_dump() for route in self.routes]
+        }
+
+_router: Optional[LLMRouter] = None
+
+def llm_router() -> LLMRouter:
+    """Process-wide router over the configured LLM backends"""
+    global _router
+    if _router is None:
+        from config.models import model_config
+        _router = LLMRouter(default_base_url=model_config().base_url)
+    return _router
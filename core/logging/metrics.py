@@ -0,0 +1,163 @@
+# core/logging/metrics.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from config.settings import SYSTEM_CONFIG
+from core.utils.logging import setup_logger
+
+logger = setup_logger("metrics")
+
+class OperationMetrics:
+    """Token and timing data collected for a single thinking operation"""
+
+    def __init__(self, service: str, operation_type: str):
+        self.service = service
+        self.operation_type = operation_type
+        self.started_at = time.perf_counter()
+        # Same clock as SystemLogger.log_message so rows can be lined up
+        self.timestamp = datetime.now()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.model_time = 0.0
+        self.wall_time = 0.0
+        self.llm_calls = 0
+        self.model_parameters: Dict[str, Any] = {}
+        # Only measured when SYSTEM_CONFIG['measure_prompt_prefix'] is on
+        self.shared_prefix_tokens: Optional[int] = None
+        self.message_id: Optional[int] = None
+        self.correlation_id: Optional[str] = None
+
+    @property
+    def tokens_used(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_row(self) -> Dict[str, Any]:
+        """Convert to a processing_metrics row"""
+        model_parameters = {**self.model_parameters, "llm_calls": self.llm_calls}
+        if self.shared_prefix_tokens is not None:
+            model_parameters["shared_prefix_tokens"] = self.shared_prefix_tokens
+        return {
+            "message_id": self.message_id,
+            "correlation_id": self.correlation_id,
+            "timestamp": self.timestamp,
+            "service": self.service,
+            "operation_type": self.operation_type,
+            "tokens_used": self.tokens_used,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "processing_time": self.model_time,
+            "wall_time": self.wall_time,
+            "model_parameters": model_parameters
+        }
+
+# The operation currently being measured in this task, if any
+_current_operation: ContextVar[Optional[OperationMetrics]] = ContextVar("current_operation", default=None)
+
+def current_operation() -> Optional[OperationMetrics]:
+    """Return the operation being measured in the current task"""
+    return _current_operation.get()
+
+def record_model_call(
+    result: Dict[str, Any],
+    model_parameters: Dict[str, Any],
+    elapsed: float,
+    shared_prefix_tokens: Optional[int] = None
+) -> None:
+    """Attribute a completed LLM call to the current operation"""
+    operation = _current_operation.get()
+    if operation is None:
+        return
+    usage = (result or {}).get("usage") or {}
+    operation.llm_calls += 1
+    operation.model_time += elapsed
+    operation.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+    operation.completion_tokens += int(usage.get("completion_tokens") or 0)
+    operation.model_parameters = dict(model_parameters)
+    if shared_prefix_tokens is not None:
+        operation.shared_prefix_tokens = (operation.shared_prefix_tokens or 0) + shared_prefix_tokens
+
+def attach_message(message_id: int, correlation_id: str) -> None:
+    """Link the current operation to the message_logs row it produced"""
+    operation = _current_operation.get()
+    if operation is None:
+        return
+    operation.message_id = message_id
+    operation.correlation_id = correlation_id
+
+class MetricsRecorder:
+    """Buffers processing metrics and writes them to the database in batches"""
+
+    _buffer: List[Dict[str, Any]] = []
+    _flush_task: Optional[asyncio.Task] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    batch_size = SYSTEM_CONFIG['metrics_batch_size']
+    flush_interval = SYSTEM_CONFIG['metrics_flush_interval']
+
+    @classmethod
+    def record(cls, operation: OperationMetrics) -> None:
+        """Queue an operation for the next batch write"""
+        if not SYSTEM_CONFIG['enable_metrics']:
+            return
+        cls._buffer.append(operation.to_row())
+        cls._ensure_flush_task()
+        if len(cls._buffer) >= cls.batch_size:
+            asyncio.get_running_loop().create_task(cls.flush())
+
+    @classmethod
+    def _ensure_flush_task(cls) -> None:
+        if cls._flush_task is None or cls._flush_task.done():
+            cls._flush_task = asyncio.get_running_loop().create_task(cls._flush_periodically())
+
+    @classmethod
+    async def _flush_periodically(cls) -> None:
+        while cls._buffer:
+            await asyncio.sleep(cls.flush_interval)
+            await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> None:
+        """Write all buffered metrics"""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if not cls._buffer:
+                return
+            rows, cls._buffer = cls._buffer, []
+            # Imported here to avoid a circular import with the system logger
+            from database.logger import DatabaseLogger
+            try:
+                await DatabaseLogger.log_processing_metrics_batch(rows)
+                logger.info(f"Wrote {len(rows)} processing metrics")
+            except Exception as e:
+                logger.error(f"Failed to write processing metrics: {str(e)}")
+
+@asynccontextmanager
+async def track_operation(service: str, operation_type: Any):
+    """Measure every LLM call made inside the block as one thinking operation"""
+    operation_name = getattr(operation_type, "value", operation_type)
+    operation = OperationMetrics(service, str(operation_name))
+    token = _current_operation.set(operation)
+    try:
+        yield operation
+    finally:
+        _current_operation.reset(token)
+        operation.wall_time = time.perf_counter() - operation.started_at
+        if operation.llm_calls:
+            MetricsRecorder.record(operation)
+
+def instrument_operation(
+    service: str,
+    operation_type: Any,
+    method: Callable[..., Awaitable[Any]]
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a thinking method so its LLM calls are recorded as processing metrics"""
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        async with track_operation(service, operation_type):
+            return await method(*args, **kwargs)
+    return wrapper
@@ -10,6 +10,8 @@ from core.messaging.types import MessageType
 from database.connection import get_db_session
 from core.utils.logging import setup_logger
 from database.logger import DatabaseLogger
+from core.logging.metrics import attach_message
+from core.messaging.events import STATUS_OPERATIONS, emit_status
 import json
 
 # Add a logger
@@ -45,8 +47,8 @@ class SystemLogger:
         content: str,
         correlation_id: str,
         context: dict = None
-    ) -> None:
-        """Log a message to the database"""
+    ) -> Optional[int]:
+        """Log a message to the database and return its ID"""
         try:
             # Log attempt
             logger.info(f"Attempting to log message: conv_id={conversation_id}, type={message_type}, source={source}, dest={destination}")
@@ -63,12 +65,17 @@ class SystemLogger:
                     destination=destination,
                     content=content,
                     correlation_id=correlation_id,
-                    context=json.dumps(context) if context else None
+                    context=context if context else None
                 )
                 session.add(message_log)
                 try:
                     await session.commit()
                     logger.info(f"Successfully logged message to database: conv_id={conversation_id}, corr_id={correlation_id}")
+                    # Link the row to the thinking operation being measured, if any
+                    attach_message(message_log.id, correlation_id)
+                    if message_type_str in STATUS_OPERATIONS:
+                        emit_status(message_type_str, source, correlation_id, conversation_id, destination, content)
+                    return message_log.id
                 except IntegrityError as ie:
                     logger.error(f"Database integrity error: {str(ie)}")
                     await session.rollback()
@@ -95,19 +102,51 @@ class SystemLogger:
     @staticmethod
     async def get_conversation_messages(
         conversation_id: int,
-        include_internal: bool = False
+        include_internal: bool = False,
+        processing_stage: Optional[str] = None,
+        depth_level: Optional[int] = None,
+        branch_path: Optional[List[str]] = None
     ) -> List[Message]:
-        """Get all messages for a conversation"""
-        messages = await DatabaseLogger.get_conversation_messages(conversation_id)
-        
-        if not include_internal:
-            # Filter out internal messages based on processing stage
-            messages = [
-                msg for msg in messages 
-                if not msg.context or 'processing_stage' not in msg.context
-            ]
-            
-        return messages
+        """Get messages for a conversation, excluding internal thinking unless requested"""
+        return await DatabaseLogger.get_conversation_messages(
+            conversation_id,
+            include_internal=include_internal,
+            processing_stage=processing_stage,
+            depth_level=depth_level,
+            branch_path=branch_path
+        )
+
+    @staticmethod
+    async def get_query_result(correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a query's state from message_logs, or None if nothing was logged for it"""
+        messages = await DatabaseLogger.get_query_messages(correlation_id)
+        if not messages:
+            return None
+        conversation = await DatabaseLogger.get_conversation(messages[0].conversation_id)
+        result = {
+            "correlation_id": correlation_id,
+            "conversation_id": messages[0].conversation_id,
+            # message_logs marks running conversations "active"; Atlas calls them "processing"
+            "status": ("processing" if conversation.status == "active" else conversation.status) if conversation else None,
+            "query": conversation.initial_query if conversation else None,
+            "initial_analysis": None,
+            "branch_responses": {},
+            "final_response": None
+        }
+        for message in messages:
+            kind = (message.context or {}).get("type")
+            if message.source == "atlas" and kind == "initial_analysis":
+                result["initial_analysis"] = message.content
+            elif message.source == "atlas" and kind == "final_synthesis":
+                result["final_response"] = message.content
+            elif message.destination == "atlas" and message.source != "atlas":
+                result["branch_responses"][message.source] = message.content
+        return result
+
+    @staticmethod
+    async def get_query_model_seconds(correlation_id: str) -> float:
+        """Model time recorded for a query across all services"""
+        return await DatabaseLogger.get_query_model_seconds(correlation_id)
 
     @staticmethod
     async def log_processing_metrics(
@@ -132,6 +171,14 @@ class SystemLogger:
             session.add(metrics)
             await session.commit()
 
+    @staticmethod
+    async def get_processing_metrics_summary(
+        group_by: str = "service",
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Aggregate processing metrics per service, thinking type or hour"""
+        return await DatabaseLogger.get_processing_metrics_summary(group_by, since)
+
     @staticmethod
     async def get_conversation_messages_old(conversation_id: int) -> List[Dict[str, Any]]:
         """Get all messages for a conversation"""
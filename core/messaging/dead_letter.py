@@ -0,0 +1,195 @@
+# core/messaging/dead_letter.py
+"""
+Dead-lettering and parking for service queues.
+
+Every service queue dead-letters into its own exchange ("{queue}.dlx"), which
+routes to a parking queue ("{queue}.parked"). A message whose handler fails is
+republished to the queue a bounded number of times, counted in a header since
+classic queues do not count redeliveries. After that, or when it cannot be
+decoded at all, it is parked with the failure reason. Parked messages stay
+there until they are inspected, replayed or purged (scripts/dead_letters.py,
+or /dead-letters on Atlas), so failed work is neither lost nor retried forever.
+
+The broker also flags messages as redelivered when they were only
+prefetched by a consumer that went away. Only a message with a started
+marker (StartedMarkers) was actually being handled when its consumer died,
+so only those are charged an attempt.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import aio_pika
+from config.settings import SYSTEM_CONFIG
+from core.messaging.retry import RETRY_COUNT_HEADER
+from core.utils.logging import setup_logger
+
+logger = setup_logger("dead_letter")
+
+REDELIVERY_COUNT_HEADER = "x-redelivery-count"
+PARKED_REASON_HEADER = "x-parked-reason"
+PARKED_AT_HEADER = "x-parked-at"
+
+# Headers describing earlier attempts; a replayed message starts afresh
+ATTEMPT_HEADERS = (REDELIVERY_COUNT_HEADER, RETRY_COUNT_HEADER, PARKED_REASON_HEADER, PARKED_AT_HEADER, "x-death")
+
+def dead_letter_exchange_name(queue_name: str) -> str:
+    return f"{queue_name}.dlx"
+
+def parking_queue_name(queue_name: str) -> str:
+    return f"{queue_name}.parked"
+
+def queue_arguments(queue_name: str) -> Dict[str, Any]:
+    """Arguments that make a service queue dead-letter into its parking queue"""
+    return {
+        "x-dead-letter-exchange": dead_letter_exchange_name(queue_name),
+        "x-dead-letter-routing-key": queue_name
+    }
+
+def redelivery_count(headers: Optional[Dict[str, Any]]) -> int:
+    return int((headers or {}).get(REDELIVERY_COUNT_HEADER, 0))
+
+def should_park(headers: Optional[Dict[str, Any]]) -> bool:
+    """Whether a failed message has used up its redeliveries"""
+    return redelivery_count(headers) >= SYSTEM_CONFIG['max_redeliveries']
+
+def replay_headers(headers: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {key: value for key, value in (headers or {}).items() if key not in ATTEMPT_HEADERS}
+
+def _copy(message: aio_pika.abc.AbstractIncomingMessage, headers: Dict[str, Any]) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=message.body,
+        headers=headers,
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        content_type=message.content_type,
+        priority=message.priority
+    )
+
+async def declare_parking(channel: aio_pika.abc.AbstractChannel, queue_name: str) -> aio_pika.abc.AbstractQueue:
+    """Declare a queue's dead-letter exchange and the parking queue behind it"""
+    exchange = await channel.declare_exchange(
+        dead_letter_exchange_name(queue_name),
+        aio_pika.ExchangeType.DIRECT,
+        durable=True
+    )
+    parking = await channel.declare_queue(parking_queue_name(queue_name), durable=True)
+    await parking.bind(exchange, routing_key=queue_name)
+    return parking
+
+async def park(channel: aio_pika.abc.AbstractChannel, message: aio_pika.abc.AbstractIncomingMessage,
+               queue_name: str, reason: str) -> None:
+    """Move a message to the parking queue, recording why"""
+    headers = {
+        **(message.headers or {}),
+        PARKED_REASON_HEADER: reason[:1000],
+        PARKED_AT_HEADER: datetime.utcnow().isoformat()
+    }
+    await channel.default_exchange.publish(_copy(message, headers), routing_key=parking_queue_name(queue_name))
+    logger.error(f"Parked message from {queue_name} after {redelivery_count(message.headers)} redeliveries: {reason}")
+
+async def redeliver_or_park(channel: aio_pika.abc.AbstractChannel, message: aio_pika.abc.AbstractIncomingMessage,
+                            queue_name: str, reason: str) -> bool:
+    """Put a failed message back on its queue, or park it once redeliveries are used up; True if parked"""
+    if should_park(message.headers):
+        await park(channel, message, queue_name, reason)
+        return True
+    count = redelivery_count(message.headers) + 1
+    headers = {**(message.headers or {}), REDELIVERY_COUNT_HEADER: count}
+    await channel.default_exchange.publish(_copy(message, headers), routing_key=queue_name)
+    logger.warning(f"Redelivering message on {queue_name} ({count}/{SYSTEM_CONFIG['max_redeliveries']}): {reason}")
+    return False
+
+class StartedMarkers:
+    """Messages of a queue whose handling has started, on disk so they outlive a crash"""
+
+    def __init__(self, queue_name: str, directory: Optional[str] = None):
+        self.path = Path(directory or SYSTEM_CONFIG['message_state_dir']) / queue_name
+
+    def _file(self, message: aio_pika.abc.AbstractIncomingMessage) -> Path:
+        key = message.message_id or hashlib.sha256(message.body).hexdigest()
+        return self.path / key
+
+    def start(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._file(message).touch()
+
+    def finish(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        self._file(message).unlink(missing_ok=True)
+
+    def started(self, message: aio_pika.abc.AbstractIncomingMessage) -> bool:
+        """Whether a consumer began handling the message and never finished"""
+        return self._file(message).exists()
+
+def describe(message: aio_pika.abc.AbstractIncomingMessage) -> Dict[str, Any]:
+    """Summary of a parked message for listings"""
+    headers = message.headers or {}
+    try:
+        body = json.loads(message.body.decode())
+    except ValueError:
+        body = None
+    death = (headers.get("x-death") or [{}])[0]
+    return {
+        "type": body.get("type") if isinstance(body, dict) else None,
+        "correlation_id": body.get("correlation_id") if isinstance(body, dict) else None,
+        "source": body.get("source") if isinstance(body, dict) else None,
+        "reason": headers.get(PARKED_REASON_HEADER) or death.get("reason"),
+        "parked_at": headers.get(PARKED_AT_HEADER),
+        "redeliveries": redelivery_count(headers),
+        "retries": int(headers.get(RETRY_COUNT_HEADER, 0)),
+        "size": len(message.body),
+        "body": body if body is not None else message.body[:200].decode(errors="replace")
+    }
+
+class ParkingLot:
+    """Inspect, replay and purge one service queue's parked messages"""
+
+    def __init__(self, channel: aio_pika.abc.AbstractChannel, queue_name: str):
+        self.channel = channel
+        self.queue_name = queue_name
+
+    async def _parking(self) -> aio_pika.abc.AbstractQueue:
+        return await declare_parking(self.channel, self.queue_name)
+
+    async def count(self) -> int:
+        parking = await self._parking()
+        return parking.declaration_result.message_count or 0
+
+    async def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Peek at up to limit parked messages without removing them"""
+        parking = await self._parking()
+        held = []
+        try:
+            while len(held) < limit:
+                message = await parking.get(no_ack=False, fail=False)
+                if message is None:
+                    break
+                held.append(message)
+            return [describe(message) for message in held]
+        finally:
+            # Unacked messages are not handed out again until released, so each get saw a new one
+            for message in held:
+                await message.nack(requeue=True)
+
+    async def replay(self, limit: Optional[int] = None) -> int:
+        """Republish parked messages to their service queue with fresh attempt counts"""
+        parking = await self._parking()
+        replayed = 0
+        while limit is None or replayed < limit:
+            message = await parking.get(no_ack=False, fail=False)
+            if message is None:
+                break
+            await self.channel.default_exchange.publish(
+                _copy(message, replay_headers(message.headers)),
+                routing_key=self.queue_name
+            )
+            await message.ack()
+            replayed += 1
+        if replayed:
+            logger.info(f"Replayed {replayed} parked messages to {self.queue_name}")
+        return replayed
+
+    async def purge(self) -> int:
+        parking = await self._parking()
+        result = await parking.purge()
+        return result.message_count
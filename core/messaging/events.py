@@ -0,0 +1,150 @@
+# core/messaging/events.py
+"""
+Live progress events.
+
+Services publish a STATUS message on the bus for every thinking step they
+log (analyze, reflect, critique, integrate, synthesize), under the routing
+key "status.{service}", which no service queue is bound to. Atlas binds one
+exclusive queue to every routing key ("#") and fans the STATUS messages,
+delegations, responses and errors out to connected clients through an
+EventFeed. Each client has a bounded buffer: a client that cannot keep up
+loses its oldest events, so a slow reader never holds up the others.
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from config.settings import SYSTEM_CONFIG
+from core.messaging.types import MessageType
+from core.utils.logging import setup_logger
+
+logger = setup_logger("events")
+
+STATUS_ROUTING_PREFIX = "status"
+
+# Thinking steps that only exist in message_logs, not on the bus
+STATUS_OPERATIONS = {"analyze", "reflect", "critique", "integrate", "synthesize"}
+
+# Bus messages worth showing to clients
+FEED_TYPES = {
+    MessageType.STATUS.value,
+    MessageType.DELEGATE.value,
+    MessageType.RESPOND.value,
+    MessageType.ERROR.value
+}
+
+_publisher = None
+_pending: Set[asyncio.Task] = set()
+
+def attach_status_publisher(messaging) -> None:
+    """Publish this process's STATUS events through a ServiceMessaging instance"""
+    global _publisher
+    _publisher = messaging
+
+def emit_status(event: str, source: str, correlation_id: Optional[str], conversation_id: Optional[int] = None,
+                destination: Optional[str] = None, content: Optional[str] = None) -> None:
+    """Publish a STATUS event in the background; never blocks or fails the caller"""
+    if _publisher is None or not SYSTEM_CONFIG['status_events']:
+        return
+    message = {
+        "type": MessageType.STATUS.value,
+        "content": (content or "")[:SYSTEM_CONFIG['status_content_chars']],
+        "correlation_id": correlation_id,
+        "conversation_id": conversation_id,
+        "source": source,
+        "destination": destination,
+        "context": {"event": event}
+    }
+    try:
+        task = asyncio.get_running_loop().create_task(_publisher.publish_status(f"{STATUS_ROUTING_PREFIX}.{source}", message))
+    except RuntimeError:
+        return
+    _pending.add(task)
+    task.add_done_callback(_status_published)
+
+def _status_published(task: asyncio.Task) -> None:
+    _pending.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.debug(f"Could not publish status event: {task.exception()}")
+
+def feed_event(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing view of a bus message"""
+    context = message.get("context") or {}
+    content = message.get("content") or ""
+    if message.get("type") == MessageType.DELEGATE.value:
+        # Delegations carry the whole query and parent analysis; the guidance is what is new
+        try:
+            content = json.loads(content).get("branch_guidance") or ""
+        except (ValueError, AttributeError):
+            pass
+    return {
+        "event": context.get("event") or message.get("type"),
+        "type": message.get("type"),
+        "source": message.get("source"),
+        "destination": message.get("destination"),
+        "correlation_id": message.get("correlation_id"),
+        "conversation_id": message.get("conversation_id"),
+        "content": content[:SYSTEM_CONFIG['status_content_chars']],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+class FeedSubscriber:
+    """One connected client: a filter and a bounded buffer of events"""
+
+    def __init__(self, buffer_size: int, correlation_id: Optional[str] = None, conversation_id: Optional[int] = None):
+        self.correlation_id = correlation_id
+        self.conversation_id = conversation_id
+        self.buffer: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.correlation_id is not None and event.get("correlation_id") != self.correlation_id:
+            return False
+        # Services pass conversation ids around as ints or strings
+        if self.conversation_id is not None and str(event.get("conversation_id")) != str(self.conversation_id):
+            return False
+        return True
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Buffer an event, dropping the oldest one when the client has fallen behind"""
+        if self.buffer.full():
+            self.buffer.get_nowait()
+            self.dropped += 1
+        self.buffer.put_nowait(event)
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next event, or None if none arrived within timeout"""
+        try:
+            event = await asyncio.wait_for(self.buffer.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.dropped:
+            event = {**event, "dropped": self.dropped}
+            self.dropped = 0
+        return event
+
+class EventFeed:
+    """Fans bus events out to connected clients"""
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.buffer_size = buffer_size or SYSTEM_CONFIG['event_buffer_size']
+        self.subscribers: Set[FeedSubscriber] = set()
+        self.events_seen = 0
+
+    def subscribe(self, correlation_id: Optional[str] = None, conversation_id: Optional[int] = None) -> FeedSubscriber:
+        subscriber = FeedSubscriber(self.buffer_size, correlation_id, conversation_id)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: FeedSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        """Deliver a bus message to every client whose filter it matches"""
+        if message.get("type") not in FEED_TYPES or not self.subscribers:
+            return
+        self.events_seen += 1
+        event = feed_event(message)
+        for subscriber in list(self.subscribers):
+            if subscriber.matches(event):
+                subscriber.offer(event)
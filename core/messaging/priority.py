@@ -0,0 +1,57 @@
+# core/messaging/priority.py
+"""
+Priority lanes for queries.
+
+A query's priority is set once at Atlas (the "priority" field of /query) and
+travels with every message of its tree: in the message context and as the
+AMQP priority, so service queues hand interactive work out before a backlog
+of batch work. While a message is handled, its priority is the current
+priority of the task, which the LLM admission path orders waiters by and
+which messages published from the handler inherit.
+"""
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Union
+
+# Highest AMQP priority; service queues are declared with x-max-priority set to it
+MAX_PRIORITY = 9
+
+PRIORITY_LEVELS = {
+    "batch": 1,
+    "normal": 5,
+    "interactive": 9
+}
+
+DEFAULT_PRIORITY = PRIORITY_LEVELS["normal"]
+
+def parse_priority(value: Union[str, int, None], default: int = DEFAULT_PRIORITY) -> int:
+    """Priority from a level name or a number between 0 and MAX_PRIORITY"""
+    if value is None:
+        return default
+    if isinstance(value, str) and not value.strip().isdigit():
+        if value.strip().lower() not in PRIORITY_LEVELS:
+            raise ValueError(f"Unknown priority {value!r}, expected one of {', '.join(PRIORITY_LEVELS)} or 0-{MAX_PRIORITY}")
+        return PRIORITY_LEVELS[value.strip().lower()]
+    priority = int(value)
+    if not 0 <= priority <= MAX_PRIORITY:
+        raise ValueError(f"Priority must be between 0 and {MAX_PRIORITY}, got {priority}")
+    return priority
+
+# Priority of the query being worked on in the current task
+_priority: ContextVar[int] = ContextVar("priority", default=DEFAULT_PRIORITY)
+
+def current_priority() -> int:
+    return _priority.get()
+
+def set_priority(priority: int):
+    return _priority.set(priority)
+
+def reset_priority(token) -> None:
+    _priority.reset(token)
+
+def message_priority(message: Dict[str, Any], amqp_priority: Optional[int] = None) -> int:
+    """Priority carried by a message, falling back to the AMQP property and then the current task"""
+    context = message.get("context") or {}
+    try:
+        return parse_priority(context.get("priority"), default=amqp_priority if amqp_priority is not None else current_priority())
+    except ValueError:
+        return current_priority()
@@ -3,6 +3,7 @@ import asyncio
 import aio_pika
 from typing import Dict, Any, Callable, Optional
 from core.utils.logging import setup_logger
+from core.messaging.dead_letter import StartedMarkers, declare_parking, park, queue_arguments, redeliver_or_park
 
 logger = setup_logger("rabbitmq")
 
@@ -31,11 +32,13 @@ class RabbitMQHandler:
             self.channel = await self.connection.channel()
             await self.channel.set_qos(prefetch_count=1)
             
-            # Declare queue with basic configuration
+            # Declare queue, dead-lettering into its parking queue
+            await declare_parking(self.channel, self.queue_name)
             self.queue = await self.channel.declare_queue(
                 self.queue_name,
                 durable=True,
-                auto_delete=False
+                auto_delete=False,
+                arguments=queue_arguments(self.queue_name)
             )
             
             logger.info(f"Connected to RabbitMQ and declared queue: {self.queue_name}")
@@ -47,6 +50,8 @@ class RabbitMQHandler:
     async def start_consuming(self, callback: Callable) -> None:
         """Start consuming messages from the queue"""
         try:
+            markers = StartedMarkers(self.queue_name)
+
             async def _process_message(message: aio_pika.IncomingMessage) -> None:
                 async with message.process():
                     message_id = message.message_id
@@ -54,10 +59,28 @@ class RabbitMQHandler:
                         logger.warning(f"Duplicate message detected: {message_id}")
                         return
                         
+                    if message.redelivered and markers.started(message):
+                        # A consumer died while handling it; bound how often that can happen
+                        markers.finish(message)
+                        await redeliver_or_park(self.channel, message, self.queue_name, "consumer stopped while handling message")
+                        return
+                        
                     async with self.processing_lock:
                         if message_id not in self.processed_messages:
-                            body = json.loads(message.body.decode())
-                            await callback(body)
+                            try:
+                                body = json.loads(message.body.decode())
+                            except ValueError as e:
+                                await park(self.channel, message, self.queue_name, f"Undecodable message: {e}")
+                                return
+                            markers.start(message)
+                            try:
+                                await callback(body)
+                            except Exception as e:
+                                logger.error(f"Error processing message {message_id}: {e}")
+                                await redeliver_or_park(self.channel, message, self.queue_name, str(e))
+                                return
+                            finally:
+                                markers.finish(message)
                             self.processed_messages.add(message_id)
                             
                             # Cleanup processed messages set if it gets too large
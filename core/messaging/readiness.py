@@ -0,0 +1,100 @@
+# core/messaging/readiness.py
+"""
+Service readiness over the bus.
+
+Once a service has its queues declared and its HTTP app starting, it
+publishes a STATUS "ready" event under "status.{service}". The launcher
+binds a private queue to those routing keys before starting anything, so it
+is told the moment each service is up instead of polling /health.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+import aio_pika
+from core.messaging.events import STATUS_ROUTING_PREFIX
+from core.messaging.types import MessageType
+from core.utils.logging import setup_logger
+
+logger = setup_logger("readiness")
+
+READY_EVENT = "ready"
+
+async def announce_ready(messaging, service: str, port: Optional[int] = None) -> None:
+    """Tell whoever is listening that this service is ready; never fails the service"""
+    if messaging is None:
+        return
+    message = {
+        "type": MessageType.STATUS.value,
+        "content": f"{service} ready",
+        "correlation_id": None,
+        "conversation_id": None,
+        "source": service,
+        "destination": None,
+        "context": {"event": READY_EVENT, "pid": os.getpid(), "port": port}
+    }
+    try:
+        await messaging.publish_status(f"{STATUS_ROUTING_PREFIX}.{service}", message)
+    except Exception as e:
+        logger.warning(f"Could not announce {service} as ready: {e}")
+
+class ReadinessWatcher:
+    """Collects ready events from services starting up"""
+
+    def __init__(self, broker_url: str, exchange: str):
+        self.broker_url = broker_url
+        self.exchange_name = exchange
+        self.connection = None
+        self.ready: Dict[str, asyncio.Event] = {}
+        self.ready_at: Dict[str, float] = {}
+        self.pids: Dict[str, int] = {}
+
+    async def start(self) -> None:
+        """Connect and start listening; raises if the broker is unreachable"""
+        self.connection = await aio_pika.connect_robust(self.broker_url)
+        channel = await self.connection.channel()
+        # Declared exactly as the services declare it, so whoever comes first wins
+        exchange = await channel.declare_exchange(self.exchange_name, aio_pika.ExchangeType.TOPIC)
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(exchange, routing_key=f"{STATUS_ROUTING_PREFIX}.*")
+        await queue.consume(self._deliver, no_ack=True)
+
+    async def _deliver(self, message: aio_pika.IncomingMessage) -> None:
+        try:
+            self.record(json.loads(message.body.decode()))
+        except ValueError:
+            pass
+
+    def record(self, message: dict) -> None:
+        """Note a ready event; other STATUS events are ignored"""
+        context = message.get("context") or {}
+        if context.get("event") != READY_EVENT or not message.get("source"):
+            return
+        service = message["source"]
+        self.ready_at[service] = time.time()
+        if context.get("pid"):
+            self.pids[service] = context["pid"]
+        self._event(service).set()
+
+    def _event(self, service: str) -> asyncio.Event:
+        return self.ready.setdefault(service, asyncio.Event())
+
+    def expect(self, service: str) -> None:
+        """Forget an earlier ready event before (re)starting a service"""
+        self._event(service).clear()
+        self.ready_at.pop(service, None)
+        self.pids.pop(service, None)
+
+    async def wait(self, service: str, timeout: float) -> bool:
+        """Whether the service announced itself within timeout seconds"""
+        try:
+            await asyncio.wait_for(self._event(service).wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
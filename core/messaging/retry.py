@@ -0,0 +1,41 @@
+# core/messaging/retry.py
+"""
+Broker-side retries.
+
+A handler that cannot make progress right now (e.g. every LLM backend is
+down) raises RetryLater instead of sleeping. ServiceMessaging then acks the
+message and republishes it to a delay queue whose TTL dead-letters it back
+to the service's routing key, so the consumer stays free in the meantime.
+"""
+from contextvars import ContextVar
+from typing import List
+from config.settings import SYSTEM_CONFIG
+
+RETRY_COUNT_HEADER = "x-retry-count"
+
+class RetryLater(Exception):
+    """The message should be redelivered after a broker-side delay"""
+
+# Broker retries still available for the message being handled in this task.
+# Zero outside message handlers (e.g. HTTP requests), where errors surface at once.
+_retries_left: ContextVar[int] = ContextVar("retries_left", default=0)
+
+def retries_left() -> int:
+    return _retries_left.get()
+
+def set_retries_left(count: int):
+    return _retries_left.set(count)
+
+def reset_retries_left(token) -> None:
+    _retries_left.reset(token)
+
+def retry_delays() -> List[int]:
+    """Delay in seconds before each broker retry"""
+    delays = SYSTEM_CONFIG['retry_delays']
+    if not delays:
+        return []
+    # Later retries reuse the last delay when MAX_RETRIES exceeds the list
+    return [delays[min(i, len(delays) - 1)] for i in range(SYSTEM_CONFIG['max_retries'])]
+
+def retry_queue_name(queue_name: str, delay: int) -> str:
+    return f"{queue_name}.retry.{delay}s"
@@ -4,6 +4,14 @@ import asyncio
 import json
 from core.templates import MessagingConfig
 from core.messaging.types import Message, MessageType
+from core.messaging.retry import (
+    RetryLater, RETRY_COUNT_HEADER, retry_delays, retry_queue_name, set_retries_left, reset_retries_left
+)
+from core.messaging.dead_letter import StartedMarkers, declare_parking, park, queue_arguments, redeliver_or_park
+from core.messaging.events import attach_status_publisher
+from core.messaging.priority import MAX_PRIORITY, message_priority, set_priority, reset_priority
+from aio_pika.exceptions import ChannelPreconditionFailed
+from config.settings import SYSTEM_CONFIG
 import logging
 
 logger = logging.getLogger("service")
@@ -18,6 +26,9 @@ class ServiceMessaging:
         self.exchange = None
         self.queue = None
         self.message_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {}
+        self.in_flight = 0
+        # Message types set aside for later while the service drains before a restart
+        self.deferred_types: set = set()
         self.logger = logger
         
     async def initialize(self):
@@ -25,42 +36,158 @@ class ServiceMessaging:
         self.connection = await aio_pika.connect_robust(self.config.broker_url)
         self.channel = await self.connection.channel()
         
+        # Declare queue (first, since a failed declaration replaces the channel)
+        self.queue = await self._declare_queue()
+        # Without a prefetch limit every queued message is pushed to us at once,
+        # and the queue has nothing left to order by priority
+        await self.channel.set_qos(prefetch_count=SYSTEM_CONFIG['consumer_prefetch'])
+        
         # Declare exchange
         self.exchange = await self.channel.declare_exchange(
             self.config.exchange,
             aio_pika.ExchangeType.TOPIC
         )
         
-        # Declare queue
-        self.queue = await self.channel.declare_queue(
-            self.config.queue_name,
-            durable=True
-        )
-        
         # If we have a parent queue, bind to it
         if self.config.parent_queue:
             await self.queue.bind(
                 self.exchange,
                 routing_key=self.config.parent_queue
             )
+        
+        await self._declare_retry_queues()
+        attach_status_publisher(self)
+    
+    async def _declare_queue(self):
+        """Declare our priority queue with a dead-letter exchange feeding its parking queue"""
+        await declare_parking(self.channel, self.config.queue_name)
+        try:
+            return await self.channel.declare_queue(
+                self.config.queue_name,
+                durable=True,
+                arguments={**queue_arguments(self.config.queue_name), "x-max-priority": MAX_PRIORITY}
+            )
+        except ChannelPreconditionFailed:
+            # The queue predates dead-lettering and priorities, and its arguments cannot
+            # change in place. Failed messages are still parked explicitly, but broker-side
+            # rejections are not, and messages are delivered in FIFO order.
+            self.logger.warning(
+                f"Queue {self.config.queue_name} has no dead-letter exchange or priorities; "
+                f"delete it while the service is stopped to add them"
+            )
+            self.channel = await self.connection.channel()
+            return await self.channel.declare_queue(self.config.queue_name, passive=True)
+    
+    async def _declare_retry_queues(self):
+        """Declare one delay queue per retry delay; expired messages return to our routing key"""
+        if not self.config.routing_key:
+            return
+        for delay in sorted(set(retry_delays())):
+            await self.channel.declare_queue(
+                retry_queue_name(self.config.queue_name, delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay * 1000,
+                    "x-dead-letter-exchange": self.config.exchange,
+                    "x-dead-letter-routing-key": self.config.routing_key
+                }
+            )
+    
+    async def schedule_retry(self, message: aio_pika.IncomingMessage, reason: str) -> bool:
+        """Republish a message to the delay queue for its next attempt"""
+        attempt = int((message.headers or {}).get(RETRY_COUNT_HEADER, 0))
+        delays = retry_delays()
+        if not self.config.routing_key or attempt >= len(delays):
+            return False
+        await self.channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers={**(message.headers or {}), RETRY_COUNT_HEADER: attempt + 1},
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                priority=message.priority,
+                content_type=message.content_type
+            ),
+            routing_key=retry_queue_name(self.config.queue_name, delays[attempt])
+        )
+        self.logger.warning(f"Retrying message in {delays[attempt]}s (retry {attempt + 1}/{len(delays)}): {reason}")
+        return True
             
+    async def defer(self, message: aio_pika.IncomingMessage) -> bool:
+        """Send a message around the shortest delay queue without using up a retry"""
+        delays = retry_delays()
+        if not self.config.routing_key or not delays:
+            return False  # nowhere to hold it
+        await self.channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=message.headers or {},
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                priority=message.priority,
+                content_type=message.content_type
+            ),
+            routing_key=retry_queue_name(self.config.queue_name, min(delays))
+        )
+        return True
+
+    def drain(self, message_types):
+        """Stop taking on new work of the given types; it waits in a delay queue for the next process"""
+        self.deferred_types = {getattr(t, "value", t) for t in message_types}
+        self.logger.info(f"Draining: deferring {', '.join(sorted(self.deferred_types))} messages")
+
     async def start_consuming(self):
         """Start consuming messages from the queue"""
+        markers = StartedMarkers(self.config.queue_name)
+
         async def process_message(message: aio_pika.IncomingMessage):
             async with message.process():
+                if message.redelivered and markers.started(message):
+                    # A consumer died while handling it; count that as a failed attempt so a
+                    # message that crashes the service cannot loop. Messages that were only
+                    # prefetched when a channel closed have no marker and run normally.
+                    markers.finish(message)
+                    await redeliver_or_park(self.channel, message, self.config.queue_name, "consumer stopped while handling message")
+                    return
                 try:
                     body = json.loads(message.body.decode())
+                except ValueError as e:
+                    await park(self.channel, message, self.config.queue_name, f"Undecodable message: {e}")
+                    return
+                if body.get('type') in self.deferred_types and await self.defer(message):
+                    return
+                attempt = int((message.headers or {}).get(RETRY_COUNT_HEADER, 0))
+                token = set_retries_left(max(len(retry_delays()) - attempt, 0) if self.config.routing_key else 0)
+                # Messages published while handling this one inherit its priority
+                priority_token = set_priority(message_priority(body, message.priority))
+                self.in_flight += 1
+                markers.start(message)
+                try:
                     message_type = body.get('type')
                     if message_type in self.message_handlers:
                         await self.message_handlers[message_type](body)
+                except RetryLater as e:
+                    if not await self.schedule_retry(message, str(e)):
+                        await park(self.channel, message, self.config.queue_name, f"Gave up after {attempt} retries: {e}")
                 except Exception as e:
                     self.logger.error(f"Error processing message: {e}")
+                    await redeliver_or_park(self.channel, message, self.config.queue_name, str(e))
+                finally:
+                    markers.finish(message)
+                    self.in_flight -= 1
+                    reset_retries_left(token)
+                    reset_priority(priority_token)
         
         await self.queue.consume(process_message)
         
     async def publish(self, routing_key: str, message: dict):
         """Publish a message to a specific routing key"""
         try:
+            # Carry the query's priority in the context and as the AMQP priority
+            priority = message_priority(message)
+            if isinstance(message.get("context"), dict):
+                message["context"].setdefault("priority", priority)
+            elif message.get("context") is None:
+                message["context"] = {"priority": priority}
+            
             # Convert message to JSON string
             message_json = json.dumps(message)
             
@@ -68,7 +195,8 @@ class ServiceMessaging:
             message_obj = aio_pika.Message(
                 body=message_json.encode(),
                 delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-                content_type='application/json'
+                content_type='application/json',
+                priority=priority
             )
             
             # Publish using aio_pika's publish method
@@ -83,6 +211,35 @@ class ServiceMessaging:
             self.logger.error(f"Error publishing message: {e}")
             raise
 
+    async def publish_status(self, routing_key: str, message: dict):
+        """Publish a transient STATUS event; nobody may be listening"""
+        await self.exchange.publish(
+            aio_pika.Message(
+                body=json.dumps(message).encode(),
+                delivery_mode=aio_pika.DeliveryMode.NOT_PERSISTENT,
+                content_type='application/json'
+            ),
+            routing_key=routing_key
+        )
+
+    async def consume_all(self, callback: Callable[[Dict[str, Any]], Awaitable[None]], max_length: int = 1000):
+        """Receive a copy of every message on the exchange in a private, bounded queue"""
+        queue = await self.channel.declare_queue(
+            exclusive=True,
+            auto_delete=True,
+            arguments={"x-max-length": max_length, "x-overflow": "drop-head"}
+        )
+        await queue.bind(self.exchange, routing_key="#")
+        
+        async def deliver(message: aio_pika.IncomingMessage):
+            try:
+                await callback(json.loads(message.body.decode()))
+            except Exception as e:
+                self.logger.debug(f"Dropped event: {e}")
+        
+        await queue.consume(deliver, no_ack=True)
+        return queue
+        
     async def send_message(self, **kwargs):
         """Backward compatibility method that uses publish internally"""
         message = {
@@ -0,0 +1,31 @@
+# core/pipeline/convergence.py
+from config.processing import ReflectionBounds
+from core.pipeline.engine import PipelineStep
+
+# Operations that refine the previous step's output rather than start from the input
+REFINEMENT_OPERATIONS = {"reflect", "critique"}
+
+def is_refinement(step: PipelineStep) -> bool:
+    """Whether the step continues the reflection chain (a repeated analyze does too)"""
+    return step.operation in REFINEMENT_OPERATIONS or (step.operation == "analyze" and step.id != "analyze")
+
+class ReflectionChain:
+    """Tracks a pipeline's refinement steps and stops them once outputs converge"""
+
+    def __init__(self, bounds: ReflectionBounds):
+        self.bounds = bounds
+        self.depth = 0
+        self.last_novelty = 1.0
+
+    def should_run(self, step: PipelineStep) -> bool:
+        """False when the step would refine an output that has already converged"""
+        if not self.bounds.adaptive or not is_refinement(step) or self.depth < self.bounds.min_depth:
+            return True
+        return self.depth < self.bounds.max_depth and self.last_novelty >= self.bounds.novelty_threshold
+
+    def record(self, step: PipelineStep, step_input: str, output: str) -> None:
+        if is_refinement(step):
+            self.depth += 1
+            # NumPy is only loaded once a reflection step has run
+            from core.analysis.similarity import novelty
+            self.last_novelty = novelty(step_input, output)
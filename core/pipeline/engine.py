@@ -0,0 +1,122 @@
+# core/pipeline/engine.py
+"""
+Executes a processing pattern from config/processing.py as a DAG.
+
+Pattern steps run in order; a "delegate" step fans out to one step per
+child service and the following step waits for all of them. Steps whose
+dependencies are complete run concurrently, with the steps that call the
+LLM limited by SYSTEM_CONFIG['llm_concurrency'] per process and admitted
+highest priority first. Every completed step output is persisted, so a
+message redelivered after a crash skips the steps that already ran.
+"""
+import asyncio
+from typing import Dict, List, Optional, Callable, Awaitable
+from config.processing import ProcessPattern
+from config.settings import SYSTEM_CONFIG
+from core.llm.admission import PrioritySemaphore
+from core.pipeline.store import StepStore
+from core.utils.logging import setup_logger
+
+logger = setup_logger("pipeline")
+
+# Steps that query the LLM and count against the concurrency limit
+LLM_OPERATIONS = {"analyze", "reflect", "critique", "integrate", "synthesize"}
+
+_llm_slots: Optional[PrioritySemaphore] = None
+
+def llm_slots() -> PrioritySemaphore:
+    """Process-wide limit on concurrently running LLM steps, higher priority first"""
+    global _llm_slots
+    if _llm_slots is None:
+        _llm_slots = PrioritySemaphore(SYSTEM_CONFIG['llm_concurrency'])
+    return _llm_slots
+
+class PipelineStep:
+    """One thinking step or delegation in a pipeline"""
+
+    def __init__(self, step_id: str, operation: str, depends_on: List[str], target: Optional[str] = None):
+        self.id = step_id
+        self.operation = operation
+        self.depends_on = depends_on
+        self.target = target
+
+    def __repr__(self) -> str:
+        return f"PipelineStep({self.id!r}, depends_on={self.depends_on})"
+
+def build_pipeline(pattern: ProcessPattern, children: Optional[List[str]] = None) -> List[PipelineStep]:
+    """Expand a processing pattern into steps with dependencies"""
+    steps: List[PipelineStep] = []
+    counts: Dict[str, int] = {}
+    previous: List[str] = []
+
+    def next_id(name: str) -> str:
+        counts[name] = counts.get(name, 0) + 1
+        return name if counts[name] == 1 else f"{name}_{counts[name]}"
+
+    for _ in range(pattern.iterations):
+        for operation in pattern.steps:
+            if operation == "delegate" and children:
+                fan_out = [
+                    PipelineStep(next_id(f"delegate_{child}"), operation, list(previous), target=child)
+                    for child in children
+                ]
+                steps.extend(fan_out)
+                previous = [step.id for step in fan_out]
+            else:
+                step = PipelineStep(next_id(operation), operation, list(previous))
+                steps.append(step)
+                previous = [step.id]
+    return steps
+
+# Called with the step and the outputs of its dependencies ({"input": ...} for the first step)
+StepRunner = Callable[[PipelineStep, Dict[str, str]], Awaitable[str]]
+
+class PipelineEngine:
+    """Runs pipeline steps as soon as their dependencies have completed"""
+
+    def __init__(self, steps: List[PipelineStep], run_step: StepRunner, store: Optional[StepStore] = None, key: Optional[str] = None):
+        self.steps = {step.id: step for step in steps}
+        self.run_step = run_step
+        self.store = store
+        self.key = key
+
+    async def _execute(self, step: PipelineStep, inputs: Dict[str, str]) -> str:
+        if step.operation in LLM_OPERATIONS:
+            async with llm_slots():
+                return await self.run_step(step, inputs)
+        return await self.run_step(step, inputs)
+
+    async def run(self, initial_input: str) -> Dict[str, str]:
+        """Run every step and return the outputs by step id"""
+        outputs: Dict[str, str] = {}
+        if self.store and self.key:
+            outputs = {k: v for k, v in self.store.load(self.key).items() if k in self.steps}
+            if outputs:
+                logger.info(f"Resuming pipeline {self.key}: {len(outputs)} of {len(self.steps)} steps already done")
+
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while len(outputs) < len(self.steps):
+                for step in self.steps.values():
+                    if step.id in outputs or step.id in running.values():
+                        continue
+                    if all(dependency in outputs for dependency in step.depends_on):
+                        inputs = {d: outputs[d] for d in step.depends_on} or {"input": initial_input}
+                        running[asyncio.create_task(self._execute(step, inputs))] = step.id
+
+                if not running:
+                    raise RuntimeError(f"Pipeline {self.key} has steps with unsatisfiable dependencies")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_id = running.pop(task)
+                    outputs[step_id] = task.result() or ""
+                    if self.store and self.key:
+                        self.store.save(self.key, outputs)
+        finally:
+            for task in running:
+                task.cancel()
+
+        if self.store and self.key:
+            self.store.clear(self.key)
+        return outputs
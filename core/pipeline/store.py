@@ -0,0 +1,37 @@
+# core/pipeline/store.py
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from config.settings import SYSTEM_CONFIG
+
+class StepStore:
+    """Persists completed pipeline step outputs so a redelivered message resumes"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.path = Path(directory or SYSTEM_CONFIG['pipeline_state_dir'])
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}.json"
+
+    def load(self, key: str) -> Dict[str, str]:
+        """Outputs of the steps already completed for key"""
+        file = self._file(key)
+        if not file.exists():
+            return {}
+        try:
+            return json.loads(file.read_text())["steps"]
+        except (json.JSONDecodeError, KeyError):
+            return {}
+
+    def save(self, key: str, outputs: Dict[str, str]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self._file(key)
+        # Write then rename so a crash never leaves a half-written state file
+        temporary = file.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"steps": outputs, "updated_at": datetime.now().isoformat()}))
+        temporary.replace(file)
+
+    def clear(self, key: str) -> None:
+        self._file(key).unlink(missing_ok=True)
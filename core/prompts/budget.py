@@ -0,0 +1,169 @@
+# core/prompts/budget.py
+"""
+Context-window budgeting for prompts.
+
+Token counts are estimated locally (no tokenizer is bundled with the
+backend), leaning slightly high so an estimate that fits leaves real room.
+Prompts built from several sections are fitted to the space left after the
+shared prefix and the reserved output: duplicated paragraphs are removed
+first, then the lowest-priority sections are truncated or dropped.
+"""
+import math
+import re
+from typing import Dict, List, Optional
+from config.models import ModelParameters, model_config
+from core.prompts.layout import PromptContext, prompt_context, shared_prefix
+from core.utils.logging import setup_logger
+
+logger = setup_logger("budget")
+
+# Chat template tokens around every message, and around the whole request
+MESSAGE_OVERHEAD = 4
+REQUEST_OVERHEAD = 3
+# Never ask for less output than this, and never shrink a section below it
+MIN_OUTPUT_TOKENS = 256
+MIN_SECTION_TOKENS = 32
+TRUNCATION_MARKER = " [...]"
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Approximate the token count of text for a BPE tokenizer"""
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if not piece.isascii():
+            # Non-Latin scripts are close to one token per character
+            tokens += len(piece)
+        else:
+            tokens += (len(piece) + 3) // 4
+    return tokens
+
+def estimate_messages_tokens(messages: List[Dict[str, str]]) -> int:
+    return REQUEST_OVERHEAD + sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, preferring a sentence boundary"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    if limit <= 0:
+        return ""
+
+    # Longest prefix that fits
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary >= len(cut) // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+class PromptSection:
+    """Part of a stage prompt; higher priority sections are kept longer"""
+
+    def __init__(self, text: str, priority: int = 0, required: bool = False):
+        self.text = text or ""
+        self.priority = priority
+        self.required = required
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+def reflection_sections(reflections: Optional[List[str]]) -> List[PromptSection]:
+    """Numbered reflections below other content, the oldest with the lowest priority"""
+    reflections = reflections or []
+    return [
+        PromptSection(f"Reflection {i+1}: {r}", priority=i - len(reflections))
+        for i, r in enumerate(reflections)
+    ]
+
+def _normalize(paragraph: str) -> str:
+    return " ".join(paragraph.lower().split())
+
+def _drop_duplicate_paragraphs(sections: List[PromptSection], known: List[str]) -> None:
+    """Remove paragraphs already present in the prefix or a higher-priority section"""
+    seen = {_normalize(p) for text in known for p in text.split("\n\n") if p.strip()}
+    for section in sorted(sections, key=lambda s: (not s.required, -s.priority)):
+        kept = []
+        for paragraph in section.text.split("\n\n"):
+            key = _normalize(paragraph)
+            if section.required or not key or key not in seen:
+                kept.append(paragraph)
+            seen.add(key)
+        section.text = "\n\n".join(kept)
+
+def fit_sections(sections: List[PromptSection], budget: int, known: Optional[List[str]] = None) -> str:
+    """Join sections, shrinking lower-priority ones until the prompt fits budget tokens"""
+    _drop_duplicate_paragraphs(sections, known or [])
+    sections = [s for s in sections if s.text.strip()]
+
+    def joined_tokens() -> int:
+        return estimate_tokens("\n\n".join(s.text for s in sections if s.text))
+
+    total = joined_tokens()
+    if total > budget:
+        original = total
+        # Lowest priority first; sections of equal priority (such as two child
+        # outputs) share the cut in proportion to their size
+        for priority in sorted({s.priority for s in sections if not s.required}):
+            group = [s for s in sections if not s.required and s.priority == priority]
+            while total > budget and any(s.text for s in group):
+                excess = total - budget
+                group_tokens = sum(s.tokens for s in group)
+                for section in group:
+                    if not section.text:
+                        continue
+                    cut = max(math.ceil(excess * section.tokens / group_tokens), 1)
+                    remaining = section.tokens - cut
+                    section.text = truncate_to_tokens(section.text, remaining) if remaining >= MIN_SECTION_TOKENS else ""
+                total = joined_tokens()
+            if total <= budget:
+                break
+        logger.warning(f"Prompt shrunk from ~{original} to ~{total} tokens to fit a budget of {budget}")
+
+    return "\n\n".join(s.text for s in sections if s.text)
+
+def model_parameters(service: str) -> ModelParameters:
+    return model_config().models.get(service) or ModelParameters.for_service(service)
+
+def reserved_output_tokens(params: ModelParameters) -> int:
+    """Output tokens to keep free, leaving at least half the window for the prompt"""
+    return max(min(params.max_tokens, params.context_length // 2), MIN_OUTPUT_TOKENS)
+
+def prompt_budget(service: str, context: Optional[PromptContext] = None) -> int:
+    """Tokens available to a stage prompt after the shared prefix and reserved output"""
+    params = model_parameters(service)
+    prefix = shared_prefix(context or prompt_context())
+    used = estimate_messages_tokens([{"role": "system", "content": prefix}]) + MESSAGE_OVERHEAD
+    return params.context_length - reserved_output_tokens(params) - used
+
+def fit_prompt(service: str, sections: List[PromptSection]) -> str:
+    """Fit a stage prompt into what the service's context window leaves for it"""
+    context = prompt_context()
+    return fit_sections(sections, prompt_budget(service, context), known=[shared_prefix(context)])
+
+def fit_request(messages: List[Dict[str, str]], params: ModelParameters) -> int:
+    """Make a chat request fit the context window and return the max_tokens to ask for"""
+    prompt_tokens = estimate_messages_tokens(messages)
+    room = params.context_length - prompt_tokens
+    if room >= params.max_tokens:
+        return params.max_tokens
+    if room >= MIN_OUTPUT_TOKENS:
+        logger.info(f"Lowering max_tokens from {params.max_tokens} to {room} to fit the context window")
+        return room
+
+    # The prompt itself is too long: cut the stage suffix, keep the shared prefix
+    other = prompt_tokens - estimate_tokens(messages[-1]["content"])
+    allowed = params.context_length - MIN_OUTPUT_TOKENS - other
+    logger.warning(f"Prompt of ~{prompt_tokens} tokens exceeds the context window, truncating to fit")
+    messages[-1]["content"] = truncate_to_tokens(messages[-1]["content"], max(allowed, 0))
+    return MIN_OUTPUT_TOKENS
@@ -0,0 +1,54 @@
+# core/prompts/fused.py
+"""
+Fused thinking: one LLM call that returns analysis, reflection, critique and
+integration as labeled sections instead of one call per thinking step.
+"""
+import re
+from typing import Dict
+
+# Section label -> pipeline step id whose logging context it uses
+FUSED_SECTIONS = {
+    "analysis": "analyze",
+    "reflection": "reflect",
+    "critique": "critique",
+    "integration": "integrate"
+}
+
+SECTION_HEADER = re.compile(
+    r"^[ \t#*_]*(" + "|".join(FUSED_SECTIONS) + r")[*_]*[ \t]*(?::|$)[\s*_]*",
+    re.IGNORECASE | re.MULTILINE
+)
+
+def fused_instructions(domain: str) -> str:
+    """Instructions asking for every thinking step as a labeled section"""
+    return f"""Work through the following in order, starting each part with its label on its own line:
+ANALYSIS: a detailed {domain} analysis
+REFLECTION: the key insights, hidden relationships and alternative interpretations in your analysis
+CRITIQUE: the weaknesses, gaps and questionable assumptions in your analysis and reflection
+INTEGRATION: an integrated {domain} perspective that combines the points above and suggests directions for further exploration"""
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Split a fused response into its labeled sections"""
+    sections = {name: "" for name in FUSED_SECTIONS}
+    headers = list(SECTION_HEADER.finditer(text or ""))
+    if not headers:
+        # Unlabeled answer: treat it as both the analysis and the final result
+        sections["analysis"] = sections["integration"] = (text or "").strip()
+        return sections
+
+    for header, following in zip(headers, headers[1:] + [None]):
+        name = header.group(1).lower()
+        body = text[header.end():following.start() if following else len(text)].strip()
+        sections[name] = f"{sections[name]}\n\n{body}".strip()
+
+    # Text before the first label is the analysis when the model skipped that label
+    preamble = text[:headers[0].start()].strip()
+    if preamble and not sections["analysis"]:
+        sections["analysis"] = preamble
+
+    # Fall back to the latest section present so the response is never empty
+    if not sections["integration"]:
+        sections["integration"] = next(
+            (sections[name] for name in reversed(list(FUSED_SECTIONS)) if sections[name]), ""
+        )
+    return sections
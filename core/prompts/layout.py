@@ -0,0 +1,114 @@
+# core/prompts/layout.py
+"""
+Prompt layout shared by every service.
+
+Each LLM call is sent as chat messages that start with the same system
+prefix - the system role, the original query and Atlas's analysis - and end
+with the stage-specific instructions as the user message. Local backends
+(llama.cpp, LM Studio) keep the KV cache of the previous prompt per slot, so
+the prefix is prefilled once instead of on every call of a conversation.
+"""
+import json
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+
+SYSTEM_ROLE = """You are one of the services of a hierarchical reasoning system. Atlas coordinates two branches: Nova handles technical analysis with Echo (pattern recognition) and Pixel (visual analysis), and Sage handles philosophical analysis with Quantum (probabilistic reasoning).
+
+Every request names the service you act as and the step to perform. Perform only that step and keep to the requested length."""
+
+class PromptContext:
+    """Conversation data that every prompt of a query starts with"""
+
+    def __init__(self, original_query: str, atlas_analysis: Optional[str] = None, correlation_id: Optional[str] = None):
+        self.original_query = original_query
+        self.atlas_analysis = atlas_analysis or None
+        self.correlation_id = correlation_id
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "PromptContext":
+        """Read the query and Atlas's analysis from a delegation message"""
+        payload: Dict[str, Any] = {}
+        try:
+            content = json.loads(message["content"])
+            if isinstance(content, dict):
+                payload = content
+        except (json.JSONDecodeError, TypeError, KeyError):
+            pass
+
+        additional = (message.get("context") or {}).get("additional_context") or {}
+        original_query = payload.get("original_query") or additional.get("original_query") or message.get("content", "")
+        atlas_analysis = payload.get("atlas_analysis") or additional.get("atlas_analysis")
+        return cls(original_query, atlas_analysis, message.get("correlation_id"))
+
+# The conversation whose prompts are being built in the current task
+_prompt_context: ContextVar[Optional[PromptContext]] = ContextVar("prompt_context", default=None)
+
+def set_prompt_context(context: PromptContext) -> None:
+    """Use context as the shared prefix of prompts built in the current task"""
+    _prompt_context.set(context)
+
+def prompt_context() -> Optional[PromptContext]:
+    return _prompt_context.get()
+
+def shared_prefix(context: Optional[PromptContext]) -> str:
+    """System message text, identical for every call of a conversation"""
+    parts = [SYSTEM_ROLE]
+    if context is not None:
+        parts.append(f"Original Query:\n{context.original_query}")
+        if context.atlas_analysis:
+            parts.append(f"Atlas's Analysis:\n{context.atlas_analysis}")
+    return "\n\n".join(parts)
+
+def build_messages(prompt: str, context: Optional[PromptContext] = None) -> List[Dict[str, str]]:
+    """Chat messages for a stage prompt: shared prefix first, stage suffix last"""
+    return [
+        {"role": "system", "content": shared_prefix(context or prompt_context())},
+        {"role": "user", "content": prompt}
+    ]
+
+def stage_material(content: Optional[str]) -> Optional[str]:
+    """Content for a stage suffix, or None when the shared prefix already holds it"""
+    context = prompt_context()
+    if not content or context is None:
+        return content
+    if content == context.original_query:
+        return None
+    try:
+        payload = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return content
+    # Delegation payloads carry the query that is already in the prefix
+    if isinstance(payload, dict) and payload.get("original_query") == context.original_query:
+        return None
+    return content
+
+def render_messages(messages: List[Dict[str, str]]) -> str:
+    """Flatten chat messages the way a chat template lays them out"""
+    return "".join(f"<|{m['role']}|>\n{m['content']}\n" for m in messages)
+
+def common_prefix_length(first: str, second: str) -> int:
+    length = min(len(first), len(second))
+    for index in range(length):
+        if first[index] != second[index]:
+            return index
+    return length
+
+class PrefixCacheMeter:
+    """Estimates how many prompt tokens a backend slot can reuse from its previous prompt"""
+
+    def __init__(self, max_slots: int = 64):
+        self.max_slots = max_slots
+        self._previous: "OrderedDict[str, str]" = OrderedDict()
+
+    def measure(self, slot: str, messages: List[Dict[str, str]], prompt_tokens: int) -> int:
+        """Record a prompt sent to slot and return its estimated shared-prefix tokens"""
+        rendered = render_messages(messages)
+        previous = self._previous.pop(slot, "")
+        self._previous[slot] = rendered
+        while len(self._previous) > self.max_slots:
+            self._previous.popitem(last=False)
+        if not rendered or not prompt_tokens:
+            return 0
+        # Characters are converted using the prompt's own token density
+        return round(prompt_tokens * common_prefix_length(previous, rendered) / len(rendered))
@@ -2,19 +2,56 @@
 import asyncio
 from typing import Dict, Any, Optional
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from core.utils.logging import setup_logger
 from core.messaging import MessageBroker
 from core.templates import ServiceTemplate, ServiceType
-from config.models import MODEL_CONFIG
+from config.models import model_config
 from .base_thinking import BaseThinkingService
 import signal
+import time
 from core.messaging.service_messaging import ServiceMessaging
 from core.messaging.types import MessageType
+from core.logging.metrics import MetricsRecorder, instrument_operation, record_model_call, track_operation, current_operation
+from core.prompts.layout import build_messages, PrefixCacheMeter
+from core.prompts.budget import fit_request
+from core.prompts.fused import FUSED_SECTIONS, parse_sections
+from core.llm.batching import llm_batcher
+from core.llm.router import llm_router
+from core.llm.hedging import llm_hedger
+from core.llm.batching import LLMRequestError
+from core.llm.circuit_breaker import CircuitOpenError
+from core.llm.coalescing import SingleFlight, request_key
+from core.messaging.retry import RetryLater, retries_left
+from core.messaging.readiness import announce_ready
+from core.pipeline.engine import PipelineEngine, build_pipeline
+from core.pipeline.store import StepStore
+from core.pipeline.convergence import ReflectionChain
+from config.processing import PROCESS_PATTERNS
+from config.settings import SYSTEM_CONFIG
+from database.models import ThinkingType
 import json
 from datetime import datetime
 
 logger = setup_logger("service")
+
+def is_transient(error: Exception) -> bool:
+    """Whether an LLM failure is worth retrying later"""
+    if isinstance(error, (CircuitOpenError, httpx.TransportError)):
+        return True
+    return isinstance(error, LLMRequestError) and (error.status_code >= 500 or error.status_code == 429)
+
+# Messages that start new work; while draining they wait for the next process
+DRAIN_DEFERRED_TYPES = [MessageType.DELEGATE, MessageType.QUERY]
+
+# Thinking operations whose LLM calls are recorded as processing metrics
+INSTRUMENTED_OPERATIONS = [
+    ThinkingType.ANALYZE,
+    ThinkingType.REFLECT,
+    ThinkingType.CRITIQUE,
+    ThinkingType.INTEGRATE,
+    ThinkingType.SYNTHESIZE
+]
     
 class BaseService(BaseThinkingService):
     """Base class for all AI services"""
@@ -30,7 +67,17 @@ class BaseService(BaseThinkingService):
         )
         self.messaging: Optional[ServiceMessaging] = None
         self.running = False
+        self.draining = False
         self.loop = None
+        self.prefix_meter = PrefixCacheMeter()
+        self.model_calls = SingleFlight(SYSTEM_CONFIG['request_coalescing'])
+        self._instrument_thinking_operations()
+
+    def _instrument_thinking_operations(self):
+        """Record token and timing metrics for every thinking operation"""
+        for operation in INSTRUMENTED_OPERATIONS:
+            method = getattr(self, operation.value)
+            setattr(self, operation.value, instrument_operation(self.service_name, operation, method))
 
     async def initialize(self):
         """Initialize service components"""
@@ -50,6 +97,27 @@ class BaseService(BaseThinkingService):
         async def health_check():
             return {"status": "healthy", "service": self.template.service_config.name}
 
+        @self.app.get("/drain")
+        async def drain_status():
+            """Whether the service is draining and how much work it still holds"""
+            return {"draining": self.draining, "pending": self.pending_work()}
+
+        @self.app.post("/drain")
+        async def drain():
+            """Take on no new work ahead of a restart; poll GET /drain until pending reaches 0"""
+            self.drain()
+            return {"draining": self.draining, "pending": self.pending_work()}
+
+        @self.app.on_event("startup")
+        async def ready():
+            """Tell the launcher over the bus that this service is up"""
+            await announce_ready(self.messaging, self.template.service_config.name, self.template.service_config.port)
+
+        @self.app.get("/llm/backends")
+        async def llm_backends():
+            """Routing rules, live load and health of the LLM backends, and hedging counters"""
+            return {**llm_router().status(), "hedging": llm_hedger().stats.to_dict(), "coalescing": self.model_calls.stats()}
+
     async def start(self) -> None:
         """Start the service and connect to message broker"""
         try:
@@ -73,8 +141,21 @@ class BaseService(BaseThinkingService):
             await self.messaging.disconnect()
         except Exception as e:
             self.logger.error(f"Error during message broker disconnect: {str(e)}")
+        await MetricsRecorder.flush()
         self.logger.info(f"{self.template.service_config.name} service stopped")
 
+    def pending_work(self) -> int:
+        """Messages being handled right now; services that hold state across messages add theirs"""
+        return self.messaging.in_flight if self.messaging else 0
+
+    def drain(self) -> None:
+        """Finish the work in hand without starting more, so the process can be restarted cleanly"""
+        if not self.draining:
+            self.logger.info(f"{self.service_name} draining with {self.pending_work()} pending")
+        self.draining = True
+        if self.messaging:
+            self.messaging.drain(DRAIN_DEFERRED_TYPES)
+
     async def query_model(self, prompt: str, **kwargs) -> str:
         """Query the language model - to be implemented by specific services"""
         raise NotImplementedError("query_model must be implemented by service")
@@ -83,6 +164,65 @@ class BaseService(BaseThinkingService):
         """Process incoming message - to be implemented by specific services"""
         raise NotImplementedError("process_message must be implemented by service")
 
+    async def run_pattern(self, message: Dict[str, Any], content: str, step_contexts: Dict[str, dict], respond_to: str) -> Dict[str, str]:
+        """Run the processing pattern declared in the service template for a message"""
+        pattern = PROCESS_PATTERNS[self.template.pattern]
+        steps = build_pipeline(pattern, self.template.branch_services)
+        conversation_id = message["conversation_id"]
+        correlation_id = message["correlation_id"]
+        chain = ReflectionChain(self.template.reflection)
+
+        async def run_step(step, inputs):
+            # Each step works on the output of the step before it
+            step_input = inputs.get("input") if "input" in inputs else inputs[step.depends_on[-1]]
+            if not chain.should_run(step):
+                self.logger.info(f"{self.service_name}: skipping {step.id}, reflection converged at depth {chain.depth} (novelty {chain.last_novelty:.2f})")
+                return step_input
+            operation = getattr(self, step.operation)
+            self.logger.info(f"{self.service_name}: running pipeline step {step.id}")
+            result = await operation(
+                content=step_input,
+                conversation_id=conversation_id,
+                correlation_id=correlation_id,
+                context=step_contexts.get(step.id, {"type": step.id}),
+                destination=respond_to if step.operation == "respond" else "self"
+            )
+            output = result["content"] if result else ""
+            chain.record(step, step_input, output)
+            return output
+
+        engine = PipelineEngine(steps, run_step, StepStore(), f"{self.service_name}_{correlation_id}")
+        return await engine.run(content)
+
+    async def run_fused(self, message: Dict[str, Any], prompt: str, step_contexts: Dict[str, dict], respond_to: str) -> Dict[str, str]:
+        """Run analysis, reflection, critique and integration as a single LLM call"""
+        conversation_id = message["conversation_id"]
+        correlation_id = message["correlation_id"]
+        async with track_operation(self.service_name, "fused"):
+            result = await self.query_model(prompt)
+            sections = parse_sections(result["choices"][0]["message"]["content"])
+
+            # Log each section as its own thinking step so the logs keep the chain's shape
+            for name, step_id in FUSED_SECTIONS.items():
+                if not sections[name]:
+                    continue
+                await self.think(
+                    ThinkingType(step_id),
+                    content=sections[name],
+                    conversation_id=conversation_id,
+                    correlation_id=correlation_id,
+                    context={**step_contexts.get(step_id, {"type": step_id}), "fused": True}
+                )
+
+        await self.respond(
+            content=sections["integration"],
+            conversation_id=conversation_id,
+            correlation_id=correlation_id,
+            context=step_contexts.get("respond", {"type": "final_response"}),
+            destination=respond_to
+        )
+        return sections
+
     def run(self):
         """Run the service in the event loop"""
         try:
@@ -94,6 +234,7 @@ class BaseService(BaseThinkingService):
                 self.logger.info(f"Cleaning up {self.template.service_config.name} service...")
                 if self.messaging:
                     await self.messaging.close()
+                await MetricsRecorder.flush()
                 for task in asyncio.all_tasks(self.loop):
                     if task is not asyncio.current_task():
                         task.cancel()
@@ -168,83 +309,100 @@ class BaseService(BaseThinkingService):
             raise
 
     async def query_model(self, prompt: str) -> Dict[str, Any]:
-        """Query the LLM model with ordered timing strategy"""
-        max_retries = 3
-        base_delay = 5  # seconds between retries
-        
-        # Service processing order and initial delays
-        service_delays = {
-            'atlas': 0,      # Starts immediately
-            'nova': 10,      # Waits 10 seconds after getting Atlas's message
-            'sage': 15,      # Waits 15 seconds after getting Atlas's message
-            'echo': 20,      # Waits 20 seconds after getting Nova's message
-            'pixel': 25,     # Waits 25 seconds after getting Nova's message
-            'quantum': 30,   # Waits 30 seconds after getting Sage's message
-        }
-        
+        """Query the LLM, sharing the call with an identical one already in flight"""
+        operation = current_operation()
+        key = request_key(
+            self.template.service_config.name,
+            operation.operation_type if operation else None,
+            build_messages(prompt)
+        )
+        try:
+            return await self.model_calls.do(key, lambda: self._query_model(prompt))
+        except RetryLater as e:
+            if retries_left() > 0:
+                raise
+            # The shared call could still be retried; this caller's message cannot
+            raise Exception(str(e)) from e
+
+    async def _query_model(self, prompt: str) -> Dict[str, Any]:
+        """Query the LLM model"""
+        # No fixed per-service delay: the pipeline's step order and the
+        # LLM_CONCURRENCY slots pace the calls, and a sleep here would hold a slot idle
         service_name = self.template.service_config.name
-        logger.info(f"Service {service_name} preparing to process")
         
-        # Initial service-specific delay
-        initial_delay = service_delays.get(service_name, 0)
-        if initial_delay > 0:
-            logger.info(f"Service {service_name} waiting {initial_delay} seconds before starting")
-            await asyncio.sleep(initial_delay)
-        
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    retry_delay = base_delay * (2 ** (attempt - 1))  # Exponential backoff
-                    logger.info(f"Service {service_name} retry {attempt + 1}/{max_retries} after {retry_delay} seconds")
-                    await asyncio.sleep(retry_delay)
-                
-                logger.info(f"Service {service_name} attempting query (attempt {attempt + 1}/{max_retries})")
-                
-                # Get model parameters
-                if service_name not in MODEL_CONFIG.models:
-                    raise ValueError(f"No model configuration found for service: {service_name}")
-                
-                model_params = MODEL_CONFIG.models[service_name]
-                
-                # Base model name
-                base_name = "lmstudio-community/Phi-3.1-mini-128k-instruct-GGUF/Phi-3.1-mini-128k-instruct-Q4_K_M.gguf"
-                
-                # Special handling for Atlas (no slot number)
-                model_name = base_name if service_name == 'atlas' else f"{base_name}:{model_params.slot}"
-                
-                logger.info(f"Service {service_name} using model: {model_name}")
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    request_data = {
-                        "model": model_name,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": model_params.temperature,
-                        "max_tokens": model_params.max_tokens,
-                        "top_p": model_params.top_p,
-                        "stream": False
-                    }
-                    
-                    response = await client.post(
-                        f"{MODEL_CONFIG.base_url}/chat/completions",
-                        json=request_data,
-                        headers={"Content-Type": "application/json"}
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        logger.info(f"Service {service_name} query successful")
-                        return result
-                    else:
-                        error_msg = f"Service {service_name} query failed with status {response.status_code}: {response.text}"
-                        logger.error(error_msg)
-                        raise HTTPException(status_code=response.status_code, detail=error_msg)
-                        
-            except Exception as e:
-                logger.error(f"Service {service_name} error on attempt {attempt + 1}: {str(e)}")
-                if attempt == max_retries - 1:
-                    raise Exception(f"Service {service_name} failed after {max_retries} attempts: {str(e)}")
+        try:
+            logger.info(f"Service {service_name} attempting query")
+            
+            # Get model parameters
+            if service_name not in model_config().models:
+                raise ValueError(f"No model configuration found for service: {service_name}")
+            
+            model_params = model_config().models[service_name]
+            
+            # Route by service and the thinking operation being measured
+            operation = current_operation()
+            thinking_type = operation.operation_type if operation else None
+            backend, model_name = llm_router().select(service_name, thinking_type, model_params.slot)
+            
+            logger.info(f"Service {service_name} using model: {model_name} on {backend.name}")
+            
+            # Shared conversation prefix first so the backend can reuse its KV cache
+            messages = build_messages(prompt)
+            # Over-length requests fail on the backend and would burn every retry
+            max_tokens = fit_request(messages, model_params)
+            
+            async def send(backend, model_name):
+                request_data = {
+                    "model": model_name,
+                    "messages": messages,
+                    "temperature": model_params.temperature,
+                    "max_tokens": max_tokens,
+                    "top_p": model_params.top_p,
+                    "cache_prompt": True,
+                    "stream": False
+                }
+                # Gathered with concurrent requests from other conversations when batching is on
+                async with llm_router().dispatch(backend):
+                    result = await llm_batcher(backend.base_url).submit(request_data)
+                return result, backend, model_name
+            
+            primary_backend = backend
+            started = time.perf_counter()
+            # A slow request is duplicated to another backend once it passes the hedge threshold
+            (result, backend, model_name), hedged = await llm_hedger().run(
+                f"{service_name}:{thinking_type}",
+                lambda: send(primary_backend, model_name),
+                lambda: send(*llm_router().select(service_name, thinking_type, model_params.slot, exclude=primary_backend.name))
+            )
+            logger.info(f"Service {service_name} query successful")
+            shared_prefix_tokens = None
+            if SYSTEM_CONFIG['measure_prompt_prefix']:
+                usage = result.get("usage") or {}
+                shared_prefix_tokens = self.prefix_meter.measure(
+                    model_name, messages, int(usage.get("prompt_tokens") or 0)
+                )
+            record_model_call(
+                result,
+                {
+                    "model": model_name,
+                    "backend": backend.name,
+                    "hedged": hedged,
+                    "temperature": model_params.temperature,
+                    "max_tokens": max_tokens,
+                    "top_p": model_params.top_p,
+                    "broker_retries_left": retries_left()
+                },
+                time.perf_counter() - started,
+                shared_prefix_tokens
+            )
+            return result
+            
+        except Exception as e:
+            logger.error(f"Service {service_name} LLM query failed: {str(e)}")
+            # Transient failures are retried from the broker rather than by sleeping here
+            if is_transient(e) and retries_left() > 0:
+                raise RetryLater(f"Service {service_name} LLM query failed: {str(e)}") from e
+            raise Exception(f"Service {service_name} failed: {str(e)}")
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -333,4 +491,5 @@ class BaseService(BaseThinkingService):
     async def shutdown(self):
         """Cleanup service resources"""
         if self.messaging:
-            await self.messaging.close()
\ No newline at end of file
+            await self.messaging.close()
+        await MetricsRecorder.flush()
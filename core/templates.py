@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 from enum import Enum
 from core.types import ServiceType, ServiceCapability
+from config.processing import ReflectionBounds
 
 class ServiceType(str, Enum):
     COORDINATOR = "coordinator"
@@ -45,6 +46,7 @@ class MessagingConfig(BaseModel):
     queue_prefix: str
     queue_name: str
     parent_queue: str
+    routing_key: Optional[str] = None  # The service's own key; delayed retries are routed back to it
 
 class ServiceTemplate(BaseModel):
     """Template for creating service instances"""
@@ -54,6 +56,9 @@ class ServiceTemplate(BaseModel):
     description: str
     branch_services: Optional[List[str]] = None
     capabilities: List[str]
+    pattern: Optional[str] = None  # Key into config.processing.PROCESS_PATTERNS run by core.pipeline
+    reflection: ReflectionBounds = ReflectionBounds()
+    fused_thinking: bool = False  # Leaf services: one LLM call with labeled sections instead of the pattern
 
     @classmethod
     def create_coordinator(cls, name: str, port: int) -> 'ServiceTemplate':
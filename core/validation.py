@@ -1,19 +1,25 @@
 # New file: core/validation.py
 from typing import Dict, Any
 import logging
+from config.models import ModelParameters
+from core.prompts.budget import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 class MessageValidator:
     @staticmethod
-    def validate_message_content(content: str, max_length: int = 8192) -> bool:
+    def validate_message_content(content: str, max_tokens: int = None) -> bool:
         """Validate message content"""
         if not content:
             logger.error("Empty message content")
             return False
         
-        if len(content) > max_length:
-            logger.error(f"Message content exceeds max length: {len(content)} > {max_length}")
+        # Long content is shrunk to the context window when prompts are built;
+        # only reject content that could never fit in one
+        max_tokens = max_tokens or ModelParameters().context_length
+        tokens = estimate_tokens(content)
+        if tokens > max_tokens:
+            logger.error(f"Message content exceeds max tokens: ~{tokens} > {max_tokens}")
             return False
             
         return True
@@ -0,0 +1,107 @@
+"""
+Compressed archive of detached message_logs partitions.
+
+Each archived month is a zstd-compressed JSON Lines file holding one
+message_logs row per line. manifest.json lists the files with their row
+counts and the conversations they contain, so a conversation lookup only
+opens the files that hold it.
+"""
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+import zstandard
+from sqlalchemy import select
+from config.settings import SYSTEM_CONFIG
+from database.models import Message
+
+MANIFEST_FILE = "manifest.json"
+MESSAGE_COLUMNS = [column.name for column in Message.__table__.columns]
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+def encode_row(row: Dict[str, Any]) -> bytes:
+    """Serialize a message_logs row as one JSON line"""
+    return (json.dumps(row, default=_encode, ensure_ascii=False) + "\n").encode("utf-8")
+
+def decode_row(line: str) -> Dict[str, Any]:
+    """Parse a JSON line back into a message_logs row"""
+    row = json.loads(line)
+    if row.get("timestamp"):
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
+
+class MessageArchive:
+    """Reads and records archived message_logs partitions on local disk"""
+
+    def __init__(self, archive_dir: Optional[str] = None):
+        self.path = Path(archive_dir or SYSTEM_CONFIG['message_archive_dir'])
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / MANIFEST_FILE
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {"partitions": {}}
+        return json.loads(self.manifest_path.read_text())
+
+    def record_partition(self, name: str, entry: Dict[str, Any]) -> None:
+        """Add an archived partition to the manifest"""
+        manifest = self.load_manifest()
+        manifest["partitions"][name] = entry
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated manifest
+        temporary = self.manifest_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        temporary.replace(self.manifest_path)
+
+    def iter_rows(self, file_name: str) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of one archive file"""
+        with open(self.path / file_name, "rb") as fh:
+            reader = zstandard.ZstdDecompressor().stream_reader(fh)
+            for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                if line.strip():
+                    yield decode_row(line)
+
+    def conversation_rows(self, conversation_id: int) -> List[Dict[str, Any]]:
+        """All archived rows of a conversation, ordered by time"""
+        rows = []
+        for entry in self.load_manifest()["partitions"].values():
+            if conversation_id not in entry.get("conversation_ids", []):
+                continue
+            rows.extend(
+                row for row in self.iter_rows(entry["file"])
+                if row.get("conversation_id") == conversation_id
+            )
+        return sorted(rows, key=lambda row: (row["timestamp"], row["id"]))
+
+    def conversation_messages(self, conversation_id: int) -> List[Message]:
+        """Archived rows of a conversation as transient Message objects"""
+        return [
+            Message(**{k: v for k, v in row.items() if k in MESSAGE_COLUMNS})
+            for row in self.conversation_rows(conversation_id)
+        ]
+
+async def load_conversation_messages(session, conversation_id: int) -> List[Message]:
+    """Messages of a conversation from the live table and the archive"""
+    result = await session.execute(
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.timestamp)
+    )
+    messages = list(result.scalars())
+
+    # A conversation can straddle the retention cutoff, so merge both sources
+    live_ids = {message.id for message in messages}
+    archived = [
+        message for message in MessageArchive().conversation_messages(conversation_id)
+        if message.id not in live_ids
+    ]
+    if not archived:
+        return messages
+    return sorted(messages + archived, key=lambda message: (message.timestamp, message.id))
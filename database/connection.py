@@ -1,28 +1,47 @@
 from contextlib import asynccontextmanager
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
-from database.config import DATABASE_URL
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 import logging
 
 logger = logging.getLogger("service")
 
-# Log database connection info (without credentials)
-logger.info(f"Initializing database connection to PostgreSQL")
+_engine: Optional[AsyncEngine] = None
+_session_factory = None
 
-# Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    poolclass=NullPool,
-    echo=True  # Set to False in production
-)
+def get_engine() -> AsyncEngine:
+    """The async engine, created on first use rather than at import"""
+    global _engine
+    if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import NullPool
+        from database.config import DATABASE_URL
 
-# Create async session factory
-async_session = sessionmaker(
-    engine, 
-    class_=AsyncSession, 
-    expire_on_commit=False
-)
+        # Log database connection info (without credentials)
+        logger.info(f"Initializing database connection to PostgreSQL")
+        _engine = create_async_engine(
+            DATABASE_URL,
+            poolclass=NullPool,
+            echo=True  # Set to False in production
+        )
+    return _engine
+
+def async_session() -> AsyncSession:
+    """A new session from the lazily created session factory"""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.orm import sessionmaker
+        _session_factory = sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _session_factory()
+
+def __getattr__(name: str):
+    # `from database.connection import engine` still works, creating the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @asynccontextmanager
 async def get_db_session() -> AsyncSession:
@@ -35,4 +54,4 @@ async def get_db_session() -> AsyncSession:
         await session.rollback()
         raise
     finally:
-        await session.close()
\ No newline at end of file
+        await session.close()
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine
 from database.models import Base
 from database.config import DATABASE_URL
+from database.partitions import ensure_partitions, create_default_partition
 import asyncio
 
 async def init_db():
@@ -10,6 +11,9 @@ async def init_db():
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        # message_logs is partitioned; rows need a partition to land in
+        await conn.run_sync(ensure_partitions)
+        await conn.run_sync(create_default_partition)
         
     await engine.dispose()
 
@@ -1,8 +1,8 @@
 from typing import Dict, Any, Optional, List
-from sqlalchemy import select, update
+from sqlalchemy import select, update, insert, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.connection import get_db_session
-from database.models import Conversation, Message
+from database.models import Conversation, Message, ProcessingMetrics
 import json
 from datetime import datetime
 
@@ -87,12 +87,172 @@ class DatabaseLogger:
             await session.commit()
 
     @staticmethod
-    async def get_conversation_messages(conversation_id: int) -> List[Message]:
-        """Get all messages for a conversation"""
+    def _conversation_filters(
+        conversation_id: int,
+        include_internal: bool = True,
+        processing_stage: Optional[str] = None,
+        depth_level: Optional[int] = None,
+        branch_path: Optional[List[str]] = None
+    ) -> list:
+        """Build WHERE clauses for a conversation read, evaluated on the JSONB context"""
+        filters = [Message.conversation_id == conversation_id]
+        if not include_internal:
+            # Internal thinking operations carry a processing_stage in their context
+            filters.append(or_(
+                Message.context.is_(None),
+                ~Message.context.has_key("processing_stage")
+            ))
+        # Containment (@>) is served by the GIN index on context
+        if processing_stage is not None:
+            filters.append(Message.context.contains({"processing_stage": processing_stage}))
+        if depth_level is not None:
+            filters.append(Message.context.contains({"depth_level": depth_level}))
+        if branch_path:
+            filters.append(Message.context.contains({"branch_path": list(branch_path)}))
+        return filters
+
+    @staticmethod
+    async def get_conversation_messages(
+        conversation_id: int,
+        include_internal: bool = True,
+        processing_stage: Optional[str] = None,
+        depth_level: Optional[int] = None,
+        branch_path: Optional[List[str]] = None
+    ) -> List[Message]:
+        """Get the messages of a conversation, filtered in the database"""
+        filters = DatabaseLogger._conversation_filters(
+            conversation_id, include_internal, processing_stage, depth_level, branch_path
+        )
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(Message)
+                .where(*filters)
+                .order_by(Message.timestamp)
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_query_messages(correlation_id: str) -> List[Message]:
+        """Get every message logged for a query, oldest first"""
         async with get_db_session() as session:
             result = await session.execute(
                 select(Message)
+                .where(Message.correlation_id == correlation_id)
+                .order_by(Message.timestamp)
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_query_model_seconds(correlation_id: str) -> float:
+        """Model time recorded for a query across all services"""
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(func.coalesce(func.sum(ProcessingMetrics.processing_time), 0))
+                .where(ProcessingMetrics.correlation_id == correlation_id)
+            )
+            return float(result.scalar())
+
+    @staticmethod
+    async def get_conversation(conversation_id: int) -> Optional[Conversation]:
+        async with get_db_session() as session:
+            return await session.get(Conversation, conversation_id)
+
+    @staticmethod
+    async def get_conversation_timeline(conversation_id: int) -> List[Dict[str, Any]]:
+        """Get message routing and timing for a conversation without content or context"""
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(
+                    Message.id,
+                    Message.source,
+                    Message.destination,
+                    Message.message_type,
+                    Message.timestamp,
+                    Message.correlation_id
+                )
                 .where(Message.conversation_id == conversation_id)
                 .order_by(Message.timestamp)
             )
-            return result.scalars().all()
\ No newline at end of file
+            return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    async def log_processing_metrics_batch(rows: List[Dict[str, Any]]) -> None:
+        """Insert a batch of processing metrics in a single statement"""
+        if not rows:
+            return
+        async with get_db_session() as session:
+            await session.execute(insert(ProcessingMetrics), rows)
+            await session.commit()
+
+    @staticmethod
+    async def get_processing_metrics_summary(
+        group_by: str = "service",
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Aggregate processing metrics per service, thinking type or hour"""
+        group_columns = {
+            "service": ProcessingMetrics.service,
+            "operation_type": ProcessingMetrics.operation_type,
+            "hour": func.date_trunc("hour", ProcessingMetrics.timestamp)
+        }
+        if group_by not in group_columns:
+            raise ValueError(f"Unsupported grouping: {group_by}")
+        key = group_columns[group_by].label("key")
+
+        query = (
+            select(
+                key,
+                func.count(ProcessingMetrics.id).label("operations"),
+                func.coalesce(func.sum(ProcessingMetrics.prompt_tokens), 0).label("prompt_tokens"),
+                func.coalesce(func.sum(ProcessingMetrics.completion_tokens), 0).label("completion_tokens"),
+                func.coalesce(func.sum(ProcessingMetrics.processing_time), 0).label("model_seconds"),
+                func.avg(ProcessingMetrics.processing_time).label("avg_model_seconds"),
+                func.percentile_cont(0.95).within_group(ProcessingMetrics.processing_time).label("p95_model_seconds"),
+                func.avg(ProcessingMetrics.wall_time).label("avg_wall_seconds")
+            )
+            .group_by(key)
+            .order_by(key)
+        )
+        if since is not None:
+            query = query.where(ProcessingMetrics.timestamp >= since)
+
+        async with get_db_session() as session:
+            result = await session.execute(query)
+            return [
+                {
+                    group_by: row.key.isoformat() if isinstance(row.key, datetime) else row.key,
+                    "operations": row.operations,
+                    "prompt_tokens": int(row.prompt_tokens),
+                    "completion_tokens": int(row.completion_tokens),
+                    "model_seconds": float(row.model_seconds),
+                    "avg_model_seconds": float(row.avg_model_seconds or 0),
+                    "p95_model_seconds": float(row.p95_model_seconds or 0),
+                    "avg_wall_seconds": float(row.avg_wall_seconds or 0)
+                }
+                for row in result
+            ]
+
+    @staticmethod
+    async def get_conversation_processing_metrics(conversation_id: int) -> List[Dict[str, Any]]:
+        """Get processing metrics linked to a conversation's messages"""
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(ProcessingMetrics)
+                .join(Message, ProcessingMetrics.message_id == Message.id)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(ProcessingMetrics.timestamp)
+            )
+            return [
+                {
+                    "message_id": m.message_id,
+                    "timestamp": m.timestamp,
+                    "service": m.service,
+                    "operation_type": m.operation_type,
+                    "tokens_used": m.tokens_used,
+                    "prompt_tokens": m.prompt_tokens,
+                    "processing_time": m.processing_time,
+                    "wall_time": m.wall_time,
+                    "model_parameters": m.model_parameters
+                }
+                for m in result.scalars()
+            ]
@@ -8,10 +8,13 @@ from sqlalchemy import (
     Text, 
     Float,
     DateTime, 
+    Sequence,
     ForeignKey, 
     JSON, 
-    UniqueConstraint
+    UniqueConstraint,
+    Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -55,6 +58,11 @@ class Conversation(Base):
     
     messages = relationship("Message", back_populates="conversation")
 
+    __table_args__ = (
+        # Covers the viewer's recent-conversations listing
+        Index('ix_conversation_logs_started_at', started_at.desc(), postgresql_include=['id', 'status']),
+    )
+
 class Message(Base):
     """
     Represents a message in the system's communication and thinking process.
@@ -76,21 +84,28 @@ class Message(Base):
     """
     __tablename__ = "message_logs"
     
-    id = Column(Integer, primary_key=True)
+    # A composite primary key gets no implicit SERIAL; use migration 005's sequence
+    id = Column(
+        Integer,
+        Sequence('message_logs_id_seq'),
+        server_default=Sequence('message_logs_id_seq').next_value(),
+        primary_key=True
+    )
     conversation_id = Column(Integer, ForeignKey("conversation_logs.id"))
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    # Partition key: part of the primary key on the partitioned table
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow)
     message_type = Column(String(50))
     source = Column(String(50))
     destination = Column(String(50))
     content = Column(Text)
     correlation_id = Column(String(100))
-    context = Column(JSON, nullable=True)
+    context = Column(JSONB, nullable=True)
     processing_details = Column(JSON, nullable=True)
     parent_message_id = Column(Integer, nullable=True)
     
     conversation = relationship("Conversation", back_populates="messages")
     
-    # Add unique constraint
+    # Add unique constraint (must include the partition key)
     __table_args__ = (
         UniqueConstraint(
             'conversation_id', 
@@ -98,24 +113,44 @@ class Message(Base):
             'source', 
             'destination', 
             'correlation_id',
+            'timestamp',
             name='uq_message_identifier'
         ),
+        Index('ix_message_logs_conversation_id_timestamp', 'conversation_id', 'timestamp'),
+        Index('ix_message_logs_correlation_id', 'correlation_id'),
+        Index('ix_message_logs_source_type_timestamp', 'source', 'message_type', 'timestamp'),
+        Index('ix_message_logs_context', 'context', postgresql_using='gin'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
 
 class ProcessingMetrics(Base):
     __tablename__ = "processing_metrics"
     
     id = Column(Integer, primary_key=True, index=True)
-    message_id = Column(Integer, ForeignKey("message_logs.id"))
+    # No foreign key: message_logs is partitioned and its rows are archived
+    message_id = Column(Integer)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    correlation_id = Column(String(100), nullable=True)
     service = Column(String)
     operation_type = Column(String)
     tokens_used = Column(Integer)
-    processing_time = Column(Float)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    processing_time = Column(Float)  # Time spent waiting on the model
+    wall_time = Column(Float, nullable=True)  # Total time of the thinking operation
     model_parameters = Column(JSON, nullable=True)
     
     # Define the relationship to Message
-    message = relationship("Message")
+    message = relationship(
+        "Message",
+        primaryjoin="foreign(ProcessingMetrics.message_id) == Message.id",
+        viewonly=True
+    )
+
+    __table_args__ = (
+        Index('ix_processing_metrics_service_timestamp', 'service', 'timestamp'),
+        Index('ix_processing_metrics_message_id', 'message_id'),
+    )
 
 def get_all_models():
     """Return all model classes for verification"""
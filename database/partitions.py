@@ -0,0 +1,64 @@
+"""
+Monthly range partitions of message_logs.
+
+Helpers take a synchronous SQLAlchemy connection so they can be used from
+Alembic migrations directly and from async code through run_sync.
+"""
+import re
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import text
+
+PARENT_TABLE = "message_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+def month_start(value: date) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    """Shift a month start by count months"""
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+def partition_month(name: str) -> Optional[date]:
+    """Month covered by a partition, or None for non-monthly partitions"""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+def create_partition(connection, month: date) -> str:
+    """Create the partition holding one month of messages"""
+    name = partition_name(month)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    return name
+
+def create_default_partition(connection) -> None:
+    """Catch rows outside every monthly partition instead of failing the insert"""
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+    ))
+
+def list_partitions(connection) -> List[str]:
+    """Names of the partitions currently attached to message_logs"""
+    result = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :parent ORDER BY child.relname"
+    ), {"parent": PARENT_TABLE})
+    return [row[0] for row in result]
+
+def ensure_partitions(connection, months_ahead: int = 2, today: Optional[datetime] = None) -> List[str]:
+    """Make sure partitions exist from the current month through months_ahead"""
+    current = month_start(today or datetime.now())
+    return [create_partition(connection, add_months(current, i)) for i in range(months_ahead + 1)]
@@ -0,0 +1,106 @@
+"""
+Retention job for the partitioned message_logs table.
+
+Monthly partitions older than the retention window are detached, exported to
+the compressed archive, checked against their row count and dropped. A
+partition that is detached but not yet dropped (e.g. the job was interrupted)
+is picked up again on the next run.
+"""
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import zstandard
+from sqlalchemy import text
+from config.settings import SYSTEM_CONFIG
+from core.utils.logging import setup_logger
+from database.archive import MessageArchive, MESSAGE_COLUMNS, encode_row
+from database.connection import get_engine
+from database.partitions import (
+    PARENT_TABLE, month_start, add_months, partition_month, list_partitions, ensure_partitions
+)
+
+logger = setup_logger("retention")
+
+COMPRESSION_LEVEL = 10
+
+def list_monthly_tables(connection) -> List[str]:
+    """Monthly partition tables, attached or detached"""
+    result = connection.execute(text(
+        "SELECT relname FROM pg_class WHERE relkind IN ('r', 'p') "
+        "AND relname LIKE :pattern ORDER BY relname"
+    ), {"pattern": f"{PARENT_TABLE}\\_%"})
+    return [row[0] for row in result]
+
+def expired_tables(tables: List[str], retention_months: int, today: Optional[datetime] = None) -> List[str]:
+    """Monthly tables that lie entirely before the retention window"""
+    cutoff = add_months(month_start(today or datetime.now()), -retention_months)
+    months = {name: partition_month(name) for name in tables}
+    return [name for name, month in months.items() if month is not None and month < cutoff]
+
+async def export_partition(connection, name: str, archive: MessageArchive) -> Dict[str, Any]:
+    """Write a detached partition to a zstd JSON Lines file"""
+    archive.path.mkdir(parents=True, exist_ok=True)
+    file_name = f"{name}.jsonl.zst"
+    temporary = archive.path / f"{file_name}.tmp"
+
+    rows = 0
+    conversation_ids = set()
+    result = await connection.stream(text(
+        f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM {name} ORDER BY conversation_id, timestamp"
+    ))
+    with open(temporary, "wb") as fh:
+        with zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).stream_writer(fh) as writer:
+            async for row in result.mappings():
+                writer.write(encode_row(dict(row)))
+                rows += 1
+                if row["conversation_id"] is not None:
+                    conversation_ids.add(row["conversation_id"])
+
+    expected = (await connection.execute(text(f"SELECT count(*) FROM {name}"))).scalar()
+    if rows != expected:
+        temporary.unlink()
+        raise RuntimeError(f"Exported {rows} rows from {name}, expected {expected}")
+
+    temporary.replace(archive.path / file_name)
+    return {
+        "file": file_name,
+        "month": partition_month(name).isoformat(),
+        "rows": rows,
+        "conversation_ids": sorted(conversation_ids),
+        "archived_at": datetime.now().isoformat()
+    }
+
+async def archive_expired_partitions(
+    retention_months: Optional[int] = None,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False
+) -> List[Dict[str, Any]]:
+    """Detach, export and drop monthly partitions outside the retention window"""
+    retention_months = retention_months or SYSTEM_CONFIG['message_retention_months']
+    archive = MessageArchive(archive_dir)
+
+    async with get_engine().begin() as conn:
+        created = await conn.run_sync(ensure_partitions)
+        logger.info(f"Partitions ready: {', '.join(created)}")
+        attached = set(await conn.run_sync(list_partitions))
+        expired = expired_tables(await conn.run_sync(list_monthly_tables), retention_months)
+
+    if dry_run:
+        return [{"partition": name, "attached": name in attached} for name in expired]
+
+    archived = []
+    for name in expired:
+        if name in attached:
+            async with get_engine().begin() as conn:
+                await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            logger.info(f"Detached {name}")
+
+        async with get_engine().connect() as conn:
+            entry = await export_partition(conn, name, archive)
+        archive.record_partition(name, entry)
+        logger.info(f"Archived {entry['rows']} rows from {name} to {entry['file']}")
+
+        async with get_engine().begin() as conn:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        archived.append({"partition": name, **entry})
+
+    return archived
@@ -2,16 +2,24 @@ import asyncio
 from datetime import datetime, timedelta
 from rich.console import Console
 from rich.table import Table
+from sqlalchemy import select
 from .connection import get_db_session
-from .models import ConversationLog, MessageLog, ProcessingMetrics
+from .models import Conversation
+from .archive import load_conversation_messages
 
 console = Console()
 
 async def view_recent_conversations():
     async with get_db_session() as session:
+        # Ordered by the ix_conversation_logs_started_at index
         recent = await session.execute(
-            select(ConversationLog)
-            .order_by(ConversationLog.started_at.desc())
+            select(
+                Conversation.id,
+                Conversation.started_at,
+                Conversation.status,
+                Conversation.initial_query
+            )
+            .order_by(Conversation.started_at.desc())
             .limit(10)
         )
         
@@ -21,23 +29,20 @@ async def view_recent_conversations():
         table.add_column("Status")
         table.add_column("Query")
         
-        for conv in recent.scalars():
+        for conv in recent:
             table.add_row(
                 str(conv.id),
                 conv.started_at.strftime("%Y-%m-%d %H:%M:%S"),
                 conv.status,
-                conv.initial_query[:50] + "..."
+                (conv.initial_query or "")[:50] + "..."
             )
         
         console.print(table)
 
 async def view_conversation_flow(conversation_id: int):
     async with get_db_session() as session:
-        messages = await session.execute(
-            select(MessageLog)
-            .where(MessageLog.conversation_id == conversation_id)
-            .order_by(MessageLog.timestamp)
-        )
+        # Falls back to the archive for partitions past the retention window
+        messages = await load_conversation_messages(session, conversation_id)
         
         table = Table(title=f"Conversation Flow - ID: {conversation_id}")
         table.add_column("Time")
@@ -46,13 +51,13 @@ async def view_conversation_flow(conversation_id: int):
         table.add_column("To")
         table.add_column("Content Preview")
         
-        for msg in messages.scalars():
+        for msg in messages:
             table.add_row(
                 msg.timestamp.strftime("%H:%M:%S"),
                 msg.message_type,
                 msg.source,
                 msg.destination,
-                msg.content[:50] + "..."
+                (msg.content or "")[:50] + "..."
             )
         
         console.print(table)
\ No newline at end of file
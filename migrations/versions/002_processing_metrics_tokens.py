@@ -0,0 +1,34 @@
+"""Add token and timing breakdown to processing_metrics
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('processing_metrics', sa.Column('correlation_id', sa.String(length=100), nullable=True))
+    op.add_column('processing_metrics', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('processing_metrics', sa.Column('completion_tokens', sa.Integer(), nullable=True))
+    op.add_column('processing_metrics', sa.Column('wall_time', sa.Float(), nullable=True))
+    op.create_index('ix_processing_metrics_service_timestamp', 'processing_metrics', ['service', 'timestamp'], unique=False)
+    op.create_index('ix_processing_metrics_message_id', 'processing_metrics', ['message_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_processing_metrics_message_id', table_name='processing_metrics')
+    op.drop_index('ix_processing_metrics_service_timestamp', table_name='processing_metrics')
+    op.drop_column('processing_metrics', 'wall_time')
+    op.drop_column('processing_metrics', 'completion_tokens')
+    op.drop_column('processing_metrics', 'prompt_tokens')
+    op.drop_column('processing_metrics', 'correlation_id')
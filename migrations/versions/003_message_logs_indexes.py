@@ -0,0 +1,56 @@
+"""Indexes for message_logs hot queries
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 11:00:00.000000
+
+Indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction so the tables stay writable while they are created.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # DatabaseLogger.get_conversation_messages: filter by conversation, ordered by time
+        op.create_index(
+            'ix_message_logs_conversation_id_timestamp', 'message_logs',
+            ['conversation_id', 'timestamp'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Correlation id lookups across services
+        op.create_index(
+            'ix_message_logs_correlation_id', 'message_logs',
+            ['correlation_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Per-service scans of one message type over a time range
+        op.create_index(
+            'ix_message_logs_source_type_timestamp', 'message_logs',
+            ['source', 'message_type', 'timestamp'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Viewer's recent conversations: index-only scan for ordering and status
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conversation_logs_started_at "
+            "ON conversation_logs (started_at DESC) INCLUDE (id, status)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_conversation_logs_started_at")
+        op.drop_index('ix_message_logs_source_type_timestamp', table_name='message_logs',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_message_logs_correlation_id', table_name='message_logs',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_message_logs_conversation_id_timestamp', table_name='message_logs',
+                      postgresql_concurrently=True, if_exists=True)
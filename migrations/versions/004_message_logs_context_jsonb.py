@@ -0,0 +1,67 @@
+"""Store message_logs.context as JSONB
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 13:00:00.000000
+
+SystemLogger.log_message used to store json.dumps(context) in a JSON
+column, so most rows hold a JSON string containing the real object. The
+column is converted to JSONB, those strings are decoded in place, and a
+GIN index is added for containment and key-existence filters.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def _context_type() -> str:
+    bind = op.get_bind()
+    return bind.execute(sa.text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'message_logs' AND column_name = 'context'"
+    )).scalar()
+
+
+def upgrade() -> None:
+    if _context_type() == 'jsonb':
+        # Column was already created as JSONB by database/migrate.py
+        op.execute(
+            "UPDATE message_logs SET context = (context #>> '{}')::jsonb "
+            "WHERE jsonb_typeof(context) = 'string'"
+        )
+    else:
+        op.alter_column(
+            'message_logs', 'context',
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=(
+                "CASE WHEN json_typeof(context) = 'string' "
+                "THEN (context #>> '{}')::jsonb ELSE context::jsonb END"
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_message_logs_context "
+            "ON message_logs USING gin (context)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_message_logs_context")
+    op.alter_column(
+        'message_logs', 'context',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="context::json"
+    )
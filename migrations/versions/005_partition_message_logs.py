@@ -0,0 +1,142 @@
+"""Partition message_logs by month
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 15:00:00.000000
+
+message_logs becomes a table partitioned by RANGE (timestamp) with one
+partition per month plus a default partition. Existing rows are copied
+into the new partitions. Old partitions are detached and archived by
+database/retention.py.
+
+PostgreSQL requires the partition key in every primary key and unique
+constraint, so:
+- the primary key becomes (id, timestamp)
+- uq_message_identifier also includes timestamp
+- the foreign keys pointing at message_logs.id (processing_metrics.message_id
+  and message_logs.parent_message_id) are dropped; the columns are kept
+- timestamp becomes NOT NULL; legacy rows without one get their
+  conversation's start time, or the time of the migration
+
+The copy takes an exclusive lock on message_logs; run this migration with
+the services stopped.
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from database.partitions import (
+    month_start, add_months, create_partition, create_default_partition, ensure_partitions
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (
+    "id, conversation_id, timestamp, message_type, source, destination, content, "
+    "correlation_id, context, processing_details, parent_message_id"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.execute("ALTER TABLE processing_metrics DROP CONSTRAINT IF EXISTS processing_metrics_message_id_fkey")
+    op.execute("ALTER TABLE message_logs DROP CONSTRAINT IF EXISTS message_logs_parent_message_id_fkey")
+    op.execute("ALTER TABLE message_logs RENAME TO message_logs_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE message_logs (
+            id INTEGER NOT NULL DEFAULT nextval('message_logs_id_seq'),
+            conversation_id INTEGER REFERENCES conversation_logs (id),
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            message_type VARCHAR,
+            source VARCHAR,
+            destination VARCHAR,
+            content VARCHAR,
+            correlation_id VARCHAR,
+            context JSONB,
+            processing_details JSON,
+            parent_message_id INTEGER,
+            CONSTRAINT message_logs_pkey_partitioned PRIMARY KEY (id, timestamp),
+            CONSTRAINT uq_message_identifier_partitioned UNIQUE
+                (conversation_id, message_type, source, destination, correlation_id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE message_logs_id_seq OWNED BY message_logs.id")
+
+    # timestamp was nullable before and is the partition key now: give legacy rows
+    # without one their conversation's start, or the time of the migration
+    op.execute("""
+        UPDATE message_logs_unpartitioned AS m
+        SET timestamp = COALESCE(
+            (SELECT c.started_at FROM conversation_logs AS c WHERE c.id = m.conversation_id),
+            now() AT TIME ZONE 'utc'
+        )
+        WHERE m.timestamp IS NULL
+    """)
+
+    oldest = bind.execute(sa.text("SELECT min(timestamp) FROM message_logs_unpartitioned")).scalar()
+    if oldest is not None:
+        month = month_start(oldest)
+        current = month_start(datetime.now())
+        while month < current:
+            create_partition(bind, month)
+            month = add_months(month, 1)
+    ensure_partitions(bind)
+    create_default_partition(bind)
+
+    op.execute(f"INSERT INTO message_logs ({COLUMNS}) SELECT {COLUMNS} FROM message_logs_unpartitioned")
+    op.execute("DROP TABLE message_logs_unpartitioned")
+
+    # Constraint and index names were freed by the drop
+    op.execute("ALTER TABLE message_logs RENAME CONSTRAINT message_logs_pkey_partitioned TO message_logs_pkey")
+    op.execute("ALTER TABLE message_logs RENAME CONSTRAINT uq_message_identifier_partitioned TO uq_message_identifier")
+    op.create_index('ix_message_logs_id', 'message_logs', ['id'], unique=False)
+    op.create_index('ix_message_logs_conversation_id_timestamp', 'message_logs', ['conversation_id', 'timestamp'], unique=False)
+    op.create_index('ix_message_logs_correlation_id', 'message_logs', ['correlation_id'], unique=False)
+    op.create_index('ix_message_logs_source_type_timestamp', 'message_logs', ['source', 'message_type', 'timestamp'], unique=False)
+    op.execute("CREATE INDEX ix_message_logs_context ON message_logs USING gin (context)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE message_logs RENAME TO message_logs_partitioned")
+    op.execute("ALTER TABLE message_logs_partitioned RENAME CONSTRAINT message_logs_pkey TO message_logs_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE message_logs (
+            id INTEGER NOT NULL DEFAULT nextval('message_logs_id_seq') PRIMARY KEY,
+            conversation_id INTEGER REFERENCES conversation_logs (id),
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            message_type VARCHAR,
+            source VARCHAR,
+            destination VARCHAR,
+            content VARCHAR,
+            correlation_id VARCHAR,
+            context JSONB,
+            processing_details JSON,
+            parent_message_id INTEGER REFERENCES message_logs (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE message_logs_id_seq OWNED BY message_logs.id")
+    op.execute(f"INSERT INTO message_logs ({COLUMNS}) SELECT {COLUMNS} FROM message_logs_partitioned")
+    op.execute("DROP TABLE message_logs_partitioned CASCADE")
+
+    op.create_unique_constraint(
+        'uq_message_identifier', 'message_logs',
+        ['conversation_id', 'message_type', 'source', 'destination', 'correlation_id']
+    )
+    op.create_index('ix_message_logs_id', 'message_logs', ['id'], unique=False)
+    op.create_index('ix_message_logs_conversation_id_timestamp', 'message_logs', ['conversation_id', 'timestamp'], unique=False)
+    op.create_index('ix_message_logs_correlation_id', 'message_logs', ['correlation_id'], unique=False)
+    op.create_index('ix_message_logs_source_type_timestamp', 'message_logs', ['source', 'message_type', 'timestamp'], unique=False)
+    op.execute("CREATE INDEX ix_message_logs_context ON message_logs USING gin (context)")
+    op.create_foreign_key(
+        'processing_metrics_message_id_fkey', 'processing_metrics', 'message_logs',
+        ['message_id'], ['id']
+    )
@@ -0,0 +1,32 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import asyncio
+from database.retention import archive_expired_partitions
+
+async def main(retention_months: int, archive_dir: str, dry_run: bool):
+    results = await archive_expired_partitions(retention_months, archive_dir, dry_run)
+    if not results:
+        print("No partitions outside the retention window")
+    for result in results:
+        if dry_run:
+            state = "attached" if result["attached"] else "detached"
+            print(f"Would archive {result['partition']} ({state})")
+        else:
+            print(
+                f"Archived {result['partition']}: {result['rows']} rows, "
+                f"{len(result['conversation_ids'])} conversations -> {result['file']}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive message_logs partitions outside the retention window")
+    parser.add_argument("--retention-months", type=int, default=None, help="Months to keep in the database")
+    parser.add_argument("--archive-dir", default=None, help="Directory for the compressed archive files")
+    parser.add_argument("--dry-run", action="store_true", help="List partitions that would be archived")
+    args = parser.parse_args()
+    asyncio.run(main(args.retention_months, args.archive_dir, args.dry_run))
@@ -0,0 +1,175 @@
+import sys
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from database.config import DATABASE_URL
+
+# Synthetic tables live in their own schema so the real tables are untouched
+SCHEMA = "bench_message_logs"
+
+SERVICES = ["atlas", "nova", "sage", "echo", "pixel", "quantum"]
+MESSAGE_TYPES = ["analyze", "reflect", "critique", "integrate", "delegate", "respond", "synthesize"]
+
+# Same definitions as migrations/versions/003_message_logs_indexes.py
+INDEXES = [
+    "CREATE INDEX ix_message_logs_conversation_id_timestamp ON message_logs (conversation_id, timestamp)",
+    "CREATE INDEX ix_message_logs_correlation_id ON message_logs (correlation_id)",
+    "CREATE INDEX ix_message_logs_source_type_timestamp ON message_logs (source, message_type, timestamp)",
+    "CREATE INDEX ix_conversation_logs_started_at ON conversation_logs (started_at DESC) INCLUDE (id, status)",
+]
+
+# Hot queries with the parameters used for every run
+QUERIES = {
+    "conversation messages": (
+        "SELECT * FROM message_logs WHERE conversation_id = :conversation_id ORDER BY timestamp",
+        {"conversation_id": 4242}
+    ),
+    "correlation lookup": (
+        "SELECT * FROM message_logs WHERE correlation_id = :correlation_id",
+        {"correlation_id": "query_4242"}
+    ),
+    "service scan (last hour)": (
+        "SELECT id, conversation_id, timestamp FROM message_logs "
+        "WHERE source = :source AND message_type = :message_type "
+        "AND timestamp >= now() - interval '1 hour' ORDER BY timestamp",
+        {"source": "echo", "message_type": "reflect"}
+    ),
+    "recent conversations": (
+        "SELECT id, started_at, status, initial_query FROM conversation_logs "
+        "ORDER BY started_at DESC LIMIT 10",
+        {}
+    ),
+}
+
+def log(message: str):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+async def create_synthetic_data(conn, rows: int, conversations: int):
+    """Create the bench schema and fill it with synthetic rows"""
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    await conn.execute(text("""
+        CREATE TABLE conversation_logs (
+            id SERIAL PRIMARY KEY,
+            started_at TIMESTAMP NOT NULL,
+            status VARCHAR(50),
+            initial_query TEXT
+        )
+    """))
+    await conn.execute(text("""
+        CREATE TABLE message_logs (
+            id SERIAL PRIMARY KEY,
+            conversation_id INTEGER,
+            timestamp TIMESTAMP NOT NULL,
+            message_type VARCHAR(50),
+            source VARCHAR(50),
+            destination VARCHAR(50),
+            content TEXT,
+            correlation_id VARCHAR(100),
+            context JSON
+        )
+    """))
+
+    log(f"Inserting {conversations:,} conversations...")
+    await conn.execute(text("""
+        INSERT INTO conversation_logs (started_at, status, initial_query)
+        SELECT now() - (g * interval '1 minute'),
+               CASE WHEN g % 10 = 0 THEN 'failed' ELSE 'complete' END,
+               'synthetic query ' || g
+        FROM generate_series(1, :conversations) g
+    """), {"conversations": conversations})
+
+    # Messages of one conversation are interleaved with others, as on a busy system
+    log(f"Inserting {rows:,} messages...")
+    await conn.execute(text("""
+        INSERT INTO message_logs
+            (conversation_id, timestamp, message_type, source, destination, content, correlation_id, context)
+        SELECT 1 + g % :conversations,
+               now() - ((:rows - g) * interval '20 milliseconds'),
+               (CAST(:message_types AS text[]))[1 + g % 7],
+               (CAST(:services AS text[]))[1 + (g / 7) % 6],
+               'self',
+               repeat('synthetic thinking output ', 20),
+               'query_' || (1 + g % :conversations),
+               '{"processing_stage": "internal"}'
+        FROM generate_series(1, :rows) g
+    """), {
+        "rows": rows,
+        "conversations": conversations,
+        "message_types": MESSAGE_TYPES,
+        "services": SERVICES
+    })
+    await conn.execute(text("ANALYZE"))
+
+async def time_queries(conn, repeat: int):
+    """Return median latency (ms) and top plan node for each hot query"""
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        plan = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params)
+        top_node = plan.scalar()[0]["Plan"]
+        while top_node["Node Type"] in ("Sort", "Limit", "Gather", "Gather Merge") and top_node.get("Plans"):
+            top_node = top_node["Plans"][0]
+
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await conn.execute(text(sql), params)
+            result.fetchall()
+            latencies.append((time.perf_counter() - started) * 1000)
+        results[name] = (statistics.median(latencies), top_node["Node Type"])
+    return results
+
+async def main(rows: int, conversations: int, repeat: int, keep: bool):
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    try:
+        async with engine.begin() as conn:
+            await create_synthetic_data(conn, rows, conversations)
+
+        async with engine.connect() as conn:
+            await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+            log("Timing queries without indexes...")
+            before = await time_queries(conn, repeat)
+
+            log("Creating indexes...")
+            for statement in INDEXES:
+                started = time.perf_counter()
+                await conn.execute(text(statement))
+                log(f"  {statement.split(' ON ')[0][13:]} ({time.perf_counter() - started:.1f}s)")
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+
+            log("Timing queries with indexes...")
+            after = await time_queries(conn, repeat)
+
+        print()
+        print(f"{rows:,} messages, {conversations:,} conversations, median of {repeat} runs")
+        print(f"{'query':<26} {'before ms':>10} {'after ms':>10} {'speedup':>9}  plan")
+        for name in QUERIES:
+            before_ms, before_plan = before[name]
+            after_ms, after_plan = after[name]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            print(f"{name:<26} {before_ms:>10.2f} {after_ms:>10.2f} {speedup:>8.1f}x  {before_plan} -> {after_plan}")
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark message_logs hot queries before and after indexing")
+    parser.add_argument("--rows", type=int, default=3_000_000, help="Synthetic messages to generate")
+    parser.add_argument("--conversations", type=int, default=200_000, help="Synthetic conversations to generate")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.conversations, args.repeat, args.keep))
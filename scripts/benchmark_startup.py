@@ -0,0 +1,79 @@
+import sys
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+SERVICES = ["atlas", "nova", "sage", "echo", "pixel", "quantum"]
+
+# Loaded on first use; importing them at startup is a regression
+LAZY_MODULES = ["numpy", "uvicorn", "asyncpg"]
+
+def import_times(service: str):
+    """Cumulative import time of a service module (ms), per-package self times, its stdout and loaded modules"""
+    code = (
+        f"import sys; import services.{service}.service; "
+        f"print('\\n'.join(sorted(sys.modules)), file=sys.stderr)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing services.{service}.service failed:\n{result.stderr[-2000:]}")
+    total = None
+    packages = defaultdict(float)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            modules.add(line.strip())
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # the header line
+        name = name.strip()
+        packages[name.split(".")[0]] += self_us / 1000
+        if name == f"services.{service}.service":
+            total = cumulative_us / 1000
+    return total, packages, result.stdout, modules
+
+def main(services, runs: int, budget_ms: float, top: int) -> int:
+    over_budget = []
+    print(f"{'service':<10} {'median ms':>10} {'min ms':>8}  heaviest packages")
+    for service in services:
+        samples, packages, output, modules = [], None, "", set()
+        for _ in range(runs):
+            total, packages, output, modules = import_times(service)
+            samples.append(total)
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        median = statistics.median(samples)
+        print(f"{service:<10} {median:>10.1f} {min(samples):>8.1f}  " + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest))
+        problems = []
+        if median > budget_ms:
+            problems.append(f"over the {budget_ms:.0f} ms budget")
+        eager = [name for name in LAZY_MODULES if name in modules]
+        if eager:
+            problems.append(f"imports {', '.join(eager)} at startup")
+        if output.strip():
+            problems.append(f"prints at import: {output.strip().splitlines()[0]!r}")
+        for problem in problems:
+            print(f"  {service}: {problem}")
+        if problems:
+            over_budget.append(service)
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time service imports with python -X importtime and check them against a budget")
+    parser.add_argument("services", nargs="*", default=SERVICES, help="Services to time (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per service")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Median import time allowed per service")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level packages to show")
+    args = parser.parse_args()
+    sys.exit(main(args.services, args.runs, args.budget_ms, args.top))
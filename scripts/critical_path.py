@@ -0,0 +1,26 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import asyncio
+from core.analysis.critical_path import critical_path_report, format_report
+
+async def main(conversation_id: int, as_json: bool):
+    report = await critical_path_report(conversation_id)
+    if as_json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(f"Conversation {conversation_id}")
+        print(format_report(report))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the critical path of a completed conversation")
+    parser.add_argument("conversation_id", type=int)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+    asyncio.run(main(args.conversation_id, args.json))
@@ -0,0 +1,45 @@
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import asyncio
+import aio_pika
+from config.services import SERVICE_TEMPLATES
+from core.messaging.dead_letter import ParkingLot
+
+async def run(lot: ParkingLot, service: str, action: str, limit: int):
+    if action == "list":
+        print(f"{service}: {await lot.count()} parked")
+        for message in await lot.list(limit):
+            print(json.dumps(message, default=str))
+    elif action == "replay":
+        print(f"{service}: replayed {await lot.replay(limit)}")
+    elif action == "purge":
+        print(f"{service}: purged {await lot.purge()}")
+
+async def main(action: str, services: list, limit: int):
+    templates = [SERVICE_TEMPLATES[name] for name in services]
+    connection = await aio_pika.connect_robust(templates[0].messaging_config.broker_url)
+    try:
+        channel = await connection.channel()
+        for name, template in zip(services, templates):
+            await run(ParkingLot(channel, template.messaging_config.queue_name), name, action, limit)
+    finally:
+        await connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect, replay or purge parked (dead-lettered) service messages")
+    parser.add_argument("action", choices=["list", "replay", "purge"])
+    parser.add_argument("services", nargs="*", help="Services to act on (default: all)")
+    parser.add_argument("--limit", type=int, default=None, help="Messages to list or replay (default: 50 listed, all replayed)")
+    args = parser.parse_args()
+    unknown = [name for name in args.services if name not in SERVICE_TEMPLATES]
+    if unknown:
+        parser.error(f"Unknown services: {', '.join(unknown)}")
+    limit = args.limit if args.limit is not None or args.action != "list" else 50
+    asyncio.run(main(args.action, args.services or list(SERVICE_TEMPLATES), limit))
@@ -9,6 +9,7 @@ sys.path.append(str(root_dir))
 import asyncio
 from database.models import Base, get_all_models
 from database.connection import engine
+from database.partitions import ensure_partitions, create_default_partition
 
 async def init_db():
     """Initialize database with all models"""
@@ -26,6 +27,10 @@ async def init_db():
         print("Creating all tables...")
         await conn.run_sync(Base.metadata.create_all)
         
+        print("Creating message_logs partitions...")
+        await conn.run_sync(ensure_partitions)
+        await conn.run_sync(create_default_partition)
+        
         print("Database initialization complete!")
 
 if __name__ == "__main__":
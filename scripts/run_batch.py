@@ -0,0 +1,31 @@
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import asyncio
+import httpx
+from core.batch.runner import BatchRunner, atlas_client
+
+async def main(args):
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        submit, fetch = atlas_client(args.atlas_url.rstrip("/"), client, args.priority)
+        runner = BatchRunner(submit, fetch, concurrency=args.concurrency, rate=args.rate, query_timeout=args.timeout)
+        progress = await runner.run(args.input, args.output, args.field)
+    print(json.dumps(progress))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through Atlas and write the results as JSONL")
+    parser.add_argument("input", help="JSONL file with one query per line (content/query/prompt/body field)")
+    parser.add_argument("output", help="JSONL file for the results; rerun with the same file to resume")
+    parser.add_argument("--atlas-url", default="http://localhost:8000", help="Atlas base URL")
+    parser.add_argument("--concurrency", type=int, default=None, help="Queries in flight at once (default BATCH_CONCURRENCY)")
+    parser.add_argument("--rate", type=float, default=None, help="Submissions per second, 0 for no limit (default BATCH_RATE)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait for each query (default BATCH_QUERY_TIMEOUT)")
+    parser.add_argument("--field", default=None, help="Field holding the query text")
+    parser.add_argument("--priority", default="batch", help="Query priority (default batch)")
+    asyncio.run(main(parser.parse_args()))
@@ -1,12 +1,21 @@
 from database.models import ThinkingType, ProcessingStage
+from core.prompts.budget import PromptSection, fit_prompt
 
 class AtlasPrompts:
-    @staticmethod
-    def initial_analysis(query: str) -> str:
-        return f"""As Atlas, you are the integration consciousness of our system. Your role is to receive inputs from both branches and synthesize them.
-Query: {query}
+    # The query and Atlas's analysis are part of the shared prompt prefix
+    # (core/prompts/layout.py) and are not repeated here.
 
-Provide a concise analysis (2–3 sentences) that highlights the core themes."""
+    @staticmethod
+    def initial_analysis(related_query: str = None, related_answer: str = None) -> str:
+        return fit_prompt("atlas", [
+            PromptSection("As Atlas, you are the integration consciousness of our system. Your role is to receive inputs from both branches and synthesize them.", required=True),
+            PromptSection(
+                f"A similarly worded question was answered earlier. It may ask something different; build on its answer only where it applies and note where this query differs.\nEarlier question: {related_query}\nEarlier answer: {related_answer}"
+                if related_answer else "",
+                priority=1
+            ),
+            PromptSection("Provide a concise analysis (2–3 sentences) of the query that highlights the core themes.", required=True)
+        ])
 
     @staticmethod
     def reflect_on_analysis(previous_analysis: str, depth: int) -> str:
@@ -35,24 +44,18 @@ Atlas's Analysis: {initial_analysis}
 Focus on {focus}. Provide concise instructions (2–3 sentences) for their analysis."""
 
     @staticmethod
-    def final_synthesis(query: str, atlas_analysis: str, nova_response: str, sage_response: str) -> str:
+    def final_synthesis(nova_response: str, sage_response: str) -> str:
         """Generate a prompt for final synthesis of all responses."""
-        return f"""As Atlas, you are tasked with synthesizing multiple perspectives into a cohesive final response.
-
-Context:
-Original Query: {query}
-
-Your Initial Analysis: {atlas_analysis}
-
-Technical Perspective (Nova): {nova_response}
-
-Philosophical Perspective (Sage): {sage_response}
-
-Instructions:
+        return fit_prompt("atlas", [
+            PromptSection("As Atlas, you are tasked with synthesizing multiple perspectives into a cohesive final response.", required=True),
+            PromptSection(f"Technical Perspective (Nova): {nova_response}", priority=1),
+            PromptSection(f"Philosophical Perspective (Sage): {sage_response}", priority=1),
+            PromptSection("""Instructions:
 1. Consider your initial analysis, Nova's technical insights, and Sage's philosophical perspective
 2. Create a balanced synthesis that integrates all viewpoints
 3. Ensure the response directly addresses the original query
 4. Keep the synthesis clear, concise, and actionable
 5. Present the information in a way that provides immediate value to the user
 
-Please provide your synthesized response:"""
+Please provide your synthesized response:""", required=True)
+        ])
@@ -1,15 +1,27 @@
 import asyncio
 from typing import Dict, Any, Optional, List
 import time
+from datetime import datetime, timedelta
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from core.services.base import BaseService
 from core.templates import ServiceTemplate
 from config.services import SERVICE_TEMPLATES, get_service_template
+from config.settings import SYSTEM_CONFIG
 from core.utils.logging import setup_logger
 from core.logging.system_logger import SystemLogger
+from core.logging.metrics import MetricsRecorder, track_operation
+from core.analysis.critical_path import critical_path_report
+from core.analysis.prefix_cache import prefix_cache_report
+from core.prompts.layout import PromptContext, set_prompt_context
 from core.messaging.types import MessageType, Message
+from core.messaging.dead_letter import ParkingLot
+from core.messaging.events import EventFeed, emit_status
+from core.batch.runner import BatchRunner, resolve_batch_path
+from core.cache.results import NO_CACHE, NO_STORE, ResultCache, cache_directives, normalize_query
+from core.messaging.priority import PRIORITY_LEVELS, current_priority, parse_priority, set_priority
 from core.validation import MessageValidator
 from services.atlas.prompts import AtlasPrompts
 from database.models import ThinkingType, ProcessingStage
@@ -33,6 +45,16 @@ class AtlasService(BaseService):
         self.validator = MessageValidator()
         self.prompts = AtlasPrompts()
         self.conversations = {}
+        self.query_events: Dict[str, asyncio.Event] = {}
+        self.query_tasks = set()
+        self.event_feed = EventFeed()
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.result_cache = ResultCache(path=SYSTEM_CONFIG['result_cache_path'] or None) if SYSTEM_CONFIG['result_cache'] else None
+        self._semantic_index = None
+        self.inflight_queries: Dict[str, asyncio.Future] = {}
+        self.coalesced_queries = 0
+        self._feed_queue = None
+        self._feed_lock = asyncio.Lock()
         self.logger = logger  # Use the module-level logger
         
         # Add CORS middleware
@@ -122,13 +144,145 @@ class AtlasService(BaseService):
                 self.logger.error(f"Error in health check: {str(e)}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.get("/metrics/processing")
+        async def processing_metrics(group_by: str = "service", hours: Optional[int] = 24):
+            """Aggregate LLM usage per service, thinking type or hour"""
+            since = datetime.utcnow() - timedelta(hours=hours) if hours else None
+            try:
+                summary = await SystemLogger.get_processing_metrics_summary(group_by, since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return {"group_by": group_by, "since": since.isoformat() if since else None, "metrics": summary}
+
+        @self.app.get("/conversations/{conversation_id}/critical-path")
+        async def conversation_critical_path(conversation_id: int):
+            """Break down where a completed conversation spent its time"""
+            report = await critical_path_report(conversation_id)
+            if not report["stages"]:
+                raise HTTPException(status_code=404, detail=f"No messages for conversation {conversation_id}")
+            return report
+
+        @self.app.get("/conversations/{conversation_id}/prefix-cache")
+        async def conversation_prefix_cache(conversation_id: int):
+            """Share of prompt tokens reusable from the backend's prefix cache"""
+            report = await prefix_cache_report(conversation_id)
+            if not report["operations"]:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No prefix measurements for conversation {conversation_id} (set MEASURE_PROMPT_PREFIX=true)"
+                )
+            return report
+
+        def parking_lot(service_name: str) -> ParkingLot:
+            template = SERVICE_TEMPLATES.get(service_name.lower())
+            if not template:
+                raise HTTPException(status_code=404, detail=f"Unknown service: {service_name}")
+            if not self.messaging or not self.messaging.channel:
+                raise HTTPException(status_code=503, detail="Messaging not initialized")
+            return ParkingLot(self.messaging.channel, template.messaging_config.queue_name)
+
+        @self.app.get("/dead-letters/{service_name}")
+        async def list_dead_letters(service_name: str, limit: int = 50):
+            """Parked messages of a service queue, oldest first"""
+            lot = parking_lot(service_name)
+            return {"service": service_name, "parked": await lot.count(), "messages": await lot.list(limit)}
+
+        @self.app.post("/dead-letters/{service_name}/replay")
+        async def replay_dead_letters(service_name: str, limit: Optional[int] = None):
+            """Send parked messages back to their service queue"""
+            return {"service": service_name, "replayed": await parking_lot(service_name).replay(limit)}
+
+        @self.app.delete("/dead-letters/{service_name}")
+        async def purge_dead_letters(service_name: str):
+            """Drop a service queue's parked messages"""
+            return {"service": service_name, "purged": await parking_lot(service_name).purge()}
+
         @self.app.post("/query")
-        async def handle_query(request: dict):
+        async def handle_query(request: dict, cache_control: Optional[str] = Header(None)):
+            if self.draining:
+                raise HTTPException(status_code=503, detail="Atlas is draining for a restart; retry shortly")
             try:
-                return await self.handle_user_query(request["content"])
+                priority = parse_priority(request.get("priority"), default=PRIORITY_LEVELS["interactive"])
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            try:
+                # Cache-Control header or "cache" field: no-cache re-runs the query, no-store also keeps it out of the cache
+                return await self.handle_user_query(request["content"], priority, request.get("cache") or cache_control)
             except Exception as e:
                 logger.error(f"Error handling query: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
+
+        @self.app.get("/cache/stats")
+        async def cache_stats():
+            """Result cache hit rate and the model time it saved"""
+            stats = {"enabled": self.result_cache is not None, **(self.result_cache.stats() if self.result_cache else {})}
+            stats["coalesced_queries"] = self.coalesced_queries
+            if self._semantic() is not None:
+                stats["semantic"] = self._semantic().stats()
+            return stats
+
+        @self.app.delete("/cache")
+        async def clear_cache():
+            """Drop every cached result"""
+            cleared = {"cleared": self.result_cache.clear() if self.result_cache else 0}
+            if self._semantic() is not None:
+                cleared["semantic_cleared"] = self._semantic().clear()
+            return cleared
+
+        @self.app.post("/batch")
+        async def start_batch(request: dict):
+            """Run a JSONL file of queries at batch priority; the output file doubles as the resume point"""
+            if self.draining:
+                raise HTTPException(status_code=503, detail="Atlas is draining for a restart; retry shortly")
+            if "input" not in request or "output" not in request:
+                raise HTTPException(status_code=400, detail="input and output paths are required")
+            # Clients only name files under BATCH_DIR, never arbitrary paths on the host
+            try:
+                input_path = resolve_batch_path(str(request["input"]), SYSTEM_CONFIG['batch_dir'])
+                output_path = resolve_batch_path(str(request["output"]), SYSTEM_CONFIG['batch_dir'])
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if not input_path.is_file():
+                raise HTTPException(status_code=404, detail=f"No such input file: {request['input']}")
+            return self.start_batch(
+                str(input_path), str(output_path), request.get("concurrency"), request.get("rate"), request.get("field")
+            )
+
+        @self.app.get("/batch/{batch_id}")
+        async def batch_progress(batch_id: str):
+            """Progress of a batch run"""
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                raise HTTPException(status_code=404, detail=f"Unknown batch: {batch_id}")
+            return {**{key: value for key, value in batch.items() if key != "runner"}, "progress": batch["runner"].progress}
+
+        @self.app.get("/events")
+        async def event_stream(request: Request, correlation_id: Optional[str] = None, conversation_id: Optional[int] = None):
+            """Server-sent events for conversation progress, optionally for one query"""
+            await self._ensure_event_feed()
+            subscriber = self.event_feed.subscribe(correlation_id, conversation_id)
+
+            async def stream():
+                try:
+                    while not await request.is_disconnected():
+                        event = await subscriber.next(timeout=15)
+                        if event is None:
+                            yield ": keep-alive\n\n"
+                            continue
+                        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                finally:
+                    self.event_feed.unsubscribe(subscriber)
+
+            return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+        @self.app.get("/query/{correlation_id}")
+        async def query_result(correlation_id: str, wait: float = 0):
+            """Result of a submitted query; long-polls up to wait seconds while it runs"""
+            wait = min(max(wait, 0), SYSTEM_CONFIG['query_poll_timeout'])
+            result = await self.get_query_result(correlation_id, wait)
+            if result is None:
+                raise HTTPException(status_code=404, detail=f"Unknown query: {correlation_id}")
+            return result
                 
     # Atlas service implementation
     async def process_message(self, message: dict) -> None:
@@ -148,39 +302,117 @@ class AtlasService(BaseService):
             self.logger.error(f"Error querying model: {str(e)}")
             raise
 
-    async def handle_user_query(self, query: str):
-        """Handle incoming user query"""
+    async def handle_user_query(self, query: str, priority: Optional[int] = None, cache_control: Optional[str] = None):
+        """Accept a user query and start processing it in the background"""
+        if priority is not None:
+            # Every message of the query's tree inherits this priority
+            set_priority(priority)
+        self._evict_finished_queries()
+        directives = cache_directives(cache_control)
+        related = None
+        if directives & {NO_CACHE, NO_STORE}:
+            if self.result_cache is not None:
+                self.result_cache.bypassed += 1
+        else:
+            cached = self.result_cache.get(query) if self.result_cache is not None else None
+            if cached is not None:
+                self.logger.info(f"Answering from the result cache (query of {cached['correlation_id']})")
+                return {
+                    "status": "complete",
+                    "cached": True,
+                    "correlation_id": cached["correlation_id"],
+                    "conversation_id": cached["conversation_id"],
+                    "query": query,
+                    "final_response": cached["final_response"],
+                    "cached_at": cached["created_at"],
+                    "result_url": f"/query/{cached['correlation_id']}"
+                }
+            # Only an exact match is answered from cache: near-identical text can
+            # ask the opposite question, so a similar query only seeds the run
+            match = self._semantic_lookup(query)
+            if match:
+                related = match[0]
+        if not SYSTEM_CONFIG['request_coalescing'] or directives & {NO_CACHE, NO_STORE}:
+            return await self._start_query(query, directives, related)
+
+        # An identical query already running answers this one too
+        key = f"{current_priority()}:{normalize_query(query)}"
+        start = self.inflight_queries.get(key)
+        if start is not None and self._inflight_expired(start):
+            self.logger.warning("An identical query has run too long to still finish; starting afresh")
+            self.inflight_queries.pop(key, None)
+            start = None
+        if start is not None:
+            self.coalesced_queries += 1
+            self.logger.info("Joining an identical query already in flight")
+            return {**await asyncio.shield(start), "coalesced": True}
+        start = asyncio.ensure_future(self._start_query(query, directives, related, key))
+        self.inflight_queries[key] = start
+        return await asyncio.shield(start)
+
+    async def _start_query(self, query: str, directives: set, related: Optional[Dict[str, Any]] = None,
+                           inflight_key: Optional[str] = None) -> Dict[str, Any]:
+        """Record a new query and start its tree in the background"""
+        correlation_id = f"query_{hash(query + str(time.time()))}"
         try:
-            correlation_id = f"query_{hash(query + str(time.time()))}"
             conversation_id = await SystemLogger.start_conversation(query)
-            
-            # Initialize conversation tracking
-            self.conversations[correlation_id] = {
-                "query": query,
-                "conversation_id": conversation_id,
-                "initial_analysis": None,
-                "branch_responses": {},
-                "status": "processing",
-                "started_at": time.time()
-            }
-            
-            # Generate initial analysis
-            initial_analysis = await self.query_model(
-                self.prompts.initial_analysis(query)
-            )
-            analysis_content = initial_analysis["choices"][0]["message"]["content"]
-            self.conversations[correlation_id]["initial_analysis"] = analysis_content
-            
-            # Log analysis
-            await SystemLogger.log_message(
-                conversation_id=conversation_id,
-                message_type=ThinkingType.ANALYZE.value,
-                source="atlas",
-                destination="self",
-                content=analysis_content,
-                correlation_id=correlation_id,
-                context={"type": "initial_analysis"}
-            )
+        except BaseException:
+            self.inflight_queries.pop(inflight_key, None)
+            raise
+        
+        # Initialize conversation tracking
+        self.conversations[correlation_id] = {
+            "query": query,
+            "conversation_id": conversation_id,
+            "initial_analysis": None,
+            "branch_responses": {},
+            "status": "processing",
+            "priority": current_priority(),
+            "cache_store": NO_STORE not in directives,
+            "seeded_from": related["correlation_id"] if related else None,
+            "inflight_key": inflight_key,
+            "started_at": time.time()
+        }
+        self.query_events[correlation_id] = asyncio.Event()
+        
+        # The tree takes minutes; clients fetch the result from GET /query/{correlation_id}
+        task = asyncio.create_task(self._process_user_query(query, conversation_id, correlation_id, related))
+        self.query_tasks.add(task)
+        task.add_done_callback(self.query_tasks.discard)
+        
+        return {
+            "status": "processing",
+            "message": "Query received and processing",
+            "correlation_id": correlation_id,
+            "conversation_id": conversation_id,
+            "query": query,
+            "result_url": f"/query/{correlation_id}"
+        }
+
+    async def _process_user_query(self, query: str, conversation_id: int, correlation_id: str, related: Optional[Dict[str, Any]] = None):
+        """Run the initial analysis and delegate to the branches"""
+        try:
+            set_prompt_context(PromptContext(query, correlation_id=correlation_id))
+            async with track_operation("atlas", ThinkingType.ANALYZE):
+                # Generate initial analysis
+                initial_analysis = await self.query_model(
+                    self.prompts.initial_analysis(related["query"], related["final_response"]) if related
+                    else self.prompts.initial_analysis()
+                )
+                analysis_content = initial_analysis["choices"][0]["message"]["content"]
+                self.conversations[correlation_id]["initial_analysis"] = analysis_content
+                set_prompt_context(PromptContext(query, analysis_content, correlation_id))
+                
+                # Log analysis
+                await SystemLogger.log_message(
+                    conversation_id=conversation_id,
+                    message_type=ThinkingType.ANALYZE.value,
+                    source="atlas",
+                    destination="self",
+                    content=analysis_content,
+                    correlation_id=correlation_id,
+                    context={"type": "initial_analysis"}
+                )
             
             # Branch-specific guidance
             branch_guidance = {
@@ -189,6 +421,7 @@ class AtlasService(BaseService):
             }
             
             # Delegate to branches with analysis and guidance
+            delegated = 0
             for branch in ['nova', 'sage']:
                 try:
                     # Create message context with analysis and guidance
@@ -235,26 +468,176 @@ class AtlasService(BaseService):
                     
                     if not success:
                         self.logger.warning(f"Failed to delegate to {branch}")
+                    else:
+                        delegated += 1
                     
                 except Exception as e:
                     self.logger.error(f"Error delegating to {branch}: {e}")
                     continue
             
-            return {
-                "status": "processing",
-                "message": "Query received and processing",
-                "correlation_id": correlation_id,
-                "conversation_id": conversation_id,
-                "query": query,
-                "initial_analysis": analysis_content,
-                "delegated_to": ["nova", "sage"]
-            }
+            if not delegated:
+                # No branch will ever answer; fail now rather than hold the query open
+                raise RuntimeError("No branch accepted the delegation")
             
         except Exception as e:
             self.logger.error(f"Error in handle_user_query: {str(e)}")
-            if 'conversation_id' in locals():
-                await SystemLogger.end_conversation(conversation_id, "failed")
-            raise
+            await SystemLogger.end_conversation(conversation_id, "failed")
+            self._finish_query(correlation_id, "failed", str(e))
+
+    def start_batch(self, input_path: str, output_path: str, concurrency: Optional[int] = None,
+                    rate: Optional[float] = None, field: Optional[str] = None) -> Dict[str, Any]:
+        """Start a batch run in the background and return its id"""
+        async def submit(content: str) -> str:
+            if self.draining:
+                # Recorded as failed; rerunning the batch picks it up again
+                raise RuntimeError("Atlas is draining for a restart")
+            result = await self.handle_user_query(content, PRIORITY_LEVELS["batch"])
+            return result["correlation_id"]
+
+        runner = BatchRunner(submit, self.get_query_result, concurrency=concurrency, rate=rate)
+        batch_id = f"batch_{int(time.time() * 1000)}"
+        batch = {"batch_id": batch_id, "input": input_path, "output": output_path, "status": "running", "runner": runner}
+        self.batches[batch_id] = batch
+
+        async def run():
+            try:
+                await runner.run(input_path, output_path, field)
+                batch["status"] = "complete"
+            except Exception as e:
+                self.logger.error(f"Batch {batch_id} failed: {e}")
+                batch["status"] = "failed"
+                batch["error"] = str(e)
+
+        task = asyncio.create_task(run())
+        self.query_tasks.add(task)
+        task.add_done_callback(self.query_tasks.discard)
+        return {"batch_id": batch_id, "status": "running", "output": output_path}
+
+    async def _ensure_event_feed(self):
+        """Subscribe to every message on the bus once the first client connects"""
+        async with self._feed_lock:
+            if self._feed_queue is None:
+                self._feed_queue = await self.messaging.consume_all(
+                    self.event_feed.publish, max_length=SYSTEM_CONFIG['event_buffer_size'] * 10
+                )
+
+    def _overdue(self, conversation: Dict[str, Any]) -> bool:
+        """Whether a query has been processing longer than any query may take"""
+        started_at = conversation.get("started_at")
+        return (
+            conversation.get("status") == "processing" and started_at is not None
+            and time.time() - started_at > SYSTEM_CONFIG['batch_query_timeout']
+        )
+
+    def _inflight_expired(self, start: asyncio.Future) -> bool:
+        """Whether an identical query in flight is gone or will never finish"""
+        if not start.done() or start.cancelled() or start.exception():
+            return False  # still starting; a failed start already dropped its key
+        conversation = self.conversations.get(start.result()["correlation_id"])
+        if conversation is None:
+            return True
+        if self._overdue(conversation):
+            # Should it finish after all, it must not release its successor's key
+            conversation["inflight_key"] = None
+            return True
+        return False
+
+    def _finish_query(self, correlation_id: str, status: str, error: Optional[str] = None):
+        """Record a query's outcome and wake its long-polling clients"""
+        conversation = self.conversations.get(correlation_id)
+        if conversation:
+            conversation["status"] = status
+            conversation["finished_at"] = time.time()
+            # Identical queries from now on start afresh (or hit the result cache)
+            self.inflight_queries.pop(conversation.get("inflight_key"), None)
+            if error:
+                conversation["error"] = error
+            emit_status(status, "atlas", correlation_id, conversation["conversation_id"], content=error or conversation.get("final_response"))
+        event = self.query_events.get(correlation_id)
+        if event:
+            event.set()
+
+    def pending_work(self) -> int:
+        """Messages in hand plus queries still waiting on their branches"""
+        # Overdue queries will not finish, so a drain does not wait for them
+        processing = sum(
+            1 for conversation in self.conversations.values()
+            if conversation.get("status") == "processing" and not self._overdue(conversation)
+        )
+        return super().pending_work() + processing
+
+    def _semantic(self):
+        """The paraphrase index, opened on first use"""
+        if self._semantic_index is None and SYSTEM_CONFIG['semantic_cache']:
+            from core.cache.semantic import SemanticIndex  # pulls in NumPy
+            self._semantic_index = SemanticIndex(SYSTEM_CONFIG['semantic_cache_dir'] or None)
+        return self._semantic_index
+
+    def _semantic_lookup(self, query: str):
+        """Closest earlier query worth seeding from, with its similarity"""
+        index = self._semantic()
+        if index is None:
+            return None
+        return index.lookup(query, SYSTEM_CONFIG['semantic_seed_threshold'], ttl=SYSTEM_CONFIG['result_cache_ttl'])
+
+    async def _cache_result(self, correlation_id: str):
+        """Keep a completed query's final synthesis for repeats of the same question"""
+        conversation = self.conversations.get(correlation_id)
+        if not conversation or not conversation.get("cache_store", True):
+            return
+        if self.result_cache is None and self._semantic() is None:
+            return
+        if any(str(response).startswith("Error:") for response in conversation["branch_responses"].values()):
+            return  # a partial answer; let the next ask try again
+        try:
+            await MetricsRecorder.flush()
+            llm_seconds = await SystemLogger.get_query_model_seconds(correlation_id)
+        except Exception as e:
+            self.logger.warning(f"Could not read model time of {correlation_id}: {e}")
+            llm_seconds = None
+        result = {
+            "correlation_id": correlation_id,
+            "conversation_id": conversation["conversation_id"],
+            "final_response": conversation["final_response"],
+            "llm_seconds": llm_seconds
+        }
+        if self.result_cache is not None:
+            self.result_cache.put(conversation["query"], result)
+        if self._semantic() is not None:
+            self._semantic().add(conversation["query"], result)
+
+    def _evict_finished_queries(self):
+        """Drop finished queries from memory; their results stay in message_logs"""
+        cutoff = time.time() - SYSTEM_CONFIG['query_result_ttl']
+        for correlation_id, conversation in list(self.conversations.items()):
+            if conversation.get("finished_at", cutoff + 1) < cutoff:
+                del self.conversations[correlation_id]
+                self.query_events.pop(correlation_id, None)
+
+    async def get_query_result(self, correlation_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """A query's state, waiting up to wait seconds for it to finish"""
+        conversation = self.conversations.get(correlation_id)
+        if conversation is None:
+            # Finished long ago or submitted to an earlier Atlas process
+            return await SystemLogger.get_query_result(correlation_id)
+        event = self.query_events.get(correlation_id)
+        if wait > 0 and event and not event.is_set():
+            try:
+                await asyncio.wait_for(event.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+        return {
+            "correlation_id": correlation_id,
+            "conversation_id": conversation["conversation_id"],
+            "status": conversation["status"],
+            "query": conversation["query"],
+            "priority": conversation.get("priority"),
+            "initial_analysis": conversation["initial_analysis"],
+            "branch_responses": dict(conversation["branch_responses"]),
+            "final_response": conversation.get("final_response"),
+            "error": conversation.get("error"),
+            "elapsed": round(conversation.get("finished_at", time.time()) - conversation["started_at"], 3)
+        }
 
     async def initialize(self):
         """Initialize service components"""
@@ -327,26 +710,28 @@ class AtlasService(BaseService):
                 
                 # Generate final synthesis
                 self.logger.info("Atlas: Starting final synthesis of Nova and Sage responses")
+                set_prompt_context(PromptContext(
+                    conversation["query"], conversation["initial_analysis"], correlation_id
+                ))
                 synthesis_prompt = self.prompts.final_synthesis(
-                    query=conversation["query"],
-                    atlas_analysis=conversation["initial_analysis"],
                     nova_response=conversation["branch_responses"].get("nova", ""),
                     sage_response=conversation["branch_responses"].get("sage", "")
                 )
                 
-                synthesis_result = await self.query_model(synthesis_prompt)
-                final_synthesis = synthesis_result["choices"][0]["message"]["content"]
-                
-                # Log the synthesis
-                await SystemLogger.log_message(
-                    conversation_id=conversation["conversation_id"],
-                    message_type=ThinkingType.SYNTHESIZE.value,
-                    source="atlas",
-                    destination="internal",
-                    content=final_synthesis,
-                    correlation_id=correlation_id,
-                    context={"type": "final_synthesis"}
-                )
+                async with track_operation("atlas", ThinkingType.SYNTHESIZE):
+                    synthesis_result = await self.query_model(synthesis_prompt)
+                    final_synthesis = synthesis_result["choices"][0]["message"]["content"]
+                    
+                    # Log the synthesis
+                    await SystemLogger.log_message(
+                        conversation_id=conversation["conversation_id"],
+                        message_type=ThinkingType.SYNTHESIZE.value,
+                        source="atlas",
+                        destination="internal",
+                        content=final_synthesis,
+                        correlation_id=correlation_id,
+                        context={"type": "final_synthesis"}
+                    )
                 
                 # Wait before storing final response
                 self.logger.info("Atlas: Waiting 5 seconds before storing final response")
@@ -355,8 +740,9 @@ class AtlasService(BaseService):
                 # Store and log final response
                 self.logger.info("Atlas: Storing final response")
                 conversation["final_response"] = final_synthesis
-                conversation["status"] = "complete"
                 await SystemLogger.end_conversation(conversation["conversation_id"], "complete")
+                self._finish_query(correlation_id, "complete")
+                await self._cache_result(correlation_id)
                 
         except Exception as e:
             self.logger.error(f"Error handling response: {str(e)}")
@@ -384,6 +770,7 @@ class AtlasService(BaseService):
                     conversation["conversation_id"],
                     "failed"
                 )
+                self._finish_query(msg.correlation_id, "failed", str(e))
 
     async def publish_message(self, queue: str, message: Dict[str, Any]):
         """Publish message with validation"""
@@ -1,33 +1,28 @@
+from core.prompts.budget import PromptSection, fit_prompt, reflection_sections
+from core.prompts.fused import fused_instructions
+
 class EchoPrompts:
     """Prompts for Echo pattern recognition service"""
-    
-    def pattern_analysis(self, content: str, nova_analysis: str = None) -> str:
-        """Generate prompt for pattern analysis"""
-        if nova_analysis:
-            return f"""As Echo, I specialize in pattern recognition. I've received the following query:
-{content}
 
-Nova's Technical Analysis:
-{nova_analysis}
+    # The query and Atlas's analysis are part of the shared prompt prefix
+    # (core/prompts/layout.py) and are not repeated here.
 
-Please provide a detailed pattern analysis, focusing on:
+    def pattern_analysis(self, content: str = None, nova_analysis: str = None) -> str:
+        """Generate prompt for pattern analysis of the query, or of content when given"""
+        return fit_prompt("echo", [
+            PromptSection("As Echo, I specialize in pattern recognition.", required=True),
+            PromptSection(f"Nova's Technical Analysis:\n{nova_analysis}" if nova_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection("""Please provide a detailed pattern analysis, focusing on:
 1. Recurring patterns and motifs
 2. Structural similarities
 3. Pattern hierarchies
-4. Emergent behaviors"""
-        else:
-            return f"""As Echo, I specialize in pattern recognition. I've received the following query:
-{content}
-
-Please provide a detailed pattern analysis, focusing on:
-1. Recurring patterns and motifs
-2. Structural similarities
-3. Pattern hierarchies
-4. Emergent behaviors"""
+4. Emergent behaviors""", required=True)
+        ])
 
     def pattern_reflection(self, content: str) -> str:
         """Generate prompt for pattern reflection"""
-        return f"""Based on the previous pattern analysis:
+        return f"""As Echo, based on the previous pattern analysis:
 {content}
 
 Please reflect on:
@@ -38,7 +33,7 @@ Please reflect on:
 
     def pattern_critique(self, content: str) -> str:
         """Generate prompt for pattern critique"""
-        return f"""Based on the previous reflection:
+        return f"""As Echo, based on the previous reflection:
 {content}
 
 Please provide a pattern-focused critique focusing on:
@@ -49,7 +44,7 @@ Please provide a pattern-focused critique focusing on:
 
     def pattern_integration(self, content: str) -> str:
         """Generate prompt for pattern integration"""
-        return f"""Based on the previous analysis, reflection, and critique:
+        return f"""As Echo, based on the previous analysis, reflection, and critique:
 {content}
 
 Please provide an integrated pattern perspective that:
@@ -58,6 +53,15 @@ Please provide an integrated pattern perspective that:
 3. Provides meaningful pattern understanding
 4. Suggests directions for further pattern exploration"""
 
+    def fused_thinking(self, content: str = None, nova_analysis: str = None) -> str:
+        """Generate a single prompt for analysis, reflection, critique and integration"""
+        return fit_prompt("echo", [
+            PromptSection("As Echo, I specialize in pattern recognition.", required=True),
+            PromptSection(f"Nova's Technical Analysis:\n{nova_analysis}" if nova_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection(fused_instructions("pattern"), required=True)
+        ])
+
     @staticmethod
     def reflect_on_patterns(previous_analysis: str, depth: int) -> str:
         return f"""As Echo, reflect on your pattern analysis (Reflection Level {depth}):
@@ -73,11 +77,10 @@ Analysis: {analysis}
 Provide a concise critique (2–3 sentences) focusing on pattern completeness and validity."""
 
     @staticmethod
-    def synthesis(query: str, echo_analysis: str, reflections: list = None) -> str:
-        reflection_text = "\n".join([f"Reflection {i+1}: {r}" for i, r in enumerate(reflections or [])])
-        return f"""As Echo, synthesize your pattern recognition insights.
-Original Query: {query}
-Your Pattern Analysis: {echo_analysis}
-{reflection_text if reflections else ''}
-
-Provide a concise synthesis (2–3 sentences) that integrates all pattern insights."""
+    def synthesis(echo_analysis: str, reflections: list = None) -> str:
+        return fit_prompt("echo", [
+            PromptSection("As Echo, synthesize your pattern recognition insights.", required=True),
+            PromptSection(f"Your Pattern Analysis: {echo_analysis}", priority=1),
+            *reflection_sections(reflections),
+            PromptSection("Provide a concise synthesis (2–3 sentences) that integrates all pattern insights.", required=True)
+        ])
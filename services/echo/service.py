@@ -11,10 +11,11 @@ from core.templates import ServiceTemplate
 from config.services import SERVICE_TEMPLATES
 from core.validation import MessageValidator
 from services.echo.prompts import EchoPrompts
+from core.prompts.layout import PromptContext, set_prompt_context, stage_material
 from core.messaging.service_messaging import ServiceMessaging
 from core.messaging.types import MessageType
+from core.messaging.retry import RetryLater
 from core.logging.system_logger import SystemLogger
-from config.timing import DELAY_BETWEEN_LLM_CALLS, DELAY_ECHO_STARTUP
 from database.models import ThinkingType
 
 # Configure logging
@@ -83,73 +84,41 @@ class EchoService(BaseService):
             conversation_id = message["conversation_id"]
             correlation_id = message["correlation_id"]
             
-            #-----------------------------------------------------------------
-            # Echo Service Processing Flow
-            #-----------------------------------------------------------------
-            try:
-                #-----------------------------------------------------------------
-                # 1. Initial Analysis
-                #-----------------------------------------------------------------
-                self.logger.info("Echo: Starting initial pattern analysis")
-                analysis_result = await self.analyze(
-                    message,
-                    conversation_id,
-                    correlation_id,
-                    context={
-                        "type": "pattern_analysis",
-                        "additional_context": {
-                            "original_query": original_query
-                        }
+            # Every prompt of this conversation starts with the query and Atlas's analysis
+            set_prompt_context(PromptContext.from_message(message))
+            
+            nova_analysis = self.extract_parent_analysis(message, "nova")
+            step_contexts = {
+                "analyze": {
+                    "type": "pattern_analysis",
+                    "additional_context": {
+                        "original_query": original_query,
+                        "nova_analysis": nova_analysis
                     }
-                )
-                
-                #-----------------------------------------------------------------
-                # 2. Reflection
-                #-----------------------------------------------------------------
-                self.logger.info("Echo: Starting reflection on patterns")
-                reflection_result = await self.reflect(
-                    analysis_result["content"],
-                    conversation_id,
-                    correlation_id,
-                    context={"type": "pattern_reflection"},
-                    destination="self"
-                )
-                
-                #-----------------------------------------------------------------
-                # 3. Analysis of Reflection
-                #-----------------------------------------------------------------
-                self.logger.info("Echo: Starting recurring patterns analysis")
-                pattern_result = await self.analyze(
-                    {"content": reflection_result["content"]},
-                    conversation_id,
-                    correlation_id,
-                    context={"type": "recurring_patterns"}
-                )
-                
-                #-----------------------------------------------------------------
-                # 4. Integration of Findings
-                #-----------------------------------------------------------------
-                self.logger.info("Echo: Starting integration of findings")
-                integration_result = await self.integrate(
-                    pattern_result["content"],
-                    conversation_id,
-                    correlation_id,
-                    context={"type": "pattern_integration"},
-                    destination="self"
-                )
-                
-                #-----------------------------------------------------------------
-                # 5. Response
-                #-----------------------------------------------------------------
-                self.logger.info("Echo: Sending final response to Nova")
-                await self.respond(
-                    integration_result["content"],
-                    conversation_id,
-                    correlation_id,
-                    context={"type": "final_response"},
-                    destination=message.get("source", "nova")
-                )
+                },
+                "reflect": {"type": "pattern_reflection"},
+                "analyze_2": {"type": "recurring_patterns"},
+                "critique": {"type": "pattern_critique"},
+                "integrate": {"type": "pattern_integration"},
+                "respond": {"type": "final_response"}
+            }
+            respond_to = message.get("source", "nova")
+            
+            try:
+                if self.template.fused_thinking:
+                    # One LLM call returning every thinking step as a labeled section
+                    await self.run_fused(message, self.prompts.fused_thinking(
+                        content=stage_material(original_query),
+                        nova_analysis=nova_analysis
+                    ), step_contexts, respond_to)
+                else:
+                    # Run the "leaf" pattern declared in the service template:
+                    # analyze -> reflect -> analyze -> integrate -> respond
+                    await self.run_pattern(message, original_query, step_contexts, respond_to)
                 
+            except RetryLater:
+                # Retried from the broker after a delay
+                raise
             except Exception as e:
                 self.logger.error(f"Error processing message in Echo service: {str(e)}")
                 await self._send_error_response(conversation_id, correlation_id, e, message)
@@ -222,30 +191,26 @@ class EchoService(BaseService):
             self.logger.error(f"Error sending response: {e}")
             raise
 
-    async def analyze(self, message, conversation_id, correlation_id, context=None):
+    async def analyze(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Perform pattern analysis"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_ECHO_STARTUP)  # Startup delay for Echo service
-            
-            content = message["content"] if isinstance(message, dict) else message
-            
             # Inherit the standard thinking process logging
             result = await super().analyze(
-                content,
-                conversation_id,
-                correlation_id,
-                context or {}
+                content=content,
+                conversation_id=conversation_id,
+                correlation_id=correlation_id,
+                context=context,
+                destination=destination
             )
             
-            # Get Nova analysis to incorporate
-            nova_analysis = ""
-            if isinstance(message, dict):
-                nova_analysis = self.extract_parent_analysis(message, "nova")
+            # Get nova_analysis from context if available
+            nova_analysis = None
+            if context and "additional_context" in context:
+                nova_analysis = context.get("additional_context", {}).get("nova_analysis")
             
             # Call LLM for pattern recognition analysis
             prompt = self.prompts.pattern_analysis(
-                content=content,
+                content=stage_material(content),
                 nova_analysis=nova_analysis
             )
             
@@ -260,19 +225,17 @@ class EchoService(BaseService):
                 analysis_content = f"{{\"echo_analysis\": {json.dumps(llm_response)}}}"
                 result["content"] = analysis_content
                 
+            except RetryLater:
+                # Retried from the broker after a delay
+                raise
             except Exception as e:
                 self.logger.error(f"Error calling LLM in Echo analyze: {str(e)}")
                 result["content"] = json.dumps({"echo_analysis": "Error generating analysis"})
                 
-            # Add delay between LLM calls to prevent rate limiting
-            await asyncio.sleep(DELAY_BETWEEN_LLM_CALLS)
-            
             return result
             
         except Exception as e:
             self.logger.error(f"Error in Echo analyze: {str(e)}")
-            if isinstance(message, dict):
-                await self._send_error_response(conversation_id, correlation_id, e, message)
             raise
 
     async def reflect(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
@@ -1,39 +1,40 @@
+from core.prompts.budget import PromptSection, fit_prompt, reflection_sections
+
 class NovaPrompts:
     """Prompts for Nova technical analysis service"""
-    
-    def technical_analysis(self, content: str, atlas_analysis: str = None) -> str:
-        """Generate prompt for technical analysis"""
-        if atlas_analysis:
-            return f"""As Nova, I specialize in technical analysis. I've received the following query:
-{content}
 
-Atlas has provided this initial analysis:
-{atlas_analysis}
+    # The query and Atlas's analysis are part of the shared prompt prefix
+    # (core/prompts/layout.py) and are not repeated here.
 
-In 2-3 sentences, provide a focused technical analysis that covers the key technical concepts, principles, and practical applications."""
-        else:
-            return f"""As Nova, I specialize in technical analysis. I've received the following query:
+    def technical_analysis(self, content: str = None) -> str:
+        """Generate prompt for technical analysis of the query, or of content when given"""
+        if content:
+            return f"""As Nova, I specialize in technical analysis. I've received the following material:
 {content}
 
 In 2-3 sentences, provide a focused technical analysis that covers the key technical concepts, principles, and practical applications."""
+        else:
+            return """As Nova, I specialize in technical analysis.
+
+In 2-3 sentences, provide a focused technical analysis of the query that covers the key technical concepts, principles, and practical applications."""
 
     def technical_reflection(self, content: str) -> str:
         """Generate prompt for technical reflection"""
-        return f"""Based on the previous technical analysis:
+        return f"""As Nova, based on the previous technical analysis:
 {content}
 
 In 2-3 sentences, reflect on the key technical insights and potential limitations or challenges."""
 
     def technical_critique(self, content: str) -> str:
         """Generate prompt for technical critique"""
-        return f"""Based on the previous reflection:
+        return f"""As Nova, based on the previous reflection:
 {content}
 
 In 2-3 sentences, provide a constructive technical critique focusing on completeness, feasibility, and potential risks."""
 
     def technical_integration(self, content: str) -> str:
         """Generate prompt for technical integration"""
-        return f"""Based on the previous analysis, reflection, and critique:
+        return f"""As Nova, based on the previous analysis, reflection, and critique:
 {content}
 
 In 2-3 sentences, provide an integrated technical perspective that synthesizes the key findings and suggests next steps."""
@@ -53,13 +54,12 @@ Analysis: {analysis}
 Provide a constructive critique in 2–3 sentences, emphasizing completeness, feasibility, and potential risks."""
 
     @staticmethod
-    def synthesis(query: str, nova_analysis: str, echo_response: str, pixel_response: str, reflections: list = None) -> str:
-        reflection_text = "\n".join([f"Reflection {i+1}: {r}" for i, r in enumerate(reflections or [])])
-        return f"""As Nova, synthesize the technical insights.
-Original Query: {query}
-Your Technical Analysis: {nova_analysis}
-Implementation Details (Echo): {echo_response}
-Pattern Analysis (Pixel): {pixel_response}
-{reflection_text if reflections else ''}
-
-Provide a cohesive synthesis in 2–3 sentences that integrates all technical insights."""
+    def synthesis(nova_analysis: str, echo_response: str, pixel_response: str, reflections: list = None) -> str:
+        return fit_prompt("nova", [
+            PromptSection("As Nova, synthesize the technical insights.", required=True),
+            PromptSection(f"Your Technical Analysis: {nova_analysis}", priority=2),
+            PromptSection(f"Implementation Details (Echo): {echo_response}", priority=1),
+            PromptSection(f"Pattern Analysis (Pixel): {pixel_response}", priority=1),
+            *reflection_sections(reflections),
+            PromptSection("Provide a cohesive synthesis in 2–3 sentences that integrates all technical insights.", required=True)
+        ])
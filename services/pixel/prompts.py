@@ -1,33 +1,28 @@
+from core.prompts.budget import PromptSection, fit_prompt, reflection_sections
+from core.prompts.fused import fused_instructions
+
 class PixelPrompts:
     """Prompts for Pixel visual analysis service"""
-    
-    def visual_analysis(self, content: str, nova_analysis: str = None) -> str:
-        """Generate prompt for visual analysis"""
-        if nova_analysis:
-            return f"""As Pixel, I specialize in visual analysis. I've received the following query:
-{content}
 
-Nova's Technical Analysis:
-{nova_analysis}
+    # The query and Atlas's analysis are part of the shared prompt prefix
+    # (core/prompts/layout.py) and are not repeated here.
 
-Please provide a detailed visual analysis, focusing on:
+    def visual_analysis(self, content: str = None, nova_analysis: str = None) -> str:
+        """Generate prompt for visual analysis of the query, or of content when given"""
+        return fit_prompt("pixel", [
+            PromptSection("As Pixel, I specialize in visual analysis.", required=True),
+            PromptSection(f"Nova's Technical Analysis:\n{nova_analysis}" if nova_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection("""Please provide a detailed visual analysis, focusing on:
 1. Visual elements and composition
 2. Spatial relationships
 3. Visual hierarchies
-4. Visual metaphors and symbolism"""
-        else:
-            return f"""As Pixel, I specialize in visual analysis. I've received the following query:
-{content}
-
-Please provide a detailed visual analysis, focusing on:
-1. Visual elements and composition
-2. Spatial relationships
-3. Visual hierarchies
-4. Visual metaphors and symbolism"""
+4. Visual metaphors and symbolism""", required=True)
+        ])
 
     def visual_reflection(self, content: str) -> str:
         """Generate prompt for visual reflection"""
-        return f"""Based on the previous visual analysis:
+        return f"""As Pixel, based on the previous visual analysis:
 {content}
 
 Please reflect on:
@@ -38,7 +33,7 @@ Please reflect on:
 
     def visual_critique(self, content: str) -> str:
         """Generate prompt for visual critique"""
-        return f"""Based on the previous reflection:
+        return f"""As Pixel, based on the previous reflection:
 {content}
 
 Please provide a visual-focused critique focusing on:
@@ -49,7 +44,7 @@ Please provide a visual-focused critique focusing on:
 
     def visual_integration(self, content: str) -> str:
         """Generate prompt for visual integration"""
-        return f"""Based on the previous analysis, reflection, and critique:
+        return f"""As Pixel, based on the previous analysis, reflection, and critique:
 {content}
 
 Please provide an integrated visual perspective that:
@@ -58,6 +53,15 @@ Please provide an integrated visual perspective that:
 3. Provides meaningful visual understanding
 4. Suggests directions for further visual exploration"""
 
+    def fused_thinking(self, content: str = None, nova_analysis: str = None) -> str:
+        """Generate a single prompt for analysis, reflection, critique and integration"""
+        return fit_prompt("pixel", [
+            PromptSection("As Pixel, I specialize in visual analysis.", required=True),
+            PromptSection(f"Nova's Technical Analysis:\n{nova_analysis}" if nova_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection(fused_instructions("visual"), required=True)
+        ])
+
     @staticmethod
     def reflect_on_visuals(previous_analysis: str, depth: int) -> str:
         return f"""As Pixel, reflect on your visual analysis (Reflection Level {depth}):
@@ -73,11 +77,10 @@ Analysis: {analysis}
 Provide a concise critique (2–3 sentences) focusing on visual effectiveness and clarity."""
 
     @staticmethod
-    def synthesis(query: str, pixel_analysis: str, reflections: list = None) -> str:
-        reflection_text = "\n".join([f"Reflection {i+1}: {r}" for i, r in enumerate(reflections or [])])
-        return f"""As Pixel, synthesize your visual insights.
-Original Query: {query}
-Your Visual Analysis: {pixel_analysis}
-{reflection_text if reflections else ''}
-
-Provide a concise synthesis (2–3 sentences) that integrates all visual insights."""
+    def synthesis(pixel_analysis: str, reflections: list = None) -> str:
+        return fit_prompt("pixel", [
+            PromptSection("As Pixel, synthesize your visual insights.", required=True),
+            PromptSection(f"Your Visual Analysis: {pixel_analysis}", priority=1),
+            *reflection_sections(reflections),
+            PromptSection("Provide a concise synthesis (2–3 sentences) that integrates all visual insights.", required=True)
+        ])
@@ -11,10 +11,11 @@ from core.templates import ServiceTemplate
 from config.services import SERVICE_TEMPLATES
 from core.validation import MessageValidator
 from services.pixel.prompts import PixelPrompts
+from core.prompts.layout import PromptContext, set_prompt_context, stage_material
 from core.messaging.service_messaging import ServiceMessaging
 from core.messaging.types import MessageType
+from core.messaging.retry import RetryLater
 from core.logging.system_logger import SystemLogger
-from config.timing import DELAY_BETWEEN_LLM_CALLS, DELAY_PIXEL_STARTUP
 from database.models import ThinkingType
 
 # Configure logging
@@ -119,98 +120,39 @@ class PixelService(BaseService):
             if not nova_analysis and "context" in message and "additional_context" in message["context"]:
                 nova_analysis = message["context"]["additional_context"].get("nova_analysis", "")
             
-            #-----------------------------------------------------------------
-            # TIMING STRATEGY: Sequential Processing with Sibling Services
-            #-----------------------------------------------------------------
-            # The system implements a timing strategy that ensures services
-            # at the same level (e.g., Echo, Pixel) process in sequence:
-            #
-            # 1. Initial delay ensures this service starts processing after 
-            #    its sibling service (Echo) has had time to begin its work
-            # 2. Deliberate delays between each LLM call to:
-            #    - Prevent overloading the LLM service
-            #    - Create sequential processing across the entire system
-            #
-            # This layered timing approach creates a clean sequence of:
-            # Nova -> Echo (multiple steps) -> Pixel (multiple steps)
-            #-----------------------------------------------------------------
+            # Every prompt of this conversation starts with the query and Atlas's analysis
+            set_prompt_context(PromptContext.from_message(message))
             
-            # Initial delay to ensure sequential processing after Echo
-            self.logger.info("Pixel: Initial delay to ensure sequential processing after Echo")
-            await asyncio.sleep(5)
-            
-            # Step 1: Visual analysis
-            self.logger.info("Pixel: Starting initial visual analysis")
-            analysis_result = await self.analyze(
-                content=original_query,
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={
+            step_contexts = {
+                "analyze": {
                     "type": "visual_analysis",
                     "additional_context": {
                         "nova_analysis": nova_analysis,
                         "branch_guidance": branch_guidance
                     }
                 },
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Pixel: Waiting 10 seconds before reflection step")
-            await asyncio.sleep(10)
-            
-            # Step 2: Reflect on the visual elements
-            self.logger.info("Pixel: Starting reflection on visual elements")
-            reflection_result = await self.reflect(
-                content=analysis_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "visual_reflection"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Pixel: Waiting 10 seconds before spatial analysis")
-            await asyncio.sleep(10)
-            
-            # Step 3: Analyze spatial relationships
-            self.logger.info("Pixel: Starting spatial relationship analysis")
-            spatial_result = await self.analyze(
-                content=reflection_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "spatial_analysis"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Pixel: Waiting 10 seconds before integration step")
-            await asyncio.sleep(10)
-            
-            # Step 4: Integrate findings
-            self.logger.info("Pixel: Starting integration of findings")
-            integration_result = await self.integrate(
-                content=spatial_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "visual_integration"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before sending final response
-            self.logger.info("Pixel: Waiting 10 seconds before sending response to Nova")
-            await asyncio.sleep(10)
-            
-            # Step 5: Send final response back to parent service
-            self.logger.info("Pixel: Sending final response to Nova")
-            await self.respond(
-                content=integration_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "final_response"},
-                destination=message.get("source", "nova")
-            )
+                "reflect": {"type": "visual_reflection"},
+                "analyze_2": {"type": "spatial_analysis"},
+                "critique": {"type": "visual_critique"},
+                "integrate": {"type": "visual_integration"},
+                "respond": {"type": "final_response"}
+            }
+            respond_to = message.get("source", "nova")
             
+            if self.template.fused_thinking:
+                # One LLM call returning every thinking step as a labeled section
+                await self.run_fused(message, self.prompts.fused_thinking(
+                    content=stage_material(original_query),
+                    nova_analysis=nova_analysis
+                ), step_contexts, respond_to)
+            else:
+                # Run the "leaf" pattern declared in the service template:
+                # analyze -> reflect -> analyze -> integrate -> respond
+                await self.run_pattern(message, original_query, step_contexts, respond_to)
+            
+        except RetryLater:
+            # Retried from the broker after a delay
+            raise
         except Exception as e:
             self.logger.error(f"Error processing message in Pixel service: {str(e)}")
             await self._send_error_response(message, str(e))
@@ -269,9 +211,6 @@ class PixelService(BaseService):
     async def analyze(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Perform visual analysis"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_PIXEL_STARTUP)  # Startup delay for Pixel service
-            
             # Inherit the standard thinking process logging
             result = await super().analyze(
                 content=content, 
@@ -289,7 +228,7 @@ class PixelService(BaseService):
             # Generate analysis using LLM and visual-specific prompt
             analysis_result = await self.query_model(
                 self.prompts.visual_analysis(
-                    content=content,
+                    content=stage_material(content),
                     nova_analysis=nova_analysis
                 )
             )
@@ -299,9 +238,6 @@ class PixelService(BaseService):
                 analysis_content = analysis_result["choices"][0]["message"]["content"]
                 result["content"] = analysis_content
             
-            # Add delay between LLM calls to prevent rate limiting
-            await asyncio.sleep(DELAY_BETWEEN_LLM_CALLS)
-            
             return result
             
         except Exception as e:
@@ -1,33 +1,28 @@
+from core.prompts.budget import PromptSection, fit_prompt, reflection_sections
+from core.prompts.fused import fused_instructions
+
 class QuantumPrompts:
     """Prompts for Quantum probabilistic reasoning service"""
-    
-    def probabilistic_analysis(self, content: str, sage_analysis: str = None) -> str:
-        """Generate prompt for probabilistic analysis"""
-        if sage_analysis:
-            return f"""As Quantum, I specialize in probabilistic reasoning. I've received the following query:
-{content}
 
-Sage's Philosophical Analysis:
-{sage_analysis}
+    # The query and Atlas's analysis are part of the shared prompt prefix
+    # (core/prompts/layout.py) and are not repeated here.
 
-Please provide a detailed probabilistic analysis, focusing on:
+    def probabilistic_analysis(self, content: str = None, sage_analysis: str = None) -> str:
+        """Generate prompt for probabilistic analysis of the query, or of content when given"""
+        return fit_prompt("quantum", [
+            PromptSection("As Quantum, I specialize in probabilistic reasoning.", required=True),
+            PromptSection(f"Sage's Philosophical Analysis:\n{sage_analysis}" if sage_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection("""Please provide a detailed probabilistic analysis, focusing on:
 1. Uncertainty quantification
 2. Probabilistic relationships
 3. Alternative possibilities
-4. Decision spaces"""
-        else:
-            return f"""As Quantum, I specialize in probabilistic reasoning. I've received the following query:
-{content}
-
-Please provide a detailed probabilistic analysis, focusing on:
-1. Uncertainty quantification
-2. Probabilistic relationships
-3. Alternative possibilities
-4. Decision spaces"""
+4. Decision spaces""", required=True)
+        ])
 
     def probabilistic_reflection(self, content: str) -> str:
         """Generate prompt for probabilistic reflection"""
-        return f"""Based on the previous probabilistic analysis:
+        return f"""As Quantum, based on the previous probabilistic analysis:
 {content}
 
 Please reflect on:
@@ -38,7 +33,7 @@ Please reflect on:
 
     def probabilistic_critique(self, content: str) -> str:
         """Generate prompt for probabilistic critique"""
-        return f"""Based on the previous reflection:
+        return f"""As Quantum, based on the previous reflection:
 {content}
 
 Please provide a probability-focused critique focusing on:
@@ -49,7 +44,7 @@ Please provide a probability-focused critique focusing on:
 
     def probabilistic_integration(self, content: str) -> str:
         """Generate prompt for probabilistic integration"""
-        return f"""Based on the previous analysis, reflection, and critique:
+        return f"""As Quantum, based on the previous analysis, reflection, and critique:
 {content}
 
 Please provide an integrated probabilistic perspective that:
@@ -58,6 +53,15 @@ Please provide an integrated probabilistic perspective that:
 3. Provides meaningful probabilistic understanding
 4. Suggests directions for further exploration"""
 
+    def fused_thinking(self, content: str = None, sage_analysis: str = None) -> str:
+        """Generate a single prompt for analysis, reflection, critique and integration"""
+        return fit_prompt("quantum", [
+            PromptSection("As Quantum, I specialize in probabilistic reasoning.", required=True),
+            PromptSection(f"Sage's Philosophical Analysis:\n{sage_analysis}" if sage_analysis else "", priority=1),
+            PromptSection(f"I've received the following material:\n{content}" if content else "", priority=2),
+            PromptSection(fused_instructions("probabilistic"), required=True)
+        ])
+
     @staticmethod
     def reflect_on_probabilities(previous_analysis: str, depth: int) -> str:
         return f"""As Quantum, reflect on your probabilistic analysis (Reflection Level {depth}):
@@ -73,11 +77,10 @@ Analysis: {analysis}
 Provide a concise critique (2–3 sentences) focusing on uncertainty handling and completeness."""
 
     @staticmethod
-    def synthesis(query: str, quantum_analysis: str, reflections: list = None) -> str:
-        reflection_text = "\n".join([f"Reflection {i+1}: {r}" for i, r in enumerate(reflections or [])])
-        return f"""As Quantum, synthesize your probabilistic insights.
-Original Query: {query}
-Your Probabilistic Analysis: {quantum_analysis}
-{reflection_text if reflections else ''}
-
-Provide a concise synthesis (2–3 sentences) that integrates all probabilistic insights."""
+    def synthesis(quantum_analysis: str, reflections: list = None) -> str:
+        return fit_prompt("quantum", [
+            PromptSection("As Quantum, synthesize your probabilistic insights.", required=True),
+            PromptSection(f"Your Probabilistic Analysis: {quantum_analysis}", priority=1),
+            *reflection_sections(reflections),
+            PromptSection("Provide a concise synthesis (2–3 sentences) that integrates all probabilistic insights.", required=True)
+        ])
@@ -11,10 +11,11 @@ from core.templates import ServiceTemplate
 from config.services import SERVICE_TEMPLATES
 from core.validation import MessageValidator
 from services.quantum.prompts import QuantumPrompts
+from core.prompts.layout import PromptContext, set_prompt_context, stage_material
 from core.messaging.service_messaging import ServiceMessaging
 from core.messaging.types import MessageType
+from core.messaging.retry import RetryLater
 from core.logging.system_logger import SystemLogger
-from config.timing import DELAY_BETWEEN_LLM_CALLS, DELAY_QUANTUM_STARTUP
 from database.models import ThinkingType
 
 # Configure logging
@@ -88,102 +89,39 @@ class QuantumService(BaseService):
             if not sage_analysis and "context" in message and "additional_context" in message["context"]:
                 sage_analysis = message["context"]["additional_context"].get("sage_analysis", "")
             
-            #-----------------------------------------------------------------
-            # TIMING STRATEGY: System-Wide Sequential Processing
-            #-----------------------------------------------------------------
-            # The system implements a carefully orchestrated timing strategy 
-            # that ensures services process in a clean sequence:
-            #
-            # 1. Top-level services (Atlas) begin first
-            # 2. Second-level services (Nova, Sage) process in sequence
-            # 3. Third-level services (Echo, Pixel, Quantum) process in sequence
-            #    with deliberate delays between each service
-            #
-            # This service (Quantum) is scheduled to start after both Echo 
-            # and Pixel have had time to process, creating this sequence:
-            # 
-            # Atlas -> Nova -> Sage -> Echo -> Pixel -> Quantum
-            #
-            # Within each service, additional delays between thinking steps 
-            # ensure the LLM isn't overwhelmed with concurrent requests.
-            #-----------------------------------------------------------------
+            # Every prompt of this conversation starts with the query and Atlas's analysis
+            set_prompt_context(PromptContext.from_message(message))
             
-            # Initial delay to ensure sequential processing after both Echo and Pixel
-            self.logger.info("Quantum: Initial delay to ensure sequential processing after Echo and Pixel")
-            await asyncio.sleep(10)
-            
-            # Step 1: Probabilistic analysis
-            self.logger.info("Quantum: Starting initial probabilistic analysis")
-            analysis_result = await self.analyze(
-                content=original_query,
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={
+            step_contexts = {
+                "analyze": {
                     "type": "probabilistic_analysis",
                     "additional_context": {
                         "sage_analysis": sage_analysis,
                         "branch_guidance": branch_guidance
                     }
                 },
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Quantum: Waiting 10 seconds before reflection step")
-            await asyncio.sleep(10)
-            
-            # Step 2: Reflect on uncertainties
-            self.logger.info("Quantum: Starting reflection on uncertainties")
-            reflection_result = await self.reflect(
-                content=analysis_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "uncertainty_reflection"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Quantum: Waiting 10 seconds before quantum analysis")
-            await asyncio.sleep(10)
-            
-            # Step 3: Analyze quantum aspects
-            self.logger.info("Quantum: Starting quantum aspects analysis")
-            quantum_result = await self.analyze(
-                content=reflection_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "quantum_analysis"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before next LLM call
-            self.logger.info("Quantum: Waiting 10 seconds before integration step")
-            await asyncio.sleep(10)
-            
-            # Step 4: Integrate findings
-            self.logger.info("Quantum: Starting integration of findings")
-            integration_result = await self.integrate(
-                content=quantum_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "quantum_integration"},
-                destination="self"
-            )
-            
-            # Wait 10 seconds before sending final response
-            self.logger.info("Quantum: Waiting 10 seconds before sending response to Sage")
-            await asyncio.sleep(10)
-            
-            # Step 5: Send final response back to parent service
-            self.logger.info("Quantum: Sending final response to Sage")
-            await self.respond(
-                content=integration_result["content"],
-                conversation_id=message["conversation_id"],
-                correlation_id=message["correlation_id"],
-                context={"type": "final_response"},
-                destination=message.get("source", "sage")
-            )
-            
+                "reflect": {"type": "uncertainty_reflection"},
+                "analyze_2": {"type": "quantum_analysis"},
+                "critique": {"type": "uncertainty_critique"},
+                "integrate": {"type": "quantum_integration"},
+                "respond": {"type": "final_response"}
+            }
+            respond_to = message.get("source", "sage")
+            
+            if self.template.fused_thinking:
+                # One LLM call returning every thinking step as a labeled section
+                await self.run_fused(message, self.prompts.fused_thinking(
+                    content=stage_material(original_query),
+                    sage_analysis=sage_analysis
+                ), step_contexts, respond_to)
+            else:
+                # Run the "leaf" pattern declared in the service template:
+                # analyze -> reflect -> analyze -> integrate -> respond
+                await self.run_pattern(message, original_query, step_contexts, respond_to)
+            
+        except RetryLater:
+            # Retried from the broker after a delay
+            raise
         except Exception as e:
             self.logger.error(f"Error processing message in Quantum service: {str(e)}")
             await self._send_error_response(message, str(e))
@@ -273,9 +211,6 @@ class QuantumService(BaseService):
     async def analyze(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Perform probabilistic analysis"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_QUANTUM_STARTUP)  # Startup delay for Quantum service
-            
             # Inherit the standard thinking process logging
             result = await super().analyze(
                 content=content, 
@@ -285,9 +220,17 @@ class QuantumService(BaseService):
                 destination=destination   # Pass destination separately
             )
             
+            # Get sage_analysis from context if available
+            sage_analysis = None
+            if context and "additional_context" in context:
+                sage_analysis = context.get("additional_context", {}).get("sage_analysis")
+            
             # Generate analysis using LLM
             analysis_result = await self.query_model(
-                self.prompts.probabilistic_analysis(content)
+                self.prompts.probabilistic_analysis(
+                    content=stage_material(content),
+                    sage_analysis=sage_analysis
+                )
             )
             
             # Extract the content from the LLM response
@@ -295,9 +238,6 @@ class QuantumService(BaseService):
                 analysis_content = analysis_result["choices"][0]["message"]["content"]
                 result["content"] = analysis_content
             
-            # Add delay between LLM calls to prevent rate limiting
-            await asyncio.sleep(DELAY_BETWEEN_LLM_CALLS)
-            
             return result
             
         except Exception as e:
@@ -307,9 +247,6 @@ class QuantumService(BaseService):
     async def reflect(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Reflect on probabilistic aspects"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_QUANTUM_STARTUP)  # Startup delay for Quantum service
-            
             # Inherit the standard thinking process logging
             result = await super().reflect(
                 content=content, 
@@ -329,9 +266,6 @@ class QuantumService(BaseService):
                 reflection_content = reflection_result["choices"][0]["message"]["content"]
                 result["content"] = reflection_content
             
-            # Add delay between LLM calls to prevent rate limiting
-            await asyncio.sleep(DELAY_BETWEEN_LLM_CALLS)
-            
             return result
             
         except Exception as e:
@@ -341,9 +275,6 @@ class QuantumService(BaseService):
     async def critique(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Critique probabilistic analysis"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_QUANTUM_STARTUP)  # Startup delay for Quantum service
-            
             # Inherit the standard thinking process logging
             result = await super().critique(
                 content=content, 
@@ -363,9 +294,6 @@ class QuantumService(BaseService):
                 critique_content = critique_result["choices"][0]["message"]["content"]
                 result["content"] = critique_content
             
-            # Add delay between LLM calls to prevent rate limiting
-            await asyncio.sleep(DELAY_BETWEEN_LLM_CALLS)
-            
             return result
             
         except Exception as e:
@@ -375,9 +303,6 @@ class QuantumService(BaseService):
     async def integrate(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Integrate probabilistic findings"""
         try:
-            # Add delay to prevent LLM overload
-            await asyncio.sleep(DELAY_QUANTUM_STARTUP)  # Startup delay for Quantum service
-            
             # Inherit the standard thinking process logging
             result = await super().integrate(
                 content=content, 
@@ -11,8 +11,10 @@ from core.templates import ServiceTemplate
 from config.services import SERVICE_TEMPLATES
 from core.validation import MessageValidator
 from services.sage.prompts import SagePrompts
+from core.prompts.layout import PromptContext, set_prompt_context, stage_material
 from core.messaging.service_messaging import ServiceMessaging
 from core.messaging.types import MessageType
+from core.messaging.retry import RetryLater
 from core.logging.system_logger import SystemLogger
 from core.thinking.types import ThinkingType
 from config.timing import DELAY_BETWEEN_LLM_CALLS, DELAY_BEFORE_SYNTHESIS
@@ -30,7 +32,6 @@ class SageService(BaseService):
         # Initialize service-specific components
         self.validator = MessageValidator()
         self.prompts = SagePrompts()
-        self.reflection_depth = 3
         self.logger = logger  # Use the module-level logger
         
         # Add CORS middleware
@@ -59,6 +60,11 @@ class SageService(BaseService):
                 "capabilities": self.template.capabilities
             }
 
+    def pending_work(self) -> int:
+        """Messages in hand plus delegations still waiting on the leaves"""
+        tracking = getattr(self, 'delegation_tracking', {})
+        return super().pending_work() + sum(1 for entry in tracking.values() if entry["status"] == "processing")
+
     async def process_message(self, message: dict) -> None:
         """Process incoming messages"""
         try:
@@ -96,6 +102,9 @@ class SageService(BaseService):
                 atlas_analysis = ""
                 branch_guidance = ""
             
+            # Every prompt of this conversation starts with the query and Atlas's analysis
+            set_prompt_context(PromptContext.from_message(message))
+            
             #-----------------------------------------------------------------
             # TIMING STRATEGY: Coordinated Branch Processing
             #-----------------------------------------------------------------
@@ -148,6 +157,7 @@ class SageService(BaseService):
             # Create enhanced content with Sage's analysis for Quantum
             enhanced_content = {
                 "original_query": original_query,
+                "atlas_analysis": atlas_analysis,
                 "sage_analysis": sage_analysis,  # Include Sage's analysis
                 "branch_guidance": branch_guidance
             }
@@ -162,6 +172,9 @@ class SageService(BaseService):
                 context=context
             )
             
+        except RetryLater:
+            # Retried from the broker after a delay
+            raise
         except Exception as e:
             self.logger.error(f"Error processing message in Sage service: {str(e)}")
             await self._send_error_response(message, str(e))
@@ -230,8 +243,8 @@ class SageService(BaseService):
                 
                 # Synthesize responses with Quantum's input
                 self.logger.info("Sage: Starting synthesis with Quantum's input")
+                set_prompt_context(PromptContext.from_message(original_message))
                 synthesis_result = await self.synthesize(
-                    query=original_message["content"],
                     sage_analysis=sage_analysis,
                     quantum_response=tracking["branch_responses"]["quantum"],
                     conversation_id=original_message["conversation_id"],
@@ -255,19 +268,21 @@ class SageService(BaseService):
                 # Clean up tracking
                 tracking["status"] = "complete"
             
+        except RetryLater:
+            # Retried from the broker after a delay
+            raise
         except Exception as e:
             self.logger.error(f"Error handling sub-service response: {str(e)}")
             # Try to send error response if we have original message
             if 'tracking' in locals() and 'original_message' in tracking:
                 await self._send_error_response(tracking["original_message"], str(e))
 
-    async def synthesize(self, query: str, sage_analysis: str, quantum_response: str, conversation_id: str, correlation_id: str):
+    async def synthesize(self, sage_analysis: str, quantum_response: str, conversation_id: str, correlation_id: str):
         """Synthesize responses from sub-services"""
         try:
             # Generate synthesis using LLM
             synthesis_result = await self.query_model(
                 self.prompts.synthesis(
-                    query=query,
                     sage_analysis=sage_analysis,
                     quantum_response=quantum_response
                 )
@@ -365,17 +380,9 @@ class SageService(BaseService):
     async def analyze(self, content: str, conversation_id: str, correlation_id: str, context: dict = None, destination: str = "self"):
         """Perform philosophical analysis"""
         try:
-            # Get atlas_analysis from context if available
-            atlas_analysis = None
-            if context and "additional_context" in context:
-                atlas_analysis = context.get("additional_context", {}).get("atlas_analysis")
-            
-            # Generate analysis using LLM
+            # Generate analysis using LLM; Atlas's analysis is in the shared prompt prefix
             analysis_result = await self.query_model(
-                self.prompts.philosophical_analysis(
-                    content=content,
-                    atlas_analysis=atlas_analysis
-                )
+                self.prompts.philosophical_analysis(content=stage_material(content))
             )
             analysis_content = analysis_result["choices"][0]["message"]["content"]
             
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import pytest
+from core.batch.runner import BatchRunner, resolve_batch_path
+
+class FakeAtlas:
+    """Answers queries instantly; fails the ones containing 'fail'"""
+
+    def __init__(self):
+        self.submitted = []
+
+    async def submit(self, content):
+        self.submitted.append(content)
+        return f"query_{len(self.submitted)}"
+
+    async def fetch(self, correlation_id, wait):
+        index = int(correlation_id.split("_")[1]) - 1
+        if index >= len(self.submitted):
+            return None
+        content = self.submitted[index]
+        if "fail" in content:
+            return {"status": "failed", "error": "boom", "conversation_id": 1}
+        return {"status": "complete", "final_response": f"answer to {content}", "conversation_id": 1, "elapsed": 0.1}
+
+def write_input(path, lines):
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+def test_batch_writes_results_and_resume_skips_completed(tmp_path):
+    source = tmp_path / "queries.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_input(source, [{"id": "a", "content": "one"}, {"request_id": "b", "body": "please fail"}, {"query": "three"}])
+
+    atlas = FakeAtlas()
+    progress = asyncio.run(BatchRunner(atlas.submit, atlas.fetch, concurrency=2, rate=0).run(str(source), str(output)))
+    records = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+    assert progress["complete"] == 2 and progress["failed"] == 1
+    assert records["a"]["final_response"] == "answer to one"
+    assert records["b"]["status"] == "failed" and records["b"]["error"] == "boom"
+    assert records["3"]["status"] == "complete"
+
+    # A rerun only retries what did not complete
+    rerun = FakeAtlas()
+    progress = asyncio.run(BatchRunner(rerun.submit, rerun.fetch, concurrency=2, rate=0).run(str(source), str(output)))
+    assert progress["skipped"] == 2 and rerun.submitted == ["please fail"]
+
+def test_resume_waits_on_queries_submitted_before_a_crash(tmp_path):
+    source = tmp_path / "queries.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_input(source, [{"id": "a", "content": "one"}])
+    (tmp_path / "results.jsonl.checkpoint").write_text(json.dumps({"a": "query_1"}))
+
+    atlas = FakeAtlas()
+    atlas.submitted.append("one")  # submitted by the crashed run
+    asyncio.run(BatchRunner(atlas.submit, atlas.fetch, rate=0).run(str(source), str(output)))
+    assert atlas.submitted == ["one"]
+    assert json.loads(output.read_text())["correlation_id"] == "query_1"
+
+def test_batch_paths_stay_inside_the_batch_directory(tmp_path):
+    batch_dir = tmp_path / "batches"
+    batch_dir.mkdir()
+    (batch_dir / "escape").symlink_to(tmp_path)
+    assert resolve_batch_path("runs/results.jsonl", str(batch_dir)) == batch_dir.resolve() / "runs" / "results.jsonl"
+    for path in ["/etc/passwd", "../secrets.jsonl", "runs/../../secrets.jsonl", "escape/secrets.jsonl", "", "."]:
+        with pytest.raises(ValueError):
+            resolve_batch_path(path, str(batch_dir))
@@ -0,0 +1,69 @@
+import asyncio
+import httpx
+import pytest
+from config.settings import SYSTEM_CONFIG
+from core.llm.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from core.llm.router import LLMRouter
+from core.messaging.retry import retry_delays
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window_seconds=60, open_seconds=30, clock=clock)
+
+    for outcome in (True, False, True, False):
+        breaker.acquire()
+        breaker.record_success() if outcome else breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    clock.now = 31
+    breaker.acquire()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.available()  # one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 62
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED and breaker.available()
+
+def test_old_failures_leave_the_window():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=3, window_seconds=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 11
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+def test_router_fails_fast_when_every_backend_circuit_is_open(tmp_path):
+    path = tmp_path / "llm_routing.yaml"
+    path.write_text("backends:\n  - name: only\n    base_url: http://llm/v1\nroutes:\n  - model: phi-3\n")
+    router = LLMRouter(str(path))
+    backend = router.backends["only"]
+
+    async def fail():
+        async with router.dispatch(backend):
+            raise httpx.ConnectError("refused")
+
+    for _ in range(SYSTEM_CONFIG['llm_breaker_min_calls']):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(fail())
+    assert backend.breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        router.select("echo", "analyze")
+
+def test_retry_delays_repeat_the_last_delay(monkeypatch):
+    monkeypatch.setitem(SYSTEM_CONFIG, 'retry_delays', [5, 20])
+    monkeypatch.setitem(SYSTEM_CONFIG, 'max_retries', 4)
+    assert retry_delays() == [5, 20, 20, 20]
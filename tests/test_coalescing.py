@@ -0,0 +1,117 @@
+import asyncio
+import time
+import pytest
+from config.settings import SYSTEM_CONFIG
+from config.services import SERVICE_TEMPLATES
+from core.llm.coalescing import SingleFlight
+from services.atlas.service import AtlasService
+
+def test_concurrent_identical_calls_share_one_result_and_error():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.02)
+            if value == "bad":
+                raise ValueError("backend down")
+            return value
+
+        results = await asyncio.gather(*(flight.do("k", lambda: work("ok")) for _ in range(3)))
+        errors = await asyncio.gather(*(flight.do("e", lambda: work("bad")) for _ in range(2)), return_exceptions=True)
+        return flight, calls, results, errors
+
+    flight, calls, results, errors = asyncio.run(scenario())
+    assert results == ["ok"] * 3 and calls == ["ok", "bad"]
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.stats()["coalesced"] == 3 and flight.stats()["in_flight"] == 0
+
+def test_shared_call_is_cancelled_only_when_every_waiter_leaves():
+    async def scenario():
+        flight = SingleFlight()
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+
+        third = asyncio.ensure_future(flight.do("j", work))
+        await asyncio.sleep(0.01)
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        await asyncio.sleep(0.06)
+        return flight, finished, result
+
+    flight, finished, result = asyncio.run(scenario())
+    assert result == "done" and finished == [True]
+    assert flight.abandoned == 1
+
+def test_atlas_joins_identical_queries_in_flight(monkeypatch):
+    async def scenario():
+        atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+        atlas.result_cache = None
+        atlas._semantic_index = None
+        monkeypatch.setitem(SYSTEM_CONFIG, "semantic_cache", False)
+        started = []
+
+        async def start(query, directives, related=None, inflight_key=None):
+            started.append(query)
+            await asyncio.sleep(0.01)
+            atlas.conversations["query_1"] = {"inflight_key": inflight_key, "conversation_id": 1}
+            return {"status": "processing", "correlation_id": "query_1", "conversation_id": 1}
+
+        atlas._start_query = start
+        responses = await asyncio.gather(
+            atlas.handle_user_query("What is a thread?"),
+            atlas.handle_user_query("what is a THREAD"),
+        )
+        atlas._finish_query("query_1", "complete")
+        return atlas, started, responses
+
+    atlas, started, responses = asyncio.run(scenario())
+    assert len(started) == 1 and atlas.coalesced_queries == 1
+    assert {response["correlation_id"] for response in responses} == {"query_1"}
+    assert responses[1]["coalesced"] and not atlas.inflight_queries
+
+def test_atlas_starts_afresh_when_the_identical_query_never_finishes(monkeypatch):
+    async def scenario():
+        atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+        atlas.result_cache = None
+        atlas._semantic_index = None
+        monkeypatch.setitem(SYSTEM_CONFIG, "semantic_cache", False)
+        monkeypatch.setitem(SYSTEM_CONFIG, "batch_query_timeout", 60)
+        started = []
+
+        async def start(query, directives, related=None, inflight_key=None):
+            started.append(query)
+            correlation_id = f"query_{len(started)}"
+            # The first query's branches never answer
+            atlas.conversations[correlation_id] = {
+                "inflight_key": inflight_key, "conversation_id": len(started),
+                "status": "processing", "started_at": time.time() - (120 if len(started) == 1 else 0)
+            }
+            return {"status": "processing", "correlation_id": correlation_id, "conversation_id": len(started)}
+
+        atlas._start_query = start
+        first = await atlas.handle_user_query("What is a thread?")
+        second = await atlas.handle_user_query("what is a THREAD")
+        third = await atlas.handle_user_query("What is a thread?")
+        # The stuck query finishing late leaves the new one's key alone
+        atlas._finish_query("query_1", "failed", "timed out")
+        return atlas, started, first, second, third
+
+    atlas, started, first, second, third = asyncio.run(scenario())
+    assert len(started) == 2
+    assert (first["correlation_id"], second["correlation_id"]) == ("query_1", "query_2")
+    assert "coalesced" not in second
+    assert third["correlation_id"] == "query_2" and third["coalesced"]
+    assert len(atlas.inflight_queries) == 1
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from core.analysis.critical_path import analyze_conversation
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+def at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+def message(id, source, destination, message_type, seconds):
+    return {
+        "id": id,
+        "source": source,
+        "destination": destination,
+        "message_type": message_type,
+        "timestamp": at(seconds),
+        "correlation_id": "query_1"
+    }
+
+def metric(message_id, start, wall_time, model_time):
+    return {
+        "message_id": message_id,
+        "timestamp": at(start),
+        "processing_time": model_time,
+        "wall_time": wall_time,
+        "tokens_used": 100
+    }
+
+PARENTS = {"nova": "atlas", "echo": "nova"}
+
+def test_critical_path_splits_model_idle_and_queueing():
+    messages = [
+        message(1, "atlas", "self", "analyze", 4),
+        message(2, "atlas", "nova", "delegate", 5),
+        message(3, "nova", "self", "analyze", 20),
+        message(4, "echo", "self", "analyze", 40),
+        message(5, "echo", "nova", "respond", 41),
+        message(6, "nova", "atlas", "synthesize", 60),
+    ]
+    metrics = [
+        metric(1, 0, 4, 3),
+        metric(3, 10, 10, 4),
+        metric(4, 30, 10, 5),
+        metric(6, 50, 10, 6),
+    ]
+
+    report = analyze_conversation(messages, metrics, PARENTS)
+
+    stages = [s["stage"] for s in report["critical_path"]]
+    assert stages == [
+        "atlas.analyze", "atlas.delegate", "nova.analyze",
+        "echo.analyze", "echo.respond", "nova.synthesize"
+    ]
+    assert report["total_seconds"] == 60
+    breakdown = report["critical_path_breakdown"]
+    assert breakdown["model"] == 18
+    # Waiting on the broker or another service: delegate->nova, nova->echo, respond->nova
+    assert breakdown["queueing"] == 5 + 10 + 9
+    assert breakdown["idle"] == 1 + 1
+    assert round(sum(breakdown.values()), 6) == report["total_seconds"]
+
+def test_empty_conversation():
+    report = analyze_conversation([], [], PARENTS)
+    assert report["critical_path"] == []
+    assert report["total_seconds"] == 0.0
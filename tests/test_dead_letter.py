@@ -0,0 +1,87 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+from config.settings import SYSTEM_CONFIG
+from core.messaging.dead_letter import (
+    REDELIVERY_COUNT_HEADER, PARKED_REASON_HEADER, StartedMarkers, parking_queue_name, queue_arguments,
+    redeliver_or_park, replay_headers
+)
+from core.messaging.retry import RETRY_COUNT_HEADER
+from core.messaging.service_messaging import ServiceMessaging
+from core.templates import MessagingConfig
+
+class FakeExchange:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        self.published.append((routing_key, message))
+
+def fake_message(headers=None):
+    return SimpleNamespace(body=b'{"type": "analyze"}', headers=headers or {}, content_type="application/json", priority=None)
+
+def test_failed_message_is_redelivered_then_parked():
+    channel = SimpleNamespace(default_exchange=FakeExchange())
+    limit = SYSTEM_CONFIG['max_redeliveries']
+
+    parked = asyncio.run(redeliver_or_park(channel, fake_message(), "echo_queue", "boom"))
+    routing_key, message = channel.default_exchange.published[-1]
+    assert not parked and routing_key == "echo_queue"
+    assert message.headers[REDELIVERY_COUNT_HEADER] == 1
+
+    parked = asyncio.run(redeliver_or_park(channel, fake_message({REDELIVERY_COUNT_HEADER: limit}), "echo_queue", "boom"))
+    routing_key, message = channel.default_exchange.published[-1]
+    assert parked and routing_key == parking_queue_name("echo_queue")
+    assert message.headers[PARKED_REASON_HEADER] == "boom"
+    assert message.body == b'{"type": "analyze"}'
+
+def test_replay_clears_attempt_headers():
+    headers = {REDELIVERY_COUNT_HEADER: 2, RETRY_COUNT_HEADER: 3, PARKED_REASON_HEADER: "boom", "x-death": [], "trace": "t1"}
+    assert replay_headers(headers) == {"trace": "t1"}
+    assert queue_arguments("echo_queue") == {
+        "x-dead-letter-exchange": "echo_queue.dlx",
+        "x-dead-letter-routing-key": "echo_queue"
+    }
+
+def test_only_redeliveries_of_started_messages_are_charged(tmp_path, monkeypatch):
+    monkeypatch.setitem(SYSTEM_CONFIG, "message_state_dir", str(tmp_path))
+    config = MessagingConfig(broker_url="amqp://", exchange="ai_services", queue_prefix="",
+                             queue_name="echo_queue", parent_queue="nova_queue")
+    messaging = ServiceMessaging(config)
+    messaging.channel = SimpleNamespace(default_exchange=FakeExchange())
+    consumers = []
+    messaging.queue = SimpleNamespace(consume=lambda callback: consumers.append(callback) or asyncio.sleep(0))
+    handled = []
+
+    async def handle(body):
+        handled.append(body["content"])
+    messaging.message_handlers["analyze"] = handle
+
+    @contextlib.asynccontextmanager
+    async def processed():
+        yield
+
+    def delivery(content, redelivered):
+        message = SimpleNamespace(
+            body=f'{{"type": "analyze", "content": "{content}"}}'.encode(), headers={}, message_id=None,
+            content_type="application/json", priority=None, redelivered=redelivered
+        )
+        message.process = processed
+        return message
+
+    async def scenario():
+        await messaging.start_consuming()
+        # Prefetched, never started, handed out again after a channel closed
+        await consumers[0](delivery("prefetched", True))
+        # Started by a consumer that then died
+        crashed = delivery("crashed", True)
+        StartedMarkers("echo_queue").start(crashed)
+        await consumers[0](crashed)
+        return crashed
+
+    crashed = asyncio.run(scenario())
+    assert handled == ["prefetched"]
+    routing_key, message = messaging.channel.default_exchange.published[-1]
+    assert len(messaging.channel.default_exchange.published) == 1 and routing_key == "echo_queue"
+    assert message.headers[REDELIVERY_COUNT_HEADER] == 1
+    assert not StartedMarkers("echo_queue").started(crashed) and not any((tmp_path / "echo_queue").iterdir())
@@ -0,0 +1,45 @@
+import asyncio
+import json
+from core.messaging.events import EventFeed, feed_event
+
+def message(message_type, correlation_id, content="", event=None):
+    return {
+        "type": message_type,
+        "content": content,
+        "correlation_id": correlation_id,
+        "conversation_id": 7,
+        "source": "nova",
+        "destination": "atlas",
+        "context": {"event": event} if event else {}
+    }
+
+def test_feed_filters_by_query_and_skips_other_traffic():
+    async def scenario():
+        feed = EventFeed(buffer_size=10)
+        mine = feed.subscribe(correlation_id="q1")
+        everything = feed.subscribe()
+        await feed.publish(message("status", "q1", "thinking", event="reflect"))
+        await feed.publish(message("respond", "q2", "other query"))
+        await feed.publish(message("analyze", "q1"))  # not a feed type
+        return [await mine.next(0.01) for _ in range(2)], [await everything.next(0.01) for _ in range(3)]
+
+    mine, everything = asyncio.run(scenario())
+    assert mine[0]["event"] == "reflect" and mine[0]["content"] == "thinking"
+    assert mine[1] is None
+    assert [e and e["correlation_id"] for e in everything] == ["q1", "q2", None]
+
+def test_slow_client_loses_oldest_events_and_is_told():
+    async def scenario():
+        feed = EventFeed(buffer_size=2)
+        slow = feed.subscribe()
+        for i in range(5):
+            await feed.publish(message("status", "q1", f"step {i}", event="analyze"))
+        return await slow.next(0.01), await slow.next(0.01)
+
+    first, second = asyncio.run(scenario())
+    assert first["content"] == "step 3" and first["dropped"] == 3
+    assert second["content"] == "step 4" and "dropped" not in second
+
+def test_delegation_events_show_the_guidance_only():
+    delegation = message("delegate", "q1", json.dumps({"original_query": "q", "branch_guidance": "Focus on ethics"}))
+    assert feed_event(delegation)["content"] == "Focus on ethics"
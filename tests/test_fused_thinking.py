@@ -0,0 +1,33 @@
+from core.prompts.fused import parse_sections
+from services.echo.prompts import EchoPrompts
+
+def test_parse_sections_reads_labeled_sections():
+    response = """**Analysis:** The query describes a layered system.
+It has three levels.
+
+### Reflection
+Each level repeats the same structure.
+CRITIQUE: The analysis ignores failure modes.
+Integration: A recursive pattern with untested failure paths."""
+    sections = parse_sections(response)
+
+    assert sections["analysis"] == "The query describes a layered system.\nIt has three levels."
+    assert sections["reflection"] == "Each level repeats the same structure."
+    assert sections["critique"] == "The analysis ignores failure modes."
+    assert sections["integration"] == "A recursive pattern with untested failure paths."
+
+def test_parse_sections_falls_back_for_missing_labels():
+    assert parse_sections("Analysis of the system shows three levels.\nREFLECTION: Levels repeat.") == {
+        "analysis": "Analysis of the system shows three levels.",
+        "reflection": "Levels repeat.",
+        "critique": "",
+        "integration": "Levels repeat."
+    }
+    unlabeled = parse_sections("Just an answer.")
+    assert unlabeled["analysis"] == unlabeled["integration"] == "Just an answer."
+
+def test_fused_prompt_asks_for_every_section():
+    prompt = EchoPrompts().fused_thinking(nova_analysis="Nova's view")
+    assert "Nova's view" in prompt
+    for label in ("ANALYSIS:", "REFLECTION:", "CRITIQUE:", "INTEGRATION:"):
+        assert label in prompt
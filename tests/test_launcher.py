@@ -0,0 +1,87 @@
+import asyncio
+import time
+from core.launcher import manager as launcher
+from core.launcher.manager import ServiceManager, service_dependencies, startup_waves
+from core.messaging.readiness import READY_EVENT, ReadinessWatcher
+
+STARTUP = {"atlas": 0.1, "nova": 0.1, "sage": 0.2, "echo": 0.1, "pixel": 0.1, "quantum": 0.1}
+
+class FakeProcess:
+    def __init__(self, exit_code=None):
+        self.returncode = exit_code
+        self.exited = asyncio.Event()
+        if exit_code is not None:
+            self.exited.set()
+
+    async def wait(self):
+        await self.exited.wait()
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = 0
+        self.exited.set()
+
+class FakeWatcher(ReadinessWatcher):
+    def __init__(self):
+        super().__init__("amqp://unused", "ai_services")
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+def make_manager(monkeypatch, crash=()):
+    manager = ServiceManager(watcher=FakeWatcher(), start_timeout=2)
+    launched = {}
+
+    async def launch(name):
+        launched[name] = time.perf_counter()
+        if name in crash:
+            return FakeProcess(exit_code=1)
+
+        async def announce():
+            await asyncio.sleep(STARTUP[name])
+            manager.watcher.record({"source": name, "context": {"event": READY_EVENT, "pid": 1}})
+
+        asyncio.get_running_loop().create_task(announce())
+        return FakeProcess()
+
+    async def healthy(port):
+        return True
+
+    monkeypatch.setattr(launcher, "port_in_use", lambda port: False)
+    monkeypatch.setattr(manager, "launch", launch)
+    monkeypatch.setattr(manager, "check_service_health", healthy)
+    return manager, launched
+
+def test_dependencies_follow_the_hierarchy():
+    dependencies = service_dependencies()
+    assert dependencies["atlas"] == [] and dependencies["quantum"] == ["sage"]
+    assert startup_waves(dependencies) == [["atlas"], ["nova", "sage"], ["echo", "pixel", "quantum"]]
+
+def test_independent_services_start_together(monkeypatch):
+    async def scenario():
+        manager, launched = make_manager(monkeypatch)
+        started = time.perf_counter()
+        ok = await manager.start_all(check_infrastructure=False)
+        return ok, launched, time.perf_counter() - started
+
+    ok, launched, elapsed = asyncio.run(scenario())
+    assert ok
+    assert abs(launched["nova"] - launched["sage"]) < 0.05
+    # Echo waits for Nova only, not for the slower Sage
+    assert launched["echo"] < launched["quantum"]
+    # The slowest chain (atlas, sage, quantum) rather than the sum of all six
+    assert elapsed < sum(STARTUP.values())
+
+def test_a_crashed_service_stops_its_dependents(monkeypatch):
+    async def scenario():
+        manager, launched = make_manager(monkeypatch, crash={"nova"})
+        ok = await manager.start_all(check_infrastructure=False)
+        return ok, launched, manager
+
+    ok, launched, manager = asyncio.run(scenario())
+    assert not ok
+    assert "echo" not in launched and "pixel" not in launched
+    assert not manager.processes
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import httpx
+from core.llm.batching import LLMBatcher
+
+def chat_request(text, temperature=0.7):
+    return {
+        "model": "phi-3:4",
+        "messages": [{"role": "system", "content": "shared"}, {"role": "user", "content": text}],
+        "temperature": temperature,
+        "max_tokens": 64,
+        "top_p": 0.9,
+        "cache_prompt": True,
+        "stream": False
+    }
+
+def test_multi_prompt_batches_matching_requests_and_demultiplexes():
+    calls = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        calls.append((request.url.path, body))
+        if request.url.path.endswith("/completions") and "prompt" in body:
+            # Answer in reverse order to check results are matched by index
+            choices = [{"index": i, "text": f"answer to {p.split()[-2]}"} for i, p in enumerate(body["prompt"])]
+            return httpx.Response(200, json={"choices": list(reversed(choices))})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "single " + body["messages"][-1]["content"]}}]})
+
+    async def run():
+        batcher = LLMBatcher("http://llm/v1", mode="multi_prompt", window=0.01, transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(
+            batcher.submit(chat_request("alpha")),
+            batcher.submit(chat_request("beta")),
+            batcher.submit(chat_request("gamma", temperature=0.2))
+        )
+        await batcher.close()
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+    assert [r["choices"][0]["message"]["content"] for r in results] == ["answer to alpha", "answer to beta", "single gamma"]
+    assert sorted(path for path, _ in calls) == ["/v1/chat/completions", "/v1/completions"]
+    assert batcher.batches_sent == 1 and batcher.requests_batched == 3
+
+def test_backend_errors_reach_every_caller_in_the_batch():
+    def handler(request):
+        return httpx.Response(503, text="overloaded")
+
+    async def run():
+        batcher = LLMBatcher("http://llm/v1", mode="concurrent", window=0.01, transport=httpx.MockTransport(handler))
+        return await asyncio.gather(
+            batcher.submit(chat_request("alpha")),
+            batcher.submit(chat_request("beta")),
+            return_exceptions=True
+        )
+
+    errors = asyncio.run(run())
+    assert [getattr(e, "status_code", None) for e in errors] == [503, 503]
@@ -0,0 +1,87 @@
+import asyncio
+from core.llm.hedging import Hedger, LatencyTracker
+
+def test_hedge_wins_when_primary_stalls():
+    hedger = Hedger(enabled=True, percentile=95, min_samples=5)
+    for sample in [0.02] * 18 + [0.1, 1.0]:
+        hedger.tracker.record("echo:reflect", sample)
+
+    cancelled = []
+
+    async def stalled():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("primary")
+            raise
+        return "primary"
+
+    async def fast():
+        await asyncio.sleep(0.01)
+        return "hedge"
+
+    result, hedge_won = asyncio.run(hedger.run("echo:reflect", stalled, fast))
+    assert (result, hedge_won) == ("hedge", True)
+    assert cancelled == ["primary"]
+    assert hedger.stats.to_dict()["hedged"] == 1
+    assert hedger.stats.latency_saved > 0
+
+def test_no_hedge_without_history_or_when_primary_is_fast():
+    hedger = Hedger(enabled=True, percentile=95, min_samples=5)
+    hedge_calls = []
+
+    async def primary():
+        await asyncio.sleep(0.01)
+        return "primary"
+
+    async def hedge():
+        hedge_calls.append(1)
+        return "hedge"
+
+    for _ in range(6):
+        assert asyncio.run(hedger.run("nova:analyze", primary, hedge)) == ("primary", False)
+    assert hedge_calls == []
+    assert hedger.stats.requests == 6 and hedger.stats.hedged == 0
+
+def test_hedge_covers_a_failing_primary():
+    hedger = Hedger(enabled=True, percentile=50, min_samples=1)
+    hedger.tracker.record("sage:analyze", 0.01)
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ConnectionError("slot stalled")
+
+    async def hedge():
+        await asyncio.sleep(0.1)
+        return "hedge"
+
+    assert asyncio.run(hedger.run("sage:analyze", failing, hedge)) == ("hedge", True)
+
+def test_threshold_stays_stable_across_repeated_hedges():
+    hedger = Hedger(enabled=True, percentile=95, min_samples=5)
+    hedger.tracker = LatencyTracker(window=20, min_samples=5)
+    for sample in [0.001] * 18 + [0.05, 0.05]:
+        hedger.tracker.record("nova:analyze", sample)
+
+    async def fast():
+        await asyncio.sleep(0.001)
+        return "primary"
+
+    async def stalled():
+        await asyncio.sleep(5)
+        return "primary"
+
+    async def hedge():
+        await asyncio.sleep(0.005)
+        return "hedge"
+
+    async def rounds():
+        for _ in range(5):
+            for _ in range(9):
+                await hedger.run("nova:analyze", fast, hedge)
+            assert await hedger.run("nova:analyze", stalled, hedge) == ("hedge", True)
+
+    asyncio.run(rounds())
+    # The beaten primaries count as at least as slow as the threshold they crossed
+    assert 0.05 <= hedger.tracker.percentile("nova:analyze", 95) < 0.2
+    assert hedger.stats.hedged == 5
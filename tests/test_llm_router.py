@@ -0,0 +1,66 @@
+import os
+from core.llm.router import LLMRouter
+
+CONFIG = """
+backends:
+  - name: big
+    base_url: http://big:8080/v1
+  - name: small-1
+    base_url: http://small-1:8080/v1
+  - name: small-2
+    base_url: http://small-2:8080/v1
+routes:
+  - services: [atlas]
+    thinking_types: [synthesize]
+    model: large-model
+    backends: [big]
+  - thinking_types: [reflect, critique]
+    model: small-model
+    backends: [small-1, small-2]
+  - model: "phi-3:{slot}"
+    backends: [big]
+"""
+
+def write_config(tmp_path, text):
+    path = tmp_path / "llm_routing.yaml"
+    path.write_text(text)
+    return str(path)
+
+def test_routes_by_service_and_thinking_type(tmp_path):
+    router = LLMRouter(write_config(tmp_path, CONFIG))
+
+    backend, model = router.select("atlas", "synthesize")
+    assert (backend.name, model) == ("big", "large-model")
+    backend, model = router.select("echo", "reflect", slot=4)
+    assert model == "small-model" and backend.name.startswith("small")
+    backend, model = router.select("echo", "analyze", slot=4)
+    assert (backend.name, model) == ("big", "phi-3:4")
+
+def test_balances_by_load_and_skips_unhealthy_backends(tmp_path):
+    router = LLMRouter(write_config(tmp_path, CONFIG))
+    small_1, small_2 = router.backends["small-1"], router.backends["small-2"]
+
+    small_1.in_flight = 2
+    assert router.select("pixel", "critique")[0] is small_2
+    small_1.in_flight, small_2.latency = 0, 5.0
+    assert router.select("pixel", "critique")[0] is small_1
+    small_1.healthy = False
+    assert router.select("pixel", "critique")[0] is small_2
+
+def test_reloads_changed_config_and_keeps_backend_state(tmp_path):
+    path = write_config(tmp_path, CONFIG)
+    router = LLMRouter(path)
+    router.backends["big"].latency = 3.0
+
+    with open(path, "w") as f:
+        f.write(CONFIG.replace('model: "phi-3:{slot}"', 'model: "qwen:{slot}"'))
+    os.utime(path, (0, 12345))
+    router._last_reload_check = 0
+    assert router.select("nova", "analyze", slot=2)[1] == "qwen:2"
+    assert router.backends["big"].latency == 3.0
+
+    with open(path, "w") as f:
+        f.write("routes: [")
+    os.utime(path, (0, 23456))
+    router._last_reload_check = 0
+    assert router.select("nova", "analyze", slot=2)[1] == "qwen:2"
@@ -0,0 +1,55 @@
+from datetime import datetime
+import zstandard
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+from database.archive import MessageArchive, encode_row
+from database.models import Message
+from database.retention import expired_tables
+
+def make_row(message_id, conversation_id, timestamp):
+    return {
+        "id": message_id,
+        "conversation_id": conversation_id,
+        "timestamp": timestamp,
+        "message_type": "analyze",
+        "source": "atlas",
+        "destination": "self",
+        "content": "analysis",
+        "correlation_id": f"query_{conversation_id}",
+        "context": {"processing_stage": "internal"},
+        "processing_details": None,
+        "parent_message_id": None
+    }
+
+def test_expired_tables_keep_retention_window():
+    tables = ["message_logs_2026_06", "message_logs_2026_07", "message_logs_2026_10", "message_logs_default"]
+    assert expired_tables(tables, 3, today=datetime(2026, 10, 19)) == ["message_logs_2026_06"]
+
+def test_archive_returns_conversation_messages(tmp_path):
+    archive = MessageArchive(str(tmp_path))
+    rows = [
+        make_row(2, 7, datetime(2026, 5, 1, 12, 0, 5)),
+        make_row(1, 7, datetime(2026, 5, 1, 12, 0, 0)),
+        make_row(3, 8, datetime(2026, 5, 2))
+    ]
+    with open(tmp_path / "message_logs_2026_05.jsonl.zst", "wb") as fh:
+        with zstandard.ZstdCompressor().stream_writer(fh) as writer:
+            for row in rows:
+                writer.write(encode_row(row))
+    archive.record_partition("message_logs_2026_05", {
+        "file": "message_logs_2026_05.jsonl.zst",
+        "month": "2026-05-01",
+        "rows": 3,
+        "conversation_ids": [7, 8]
+    })
+
+    messages = archive.conversation_messages(7)
+    assert [m.id for m in messages] == [1, 2]
+    assert messages[0].timestamp == datetime(2026, 5, 1, 12, 0, 0)
+    assert messages[0].context == {"processing_stage": "internal"}
+    assert archive.conversation_messages(9) == []
+
+def test_message_id_has_default_with_composite_primary_key():
+    ddl = str(CreateTable(Message.__table__).compile(dialect=postgresql.dialect()))
+    assert "id INTEGER DEFAULT nextval('message_logs_id_seq') NOT NULL" in ddl
+    assert "PRIMARY KEY (id, timestamp)" in ddl
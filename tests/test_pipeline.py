@@ -0,0 +1,77 @@
+import asyncio
+from config.processing import PROCESS_PATTERNS, ReflectionBounds
+from core.analysis.similarity import novelty
+from core.pipeline.convergence import ReflectionChain
+from core.pipeline.engine import PipelineEngine, build_pipeline
+from core.pipeline.store import StepStore
+
+def test_build_pipeline_orders_steps_and_fans_out_delegation():
+    leaf = build_pipeline(PROCESS_PATTERNS["leaf"])
+    assert [step.id for step in leaf] == ["analyze", "reflect", "analyze_2", "integrate", "respond"]
+    assert [step.depends_on for step in leaf][1:] == [["analyze"], ["reflect"], ["analyze_2"], ["integrate"]]
+
+    standard = {step.id: step for step in build_pipeline(PROCESS_PATTERNS["standard"], ["echo", "pixel"])}
+    assert standard["delegate_echo"].depends_on == ["analyze"]
+    assert standard["delegate_pixel"].depends_on == ["analyze"]
+    assert standard["synthesize"].depends_on == ["delegate_echo", "delegate_pixel"]
+
+def test_engine_runs_independent_steps_concurrently():
+    steps = build_pipeline(PROCESS_PATTERNS["standard"], ["echo", "pixel"])
+    running, peak = set(), []
+
+    async def run_step(step, inputs):
+        running.add(step.id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.discard(step.id)
+        return f"{step.id}({','.join(inputs.values())})"
+
+    outputs = asyncio.run(PipelineEngine(steps, run_step).run("query"))
+    assert max(peak) == 2
+    assert outputs["synthesize"] == "synthesize(delegate_echo(analyze(query)),delegate_pixel(analyze(query)))"
+
+def test_engine_resumes_from_persisted_steps(tmp_path):
+    steps = build_pipeline(PROCESS_PATTERNS["leaf"])
+    store = StepStore(str(tmp_path))
+    calls = []
+
+    async def failing_step(step, inputs):
+        calls.append(step.id)
+        if step.id == "integrate":
+            raise RuntimeError("LLM unavailable")
+        return step.id
+
+    try:
+        asyncio.run(PipelineEngine(steps, failing_step, store, "echo_1").run("query"))
+    except RuntimeError:
+        pass
+    assert store.load("echo_1") == {"analyze": "analyze", "reflect": "reflect", "analyze_2": "analyze_2"}
+
+    calls.clear()
+    async def run_step(step, inputs):
+        calls.append(step.id)
+        return step.id
+
+    asyncio.run(PipelineEngine(steps, run_step, store, "echo_1").run("query"))
+    assert calls == ["integrate", "respond"]
+    assert store.load("echo_1") == {}
+
+def test_novelty_separates_restatement_from_new_material():
+    analysis = "The service coordinates analysis across several branches and returns a synthesis."
+    assert novelty(analysis, analysis) == 0.0
+    assert novelty(analysis, analysis + " It also records metrics.") < 0.35
+    assert novelty(analysis, "Probability amplitudes interfere in unexpected ways.") > 0.9
+
+def test_reflection_chain_stops_refining_converged_output():
+    steps = {step.id: step for step in build_pipeline(PROCESS_PATTERNS["leaf"])}
+    text = "The service coordinates analysis across several branches and returns a synthesis."
+
+    chain = ReflectionChain(ReflectionBounds(adaptive=True, min_depth=1, max_depth=2, novelty_threshold=0.35))
+    assert chain.should_run(steps["reflect"])
+    chain.record(steps["reflect"], text, text + " It also records metrics.")
+    assert not chain.should_run(steps["analyze_2"])
+    assert chain.should_run(steps["integrate"])
+
+    chain = ReflectionChain(ReflectionBounds(adaptive=True, min_depth=1, max_depth=2, novelty_threshold=0.35))
+    chain.record(steps["reflect"], text, "Probability amplitudes interfere in unexpected ways.")
+    assert chain.should_run(steps["analyze_2"])
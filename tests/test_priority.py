@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from core.llm.admission import PrioritySemaphore
+from core.messaging.priority import (
+    DEFAULT_PRIORITY, PRIORITY_LEVELS, message_priority, parse_priority, reset_priority, set_priority
+)
+
+def test_parse_priority_accepts_levels_and_numbers():
+    assert parse_priority("interactive") == PRIORITY_LEVELS["interactive"]
+    assert parse_priority("3") == 3
+    assert parse_priority(None) == DEFAULT_PRIORITY
+    with pytest.raises(ValueError):
+        parse_priority("urgent")
+    with pytest.raises(ValueError):
+        parse_priority(42)
+
+def test_message_priority_prefers_context_then_amqp_then_task():
+    assert message_priority({"context": {"priority": "batch"}}, amqp_priority=9) == PRIORITY_LEVELS["batch"]
+    assert message_priority({"context": {}}, amqp_priority=7) == 7
+    token = set_priority(2)
+    try:
+        assert message_priority({"context": None}) == 2
+    finally:
+        reset_priority(token)
+
+def test_waiters_are_admitted_highest_priority_first():
+    async def scenario():
+        slots = PrioritySemaphore(1)
+        order = []
+
+        async def step(name):
+            async with slots:
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await slots.acquire()
+        tasks = []
+        for name, priority in [("batch-1", 1), ("batch-2", 1), ("interactive", 9), ("batch-3", 1)]:
+            token = set_priority(priority)
+            tasks.append(asyncio.create_task(step(name)))
+            reset_priority(token)
+            await asyncio.sleep(0)
+        slots.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "batch-1", "batch-2", "batch-3"]
@@ -0,0 +1,62 @@
+from config.models import ModelParameters
+from core.prompts.budget import (
+    PromptSection, estimate_tokens, truncate_to_tokens, fit_sections, fit_request,
+    reflection_sections, MIN_OUTPUT_TOKENS
+)
+
+LONG_TEXT = "The system coordinates several analysis services. " * 200
+
+def test_truncate_to_tokens_fits_budget():
+    truncated = truncate_to_tokens(LONG_TEXT, 100)
+    assert estimate_tokens(truncated) <= 100
+    assert truncated.endswith("[...]")
+    assert truncate_to_tokens("short text", 100) == "short text"
+
+def test_fit_sections_cuts_oldest_reflections_first():
+    sections = [
+        PromptSection("Synthesize the insights.", required=True),
+        PromptSection("Your Analysis: " + LONG_TEXT, priority=2),
+        *reflection_sections(["old " + LONG_TEXT[:2500], "new " + LONG_TEXT[:2500]]),
+        PromptSection("Answer in 2-3 sentences.", required=True)
+    ]
+    prompt = fit_sections(sections, 3000)
+
+    assert estimate_tokens(prompt) <= 3000
+    assert prompt.startswith("Synthesize the insights.")
+    assert prompt.endswith("Answer in 2-3 sentences.")
+    assert "Reflection 1" not in prompt
+    assert "Reflection 2" in prompt
+    assert LONG_TEXT in prompt
+
+def test_fit_sections_shares_the_cut_among_equal_priority_sections():
+    first, second = "Echo: " + LONG_TEXT[:4000], "Pixel: " + LONG_TEXT[:4000]
+    sections = [
+        PromptSection("Integrate the perspectives.", required=True),
+        PromptSection(first, priority=1),
+        PromptSection(second, priority=1)
+    ]
+    prompt = fit_sections(sections, 1000)
+
+    assert estimate_tokens(prompt) <= 1000
+    kept_first, kept_second = sections[1].tokens, sections[2].tokens
+    assert kept_first > 0 and kept_second > 0
+    assert abs(kept_first - kept_second) <= 5
+    assert prompt.startswith("Integrate the perspectives.\n\nEcho: ")
+
+def test_fit_sections_drops_duplicated_paragraphs():
+    guidance = "Focus on the technical aspects."
+    prompt = fit_sections(
+        [PromptSection("Analyze.", required=True), PromptSection(f"Context\n\n{guidance}", priority=1)],
+        1000,
+        known=[f"System role\n\n{guidance}"]
+    )
+    assert guidance not in prompt
+
+def test_fit_request_reserves_output_room():
+    params = ModelParameters(max_tokens=4096, context_length=8192)
+    messages = [{"role": "system", "content": "prefix"}, {"role": "user", "content": LONG_TEXT * 5}]
+
+    max_tokens = fit_request(messages, params)
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    assert max_tokens == MIN_OUTPUT_TOKENS
+    assert prompt_tokens + max_tokens <= params.context_length
@@ -0,0 +1,40 @@
+import json
+from core.prompts.layout import (
+    PromptContext, set_prompt_context, build_messages, stage_material, PrefixCacheMeter
+)
+from services.echo.prompts import EchoPrompts
+from services.nova.prompts import NovaPrompts
+
+def delegation(query, atlas_analysis):
+    return {
+        "content": json.dumps({"original_query": query, "atlas_analysis": atlas_analysis}),
+        "correlation_id": "query_1",
+        "context": {}
+    }
+
+def test_prompts_share_system_prefix():
+    set_prompt_context(PromptContext.from_message(delegation("Why is the sky blue?", "Light scattering.")))
+    nova = build_messages(NovaPrompts().technical_analysis(stage_material("Why is the sky blue?")))
+    echo = build_messages(EchoPrompts().pattern_reflection("Rayleigh scattering patterns"))
+
+    assert nova[0] == echo[0]
+    assert nova[0]["role"] == "system"
+    assert "Why is the sky blue?" in nova[0]["content"]
+    assert "Light scattering." in nova[0]["content"]
+    assert "Why is the sky blue?" not in nova[1]["content"]
+
+def test_stage_material_drops_delegation_payload():
+    message = delegation("Why is the sky blue?", "Light scattering.")
+    set_prompt_context(PromptContext.from_message(message))
+    assert stage_material(message["content"]) is None
+    assert stage_material("A reflection") == "A reflection"
+
+def test_prefix_meter_estimates_shared_tokens():
+    set_prompt_context(PromptContext("Why is the sky blue?", "Light scattering."))
+    meter = PrefixCacheMeter()
+    first = build_messages(NovaPrompts().technical_reflection("first"))
+    second = build_messages(NovaPrompts().technical_reflection("second"))
+
+    assert meter.measure("slot", first, 100) == 0
+    shared = meter.measure("slot", second, 100)
+    assert 50 < shared < 100
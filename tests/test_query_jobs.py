@@ -0,0 +1,48 @@
+import asyncio
+import time
+from config.services import SERVICE_TEMPLATES
+from services.atlas.service import AtlasService
+
+def make_atlas():
+    atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+    atlas.conversations["query_1"] = {
+        "query": "What is a thread?",
+        "conversation_id": 1,
+        "initial_analysis": "analysis",
+        "branch_responses": {},
+        "status": "processing",
+        "started_at": time.time()
+    }
+    atlas.query_events["query_1"] = asyncio.Event()
+    return atlas
+
+def test_long_poll_returns_when_query_finishes():
+    async def scenario():
+        atlas = make_atlas()
+
+        async def finish():
+            await asyncio.sleep(0.05)
+            atlas.conversations["query_1"]["final_response"] = "synthesis"
+            atlas._finish_query("query_1", "complete")
+
+        asyncio.create_task(finish())
+        started = time.perf_counter()
+        result = await atlas.get_query_result("query_1", wait=5)
+        return result, time.perf_counter() - started
+
+    result, waited = asyncio.run(scenario())
+    assert result["status"] == "complete" and result["final_response"] == "synthesis"
+    assert waited < 1
+
+def test_long_poll_times_out_while_processing_and_finished_queries_are_evicted():
+    async def scenario():
+        atlas = make_atlas()
+        pending = await atlas.get_query_result("query_1", wait=0.02)
+        atlas._finish_query("query_1", "failed", "boom")
+        atlas.conversations["query_1"]["finished_at"] -= 10 ** 6
+        atlas._evict_finished_queries()
+        return pending, atlas
+
+    pending, atlas = asyncio.run(scenario())
+    assert pending["status"] == "processing"
+    assert "query_1" not in atlas.conversations and "query_1" not in atlas.query_events
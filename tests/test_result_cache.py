@@ -0,0 +1,40 @@
+import asyncio
+import time
+from config.services import SERVICE_TEMPLATES
+from core.cache.results import ResultCache, normalize_query
+from services.atlas.service import AtlasService
+
+def result(correlation_id, answer="answer", llm_seconds=12.5):
+    return {"correlation_id": correlation_id, "conversation_id": 1, "final_response": answer, "llm_seconds": llm_seconds}
+
+def test_normalized_queries_share_an_entry_and_stats_count_saved_time():
+    cache = ResultCache(max_entries=10, ttl=60, fingerprint="f1")
+    assert normalize_query("  What is a THREAD?!") == normalize_query("what is a thread")
+    cache.put("What is a thread?", result("query_1"))
+    assert cache.get("  what IS a thread ")["correlation_id"] == "query_1"
+    assert cache.get("What is a process?") is None
+    assert cache.stats()["hit_rate"] == 0.5 and cache.stats()["saved_llm_seconds"] == 12.5
+    # Another configuration never sees these answers
+    assert ResultCache(ttl=60, fingerprint="f2").key("What is a thread?") != cache.key("What is a thread?")
+
+def test_entries_expire_evict_and_persist(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ResultCache(max_entries=2, ttl=60, path=str(path), fingerprint="f1")
+    for i in range(3):
+        cache.put(f"query {i}", result(f"query_{i}"))
+    assert cache.get("query 0") is None and cache.get("query 2") is not None
+
+    reloaded = ResultCache(max_entries=2, ttl=60, path=str(path), fingerprint="f1")
+    assert reloaded.get("query 1")["correlation_id"] == "query_1"
+    reloaded.entries[reloaded.key("query 1")]["created_at"] = time.time() - 120
+    assert reloaded.get("query 1") is None
+
+def test_atlas_answers_repeats_from_the_cache():
+    atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+    atlas.result_cache = ResultCache(ttl=60, fingerprint="f1")
+    atlas.result_cache.put("What is a thread?", result("query_1", "threads share memory"))
+
+    response = asyncio.run(atlas.handle_user_query("what is a thread"))
+    assert response["cached"] and response["final_response"] == "threads share memory"
+    assert response["correlation_id"] == "query_1"
+    assert atlas.result_cache.hits == 1
@@ -0,0 +1,56 @@
+import asyncio
+from config.services import SERVICE_TEMPLATES
+from core.cache.semantic import SemanticIndex
+from services.atlas.service import AtlasService
+
+def result(correlation_id, answer="answer"):
+    return {"correlation_id": correlation_id, "conversation_id": 1, "final_response": answer, "llm_seconds": 3.0}
+
+def test_paraphrases_match_and_unrelated_queries_do_not(tmp_path):
+    index = SemanticIndex(str(tmp_path), initial_capacity=2, fingerprint="f1")
+    index.add("How do I reverse a linked list in Python?", result("query_1"))
+    index.add("What is the difference between a thread and a process?", result("query_2"))
+    index.add("Explain the CAP theorem", result("query_3"))  # past the initial capacity
+
+    entry, similarity = index.lookup("How can I reverse a linked list in python", 0.6)
+    assert entry["correlation_id"] == "query_1" and similarity > 0.6
+    assert index.lookup("Recommend a good pasta recipe", 0.3) is None
+
+    reloaded = SemanticIndex(str(tmp_path), fingerprint="f1")
+    assert reloaded.lookup("Explain the CAP theorem", 0.9)[0]["correlation_id"] == "query_3"
+    # Answers from another configuration or past their TTL are not served
+    assert SemanticIndex(str(tmp_path), fingerprint="f2").lookup("Explain the CAP theorem", 0.9) is None
+    assert reloaded.lookup("Explain the CAP theorem", 0.9, ttl=-1) is None
+
+def run_query(atlas, query):
+    """handle_user_query up to the point where the run would start"""
+    started = {}
+    async def start_query(query, directives, related=None, inflight_key=None):
+        started["related"] = related
+        return {"status": "processing"}
+    atlas._start_query = start_query
+    response = asyncio.run(atlas.handle_user_query(query))
+    return response, started.get("related")
+
+def test_atlas_seeds_close_paraphrases_instead_of_answering():
+    atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+    atlas.result_cache = None
+    atlas._semantic_index = SemanticIndex(fingerprint="f1")
+    atlas._semantic_index.add("What is the difference between a thread and a process?", result("query_1", "threads share memory"))
+
+    response, related = run_query(atlas, "What's the difference between a thread and a process?")
+    assert response["status"] == "processing" and "cached" not in response
+    assert related["correlation_id"] == "query_1"
+
+def test_atlas_never_answers_a_near_identical_query_with_another_meaning():
+    atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+    atlas.result_cache = None
+    atlas._semantic_index = SemanticIndex(fingerprint="f1")
+    write_heavy = "Should I use PostgreSQL or MySQL for a write-heavy analytics workload with many concurrent inserts?"
+    read_heavy = write_heavy.replace("write-heavy", "read-heavy")
+    atlas._semantic_index.add(write_heavy, result("query_1", "PostgreSQL, for its write path"))
+    assert atlas._semantic_index.lookup(read_heavy, 0.85) is not None  # the index cannot tell them apart
+
+    response, _ = run_query(atlas, read_heavy)
+    assert response["status"] == "processing"
+    assert "final_response" not in response
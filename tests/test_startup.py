@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_importing_a_service_has_no_side_effects_and_defers_heavy_modules():
+    code = (
+        "import sys, services.echo.service, database.connection as db, config.models as models; "
+        "print(sorted(m for m in ('numpy', 'asyncpg') if m in sys.modules), db._engine, models._model_config)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[] None None"
+
+def test_model_config_is_built_on_first_access():
+    import config.models as models
+    assert models.MODEL_CONFIG is models.model_config()
+    assert "echo" in models.MODEL_CONFIG.models
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import time
+from config.services import SERVICE_TEMPLATES
+from config.settings import SYSTEM_CONFIG
+from core.launcher import manager as launcher
+from core.launcher.supervisor import ServiceSupervisor, restart_delay, rss_growth_mb_per_hour
+from core.messaging.readiness import READY_EVENT, ReadinessWatcher
+from services.atlas.service import AtlasService
+
+class FakeProcess:
+    pid = os.getpid()  # psutil samples the test process
+
+    def __init__(self):
+        self.returncode = None
+        self.exited = asyncio.Event()
+
+    async def wait(self):
+        await self.exited.wait()
+        return self.returncode
+
+    def exit(self, code):
+        self.returncode = code
+        self.exited.set()
+
+    def terminate(self):
+        self.exit(-15)
+
+class FakeWatcher(ReadinessWatcher):
+    def __init__(self):
+        super().__init__("amqp://unused", "ai_services")
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+def make_supervisor(monkeypatch, **kwargs):
+    supervisor = ServiceSupervisor(dependencies={"echo": []}, watcher=FakeWatcher(), start_timeout=1, **kwargs)
+    launches = []
+
+    async def launch(name):
+        launches.append(name)
+        supervisor.watcher.record({"source": name, "context": {"event": READY_EVENT}})
+        return FakeProcess()
+
+    async def healthy(port):
+        return True
+
+    monkeypatch.setattr(launcher, "port_in_use", lambda port: False)
+    monkeypatch.setattr(supervisor, "launch", launch)
+    monkeypatch.setattr(supervisor, "check_service_health", healthy)
+    monkeypatch.setitem(SYSTEM_CONFIG, "restart_backoff_base", 0.01)
+    monkeypatch.setitem(SYSTEM_CONFIG, "telemetry_interval", 0.01)
+    return supervisor, launches
+
+def test_backoff_doubles_up_to_the_cap_and_growth_is_a_slope():
+    assert [restart_delay(n) for n in (1, 2, 3)] == [1, 2, 4]
+    assert restart_delay(50) == SYSTEM_CONFIG['restart_backoff_max']
+    samples = [{"time": t * 60.0, "rss_mb": 100 + t} for t in range(30)]
+    assert round(rss_growth_mb_per_hour(samples)) == 60
+
+def test_crashed_service_is_restarted_and_sampled(monkeypatch):
+    async def scenario():
+        supervisor, launches = make_supervisor(monkeypatch)
+        assert await supervisor.run(check_infrastructure=False, serve_api=False)
+        supervisor.processes["echo"].exit(1)
+        await asyncio.sleep(0.2)
+        status = supervisor.status()["services"]["echo"]
+        await supervisor.cleanup()
+        return status, launches
+
+    status, launches = asyncio.run(scenario())
+    assert len(launches) == 2 and status["status"] == "running"
+    assert status["restarts"] == 1 and status["last_exit_code"] == 1
+    assert status["latest"]["rss_mb"] > 0 and status["latest"]["open_files"] > 0
+
+def test_memory_ceiling_restarts_at_once_and_leaks_drain_first(monkeypatch):
+    async def scenario():
+        supervisor, launches = make_supervisor(monkeypatch, leak_restart=True)
+        drained = []
+
+        async def drain(name, poll_interval=1.0):
+            drained.append(name)
+            return True
+
+        monkeypatch.setattr(supervisor, "drain", drain)
+        monkeypatch.setenv("ECHO_MEMORY_LIMIT_MB", "1")
+        assert await supervisor.run(check_infrastructure=False, serve_api=False)
+        await asyncio.sleep(0.1)
+        ceiling = supervisor.states["echo"].last_restart_reason
+        assert drained == []
+
+        monkeypatch.setenv("ECHO_MEMORY_LIMIT_MB", "100000")
+        await asyncio.sleep(0.05)
+        state = supervisor.states["echo"]
+        now = time.time()
+        state.samples.clear()
+        state.samples.extend({"time": now - 3600 + t * 60, "rss_mb": 100 + t * 5, "cpu_percent": 0, "open_files": 1, "threads": 1}
+                             for t in range(61))
+        verdict = supervisor.check_resources("echo")
+        await supervisor.restart("echo", *verdict)
+        await asyncio.sleep(0.05)
+        await supervisor.cleanup()
+        return ceiling, verdict, drained, launches
+
+    ceiling, verdict, drained, launches = asyncio.run(scenario())
+    assert "ceiling" in ceiling
+    assert verdict[1] is True and "growing" in verdict[0]
+    assert drained == ["echo"] and len(launches) >= 3
+
+def test_atlas_drain_does_not_wait_for_queries_that_will_never_finish(monkeypatch):
+    monkeypatch.setitem(SYSTEM_CONFIG, "batch_query_timeout", 60)
+    atlas = AtlasService(SERVICE_TEMPLATES["atlas"])
+    atlas.conversations = {
+        "query_1": {"status": "processing", "started_at": time.time() - 5},
+        "query_2": {"status": "processing", "started_at": time.time() - 600},  # branches never answered
+        "query_3": {"status": "complete", "started_at": time.time() - 5}
+    }
+    assert atlas.pending_work() == 1
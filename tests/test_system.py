@@ -19,7 +19,14 @@ async def test_system_query():
             print(f"\nResponse Status: {response.status_code}")
             
             if response.status_code == 200:
+                correlation_id = response.json()['correlation_id']
+                print(f"Waiting for result of {correlation_id}...")
                 result = response.json()
+                while result.get('status') == 'processing':
+                    result = (await client.get(
+                        f'http://localhost:8000/query/{correlation_id}',
+                        params={'wait': 60}
+                    )).json()
                 
                 print("\n=== Initial Analysis ===")
                 print(result.get('initial_analysis', 'Not provided'))